@@ -0,0 +1,51 @@
+"""
+Shared Google Cloud Storage client for the pipeline phases.
+One storage client per process so every GCS call shares one authed, pooled HTTP session.
+"""
+import os
+import threading
+from typing import Dict, Optional
+
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage
+from requests.adapters import HTTPAdapter
+
+# Keep-alive GCS connections; requests' default of 10 is below what parallel PDFs and chunk cache lookups use
+GCS_POOL_SIZE = int(os.getenv('GCS_POOL_SIZE', '32'))
+
+_storage_client: Optional[storage.Client] = None
+_buckets: Dict[str, storage.bucket.Bucket] = {}
+_client_lock = threading.Lock()
+
+
+def _create_storage_client() -> storage.Client:
+    """Storage client on an authorized session with a connection pool sized for parallel requests"""
+    credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=GCS_POOL_SIZE))
+    return storage.Client(credentials=credentials, _http=session)
+
+
+def get_bucket(bucket_name: str) -> storage.bucket.Bucket:
+    """Process-wide bucket handle on the shared storage client"""
+    global _storage_client
+    bucket = _buckets.get(bucket_name)
+    if bucket is None:
+        with _client_lock:
+            if _storage_client is None:
+                _storage_client = _create_storage_client()
+            bucket = _buckets.setdefault(bucket_name, _storage_client.bucket(bucket_name))
+    return bucket
+
+
+def _reset_client_after_fork() -> None:
+    """Celery prefork children must not reuse the parent's sockets"""
+    global _storage_client, _client_lock
+    _storage_client = None
+    _buckets.clear()
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
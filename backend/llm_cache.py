@@ -0,0 +1,57 @@
+"""
+Shared GCS cache of raw LLM responses for the Phase 3 extractors.
+Entries are content-addressed: <folder>/<sha256 of version, model and prompt>.json
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from google.cloud import storage
+
+# Re-runs on unchanged chunks are answered from here instead of the API
+LLM_CACHE_FOLDER = 'phase3/llm_cache'
+
+
+def llm_cache_key(version: str, model: str, *prompt_parts: str) -> str:
+    """SHA-256 over cache version, model and each prompt part (length-prefixed so parts cannot run together)"""
+    digest = hashlib.sha256()
+    for part in (version, model) + prompt_parts:
+        data = part.encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def llm_cache_get(bucket: storage.bucket.Bucket, cache_key: str,
+                  folder: str = LLM_CACHE_FOLDER) -> Optional[str]:
+    """Return the cached LLM response text for this key, or None on a cache miss"""
+    try:
+        data = bucket.blob(f'{folder}/{cache_key}.json').download_as_bytes()
+    except NotFound:
+        return None
+    except Exception as e:
+        print(f"  Warning: could not read LLM cache {cache_key[:12]}: {e}")
+        return None
+    return json.loads(data).get('output_text')
+
+
+def llm_cache_put(bucket: storage.bucket.Bucket, cache_key: str, result_text: str, model: str,
+                  folder: str = LLM_CACHE_FOLDER) -> None:
+    """Store an LLM response so identical prompts are answered from GCS next time"""
+    try:
+        # Create-only: the key is content-addressed, so an existing entry already holds this answer
+        bucket.blob(f'{folder}/{cache_key}.json').upload_from_string(
+            json.dumps({
+                'model': model,
+                'cached_at': datetime.now().isoformat(),
+                'output_text': result_text
+            }, ensure_ascii=False),
+            content_type='application/json',
+            if_generation_match=0
+        )
+    except PreconditionFailed:
+        pass
+    except Exception as e:
+        # A failed cache write only costs a repeat API call on the next run
+        print(f"  Warning: could not write LLM cache {cache_key[:12]}: {e}")
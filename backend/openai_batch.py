@@ -0,0 +1,78 @@
+"""
+Shared OpenAI Batch API runner for the Phase 3 extractors.
+Submits one /v1/responses request per chunk, waits for the job and returns the raw reply bodies.
+"""
+import json
+import os
+import time
+from typing import Dict, Any
+
+import openai
+
+# Seconds between status checks while waiting on a Batch API job
+BATCH_POLL_SECONDS = int(os.getenv('PHASE3_BATCH_POLL_SECONDS', '60'))
+# Stop waiting (and cancel the job) after this long so one batch cannot hold a Celery worker for the full 24h window
+BATCH_MAX_WAIT_SECONDS = int(os.getenv('PHASE3_BATCH_MAX_WAIT_SECONDS', str(4 * 60 * 60)))
+
+
+class BatchFailedError(RuntimeError):
+    """The batch job ended without completing, so none of its replies can be trusted as a full run"""
+
+
+def batch_output_text(body: Dict[str, Any]) -> str:
+    """Concatenated output_text of a raw Responses API body (the SDK's response.output_text)"""
+    return ''.join(
+        content.get('text', '')
+        for item in body.get('output', [])
+        if item.get('type') == 'message'
+        for content in item.get('content', [])
+        if content.get('type') == 'output_text'
+    )
+
+
+def run_batch(client: openai.OpenAI, requests_by_id: Dict[str, Dict[str, Any]], label: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Submit one Batch API job with a /v1/responses request per entry and wait for it.
+    Returns {custom_id: raw response body} for the requests that succeeded.
+    Raises BatchFailedError if the job ends failed, expired or cancelled, or is still
+    running after BATCH_MAX_WAIT_SECONDS.
+    """
+    jsonl = ''.join(
+        json.dumps({'custom_id': custom_id, 'method': 'POST', 'url': '/v1/responses', 'body': body}, ensure_ascii=False) + '\n'
+        for custom_id, body in requests_by_id.items()
+    )
+    batch_file = client.files.create(file=(f'{label}.jsonl', jsonl.encode('utf-8')), purpose='batch')
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint='/v1/responses',
+        completion_window='24h'
+    )
+    print(f"📦 Submitted {label} batch {batch.id} with {len(requests_by_id)} requests")
+
+    deadline = time.monotonic() + BATCH_MAX_WAIT_SECONDS
+    while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+        if time.monotonic() >= deadline:
+            try:
+                client.batches.cancel(batch.id)
+            except Exception as e:
+                print(f"  Warning: could not cancel batch {batch.id}: {e}")
+            raise BatchFailedError(f"Batch {batch.id} still {batch.status} after {BATCH_MAX_WAIT_SECONDS}s, cancelled")
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = client.batches.retrieve(batch.id)
+        print(f"  Batch {batch.id}: {batch.status}")
+
+    if batch.status != 'completed':
+        raise BatchFailedError(f"Batch {batch.id} ended as {batch.status}")
+
+    bodies = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line:
+                continue
+            entry = json.loads(line)
+            response = entry.get('response') or {}
+            if response.get('status_code') == 200:
+                bodies[entry['custom_id']] = response['body']
+            else:
+                print(f"  [ERROR] Batch request {entry['custom_id']} failed: {entry.get('error') or response.get('body')}")
+    return bodies
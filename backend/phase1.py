@@ -1,8 +1,10 @@
 import fitz
+import json
 import os
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from google.cloud import storage
+from google.api_core.exceptions import NotFound, PreconditionFailed
 import io
 from phase1_pymudf import analyze_text_quality, classify_page_quality
 
@@ -14,6 +16,8 @@ from phase1_pymudf import analyze_text_quality, classify_page_quality
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 PDF_FOLDER = 'pdf'
 METADATA_FILE = f'{PDF_FOLDER}/uploads_metadata.json'
+# One small JSON per upload (written alongside uploads_metadata.json by upload_handler)
+UPLOAD_RECORDS_FOLDER = f'{PDF_FOLDER}/uploads'
 
 
 def _get_bucket() -> storage.bucket.Bucket:
@@ -30,6 +34,18 @@ def _read_metadata(bucket: storage.bucket.Bucket) -> Dict[str, Any]:
     return _json.loads(content)
 
 
+def _read_upload_record(bucket: storage.bucket.Bucket, upload_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a single upload record without downloading the whole metadata file.
+    Returns None for uploads made before per-upload records were written; callers
+    then fall back to uploads_metadata.json."""
+    try:
+        content = bucket.blob(f'{UPLOAD_RECORDS_FOLDER}/{upload_id}.json').download_as_bytes()
+    except NotFound:
+        return None
+    import json as _json
+    return _json.loads(content)
+
+
 def _blob_path_from_gs_uri(gs_uri: str) -> str:
     # gs://deployment/pdf/filename.pdf -> pdf/filename.pdf
     prefix = f"gs://{BUCKET_NAME}/"
@@ -270,6 +286,37 @@ def _save_clean_pages_txt(bucket: storage.bucket.Bucket, carrier_name: str, safe
     print(f"✅ Saved clean pages summary to: gs://{BUCKET_NAME}/{clean_pages_path}")
 
 
+def _save_clean_pages_to_upload_record(bucket: storage.bucket.Bucket, upload_id: str, results: List[Dict[str, Any]]) -> None:
+    """Store each PDF's clean page numbers in pdf/uploads/{uploadId}.json as cleanPageNumbers,
+    so Phase 2 can pick its OCR pages without reading the clean-pages report back"""
+    blob = bucket.get_blob(f'{UPLOAD_RECORDS_FOLDER}/{upload_id}.json')
+    if blob is None:
+        return  # Uploads made before per-upload records; Phase 2 reads the report instead
+    
+    clean_by_path = {
+        file_data['path']: file_data['clean_page_numbers']
+        for carrier in results
+        for file_data in carrier.get('files', [])
+        if 'clean_page_numbers' in file_data
+    }
+    record = json.loads(blob.download_as_bytes())
+    for carrier in record.get('carriers', []):
+        for file_type in ['propertyPDF', 'liabilityPDF', 'liquorPDF']:
+            pdf_info = carrier.get(file_type)
+            if pdf_info and pdf_info.get('path') in clean_by_path:
+                pdf_info['cleanPageNumbers'] = clean_by_path[pdf_info['path']]
+    
+    try:
+        # Only replace the record we read, never a copy rewritten in the meantime
+        blob.upload_from_string(
+            json.dumps(record, indent=2),
+            content_type='application/json',
+            if_generation_match=blob.generation
+        )
+    except PreconditionFailed:
+        print(f"Warning: Upload record {upload_id} changed during Phase 1; clean pages not stored in it")
+
+
 def process_upload_quality_analysis(upload_id: str) -> Dict[str, Any]:
     """
     Given an upload_id, read metadata, fetch PDFs from GCS, and analyze quality.
@@ -353,6 +400,11 @@ def process_upload_quality_analysis(upload_id: str) -> Dict[str, Any]:
     except Exception as e:
         print(f"Warning: Failed to save results to GCS: {e}")
     
+    try:
+        _save_clean_pages_to_upload_record(bucket, upload_id, results)
+    except Exception as e:
+        print(f"Warning: Failed to save clean pages to upload record: {e}")
+    
     # Automatically trigger Phase 2 OCR after Phase 1 completes (background task)
     try:
         print("\n✅ Phase 1 complete. Queueing Phase 2 OCR task...")
@@ -10,28 +10,90 @@ import os
 import json
 import re
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set
 from PIL import Image
 import io
+import atexit
+import contextlib
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import storage
 from joblib import Parallel, delayed
 
+# Optional in-process Tesseract bindings. When available, OCR calls borrow a loaded
+# PyTessBaseAPI from a shared pool instead of forking a tesseract subprocess per call.
+try:
+    from tesserocr import PyTessBaseAPI, OEM, PSM
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Optional GPU OCR backend (PaddleOCR). Enabled with OCR_BACKEND=paddle;
+# Tesseract remains the default and the fallback.
+try:
+    from paddleocr import PaddleOCR
+    PADDLE_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    PADDLE_AVAILABLE = False
+
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
+_GS_PREFIX = f"gs://{BUCKET_NAME}/"
 PDF_FOLDER = 'pdf'
 METADATA_FILE = f'{PDF_FOLDER}/uploads_metadata.json'
 
+OCR_BACKEND = os.getenv('OCR_BACKEND', 'tesseract').strip().lower()
+PADDLE_BATCH_SIZE = int(os.getenv('PADDLE_BATCH_SIZE', '16'))
+
+_paddle_ocr = None
+
+# Idle PyTessBaseAPIs. Joblib starts fresh threads for every Parallel(...) call, so APIs are
+# pooled rather than per-thread: the pool only grows to the peak number of concurrent OCR calls.
+_tess_api_pool: "queue.SimpleQueue" = queue.SimpleQueue()
+_tess_apis: List[Any] = []
+_tess_apis_lock = threading.Lock()
+_PSM_RE = re.compile(r'--psm (\d+)')
+_CLEAN_PAGES_RE = re.compile(r'^Clean Page Numbers: \[(.*?)\]', re.MULTILINE)
+
+# Common Tesseract misreads in policy numbers, dates and currency amounts
+_POLICY_FIX = re.compile(r'\b([A-Z]{2,4})(\s*)O(?=\d)', re.A)          # "CPO123" -> "CP0123"
+_DIGIT_O_FIX = re.compile(r'(?<=[\d,])O(?=[\d,])', re.A)               # "1,O00" -> "1,000"
+_DATE_FIX = re.compile(r'\b(\d{1,2})[/l|](\d{1,2})[/l|](\d{2,4})\b', re.A)  # "12l01l2024" -> "12/01/2024"
+_CURRENCY_FIX = re.compile(r'\$\s+(?=\d)', re.A)                       # "$ 1,000" -> "$1,000"
+
 
+def _get_paddle_ocr():
+    """Load the PaddleOCR model once per process (detection + recognition, no angle classifier)."""
+    global _paddle_ocr
+    if _paddle_ocr is None:
+        _paddle_ocr = PaddleOCR(
+            use_gpu=os.getenv('PADDLE_USE_GPU', 'true').lower() == 'true',
+            det=True,
+            rec=True,
+            use_angle_cls=False,
+            rec_batch_num=PADDLE_BATCH_SIZE,
+            show_log=False
+        )
+    return _paddle_ocr
+
+
+@functools.lru_cache(maxsize=1)
 def _get_bucket() -> storage.bucket.Bucket:
+    # One client/bucket per process: building storage.Client() re-reads credentials every time
     client = storage.Client()
     return client.bucket(BUCKET_NAME)
 
 
 def _blob_path_from_gs_uri(gs_uri: str) -> str:
-    # gs://deployment/pdf/filename.pdf -> pdf/filename.pdf
-    prefix = f"gs://{BUCKET_NAME}/"
-    if gs_uri.startswith(prefix):
-        return gs_uri[len(prefix):]
-    return gs_uri  # assume already relative
+    # gs://deployment/pdf/filename.pdf -> pdf/filename.pdf (relative paths pass through)
+    return gs_uri.removeprefix(_GS_PREFIX)
 
 
 def _download_bytes(bucket: storage.bucket.Bucket, blob_path: str) -> bytes:
@@ -80,23 +142,152 @@ def analyze_ocr_quality(text: str) -> Dict[str, Any]:
     return metrics
 
 
+def analyze_ocr_quality_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Analyze OCR quality for all pages of a document at once.
+    Same metrics as analyze_ocr_quality, but the confidence scoring runs as
+    one vectorized numpy computation instead of per-page branching.
+    """
+    if not NUMPY_AVAILABLE:
+        return [analyze_ocr_quality(text) for text in texts]
+    
+    chars = np.fromiter((len(t) for t in texts), dtype=np.int32, count=len(texts))
+    words = np.fromiter(
+        (sum(1 for word in t.split() if len(word) > 2 and word.isalpha()) for t in texts),
+        dtype=np.int32, count=len(texts)
+    )
+    lines = [sum(1 for line in t.split('\n') if line.strip()) for t in texts]
+    
+    conf = (
+        100
+        - np.where(chars < 100, 30, np.where(chars < 500, 15, 0))
+        - np.where(words < 20, 40, np.where(words < 50, 20, 0))
+        + np.where(chars > 1000, 10, 0)
+        + np.where(words > 100, 10, 0)
+    )
+    conf = np.maximum(conf, 0)
+    
+    return [
+        {
+            'total_chars': int(chars[i]),
+            'readable_words': int(words[i]),
+            'lines': lines[i],
+            'confidence_score': int(conf[i])
+        }
+        for i in range(len(texts))
+    ]
+
+
+@contextlib.contextmanager
+def _borrow_tess_api():
+    """Borrow an idle PyTessBaseAPI (loading the language model only when all are busy) and return it after use"""
+    try:
+        api = _tess_api_pool.get_nowait()
+    except queue.Empty:
+        api = PyTessBaseAPI(oem=OEM.DEFAULT, psm=PSM.SINGLE_BLOCK)
+        with _tess_apis_lock:
+            _tess_apis.append(api)
+    try:
+        yield api
+    finally:
+        _tess_api_pool.put(api)
+
+
+@atexit.register
+def _end_tess_apis() -> None:
+    with _tess_apis_lock:
+        for api in _tess_apis:
+            try:
+                api.End()
+            except Exception:
+                pass
+        _tess_apis.clear()
+
+
+def _run_tesseract(image: Image.Image, config: str) -> str:
+    """Run Tesseract with a pytesseract-style config, in-process via tesserocr when available"""
+    if TESSEROCR_AVAILABLE:
+        psm_match = _PSM_RE.search(config)
+        with _borrow_tess_api() as api:
+            api.SetPageSegMode(int(psm_match.group(1)) if psm_match else PSM.AUTO)
+            api.SetImage(image)
+            return api.GetUTF8Text()
+    if config:
+        return pytesseract.image_to_string(image, config=config)
+    return pytesseract.image_to_string(image)
+
+
+def postprocess_ocr_text(text: str) -> str:
+    """Fix common OCR misreads (O/0 in numbers, l or | as date separators, spaced $ amounts)"""
+    if not text:
+        return text
+    text = _POLICY_FIX.sub(r'\g<1>\g<2>0', text)
+    text = _DIGIT_O_FIX.sub('0', text)
+    text = _DATE_FIX.sub(r'\1/\2/\3', text)
+    text = _CURRENCY_FIX.sub('$', text)
+    return text
+
+
+def _choose_ocr_zoom(page: "fitz.Page") -> float:
+    """
+    Pick the render zoom for OCR from the page's text layer.
+    1.5x is enough for body text; small print (< 7pt) gets 2.5x.
+    Scanned pages without any text spans keep the previous 2.0x default.
+    """
+    try:
+        blocks = page.get_text('dict')['blocks']
+        sizes = [
+            span['size']
+            for block in blocks if block.get('type') == 0
+            for line in block['lines']
+            for span in line['spans']
+            if span['text'].strip()
+        ]
+    except Exception:
+        sizes = []
+    if not sizes:
+        return 2.0
+    return 2.5 if min(sizes) < 7 else 1.5
+
+
+def _render_page_image(doc: "fitz.Document", page_num: int) -> Image.Image:
+    """Render a page to a PIL image for Tesseract"""
+    print(f"  Converting page {page_num} to image...")
+    page = doc[page_num - 1]  # PyMuPDF uses 0-based indexing
+    
+    # Convert page to image (zoom picked from the page's smallest font size)
+    zoom = _choose_ocr_zoom(page)
+    mat = fitz.Matrix(zoom, zoom)
+    pix = page.get_pixmap(matrix=mat)
+    img_data = pix.tobytes("png")
+    
+    # Create PIL Image from bytes
+    return Image.open(io.BytesIO(img_data))
+
+
 def extract_with_tesseract_ocr(pdf_bytes: bytes, page_num: int) -> Dict[str, Any]:
     """Extract text using Tesseract OCR from PDF bytes"""
     try:
-        print(f"  Converting page {page_num} to image...")
-        
-        # Open PDF and get page
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        page = doc[page_num - 1]  # PyMuPDF uses 0-based indexing
-        
-        # Convert page to image (2.0x zoom for better table detection)
-        mat = fitz.Matrix(2.0, 2.0)
-        pix = page.get_pixmap(matrix=mat)
-        img_data = pix.tobytes("png")
-        
-        # Create PIL Image from bytes
-        image = Image.open(io.BytesIO(img_data))
+        try:
+            image = _render_page_image(doc, page_num)
+        finally:
+            doc.close()
+        return _ocr_page_image(image, page_num)
         
+    except Exception as e:
+        print(f"  [ERROR] OCR failed on page {page_num}: {e}")
+        return {
+            'text': '',
+            'metrics': {'total_chars': 0, 'readable_words': 0, 'confidence_score': 0},
+            'success': False,
+            'error': str(e)
+        }
+
+
+def _ocr_page_image(image: Image.Image, page_num: int) -> Dict[str, Any]:
+    """Run the Tesseract config fallback chain on an already rendered page"""
+    try:
         print(f"  Running Tesseract OCR on page {page_num}...")
         
         # Try multiple OCR configurations with fallback
@@ -113,10 +304,9 @@ def extract_with_tesseract_ocr(pdf_bytes: bytes, page_num: int) -> Dict[str, Any
             try:
                 if config:
                     print(f"    Trying OCR config {i+1}: {config}")
-                    page_text = pytesseract.image_to_string(image, config=config)
                 else:
                     print(f"    Trying basic OCR (fallback)")
-                    page_text = pytesseract.image_to_string(image)
+                page_text = _run_tesseract(image, config)
                 
                 # Check if we got meaningful text
                 if len(page_text.strip()) > 50:
@@ -134,14 +324,11 @@ def extract_with_tesseract_ocr(pdf_bytes: bytes, page_num: int) -> Dict[str, Any
             print(f"    [FAILED] All OCR configurations failed")
             page_text = ""
         
-        doc.close()
-        
-        # Analyze OCR quality
-        metrics = analyze_ocr_quality(page_text)
+        page_text = postprocess_ocr_text(page_text)
         
+        # Quality metrics are computed for the whole document in _organize_ocr_results
         return {
             'text': page_text,
-            'metrics': metrics,
             'success': True,
             'error': None
         }
@@ -156,21 +343,124 @@ def extract_with_tesseract_ocr(pdf_bytes: bytes, page_num: int) -> Dict[str, Any
         }
 
 
+def _render_page_gray_array(doc: "fitz.Document", page_num: int) -> "np.ndarray":
+    """Render a page at native resolution as a grayscale numpy array (PaddleOCR scales internally)"""
+    pix = doc[page_num - 1].get_pixmap(colorspace=fitz.csGRAY, alpha=False)
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+
+
+def extract_with_paddle_ocr(pages_batch: List["np.ndarray"]) -> List[str]:
+    """
+    Run PaddleOCR on a batch of preprocessed grayscale page arrays.
+    
+    The model stays resident on the GPU across the whole batch and recognition
+    crops are batched by rec_batch_num. Pages have different sizes, so they are
+    fed one array at a time rather than stacked into a single tensor.
+    
+    Returns one text string per input page (lines joined top-to-bottom).
+    """
+    engine = _get_paddle_ocr()
+    texts = []
+    for page_array in pages_batch:
+        result = engine.ocr(page_array, det=True, rec=True, cls=False)
+        lines = []
+        for page_lines in result or []:
+            for line in page_lines or []:
+                lines.append(line[1][0])
+        texts.append(postprocess_ocr_text("\n".join(lines)))
+    return texts
+
+
+def process_all_pages_with_paddle_ocr(pdf_bytes: bytes, total_pages: int) -> Dict[int, Dict[str, Any]]:
+    """Process ALL pages with PaddleOCR in GPU batches. Returns {page_num: ocr_result}."""
+    print(f"Processing {total_pages} pages with PaddleOCR (batch size {PADDLE_BATCH_SIZE})")
+    
+    page_results: Dict[int, Dict[str, Any]] = {}
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        for start in range(1, total_pages + 1, PADDLE_BATCH_SIZE):
+            page_nums = list(range(start, min(start + PADDLE_BATCH_SIZE, total_pages + 1)))
+            batch = [_render_page_gray_array(doc, page_num) for page_num in page_nums]
+            for page_num, page_text in zip(page_nums, extract_with_paddle_ocr(batch)):
+                page_results[page_num] = {
+                    'text': page_text,
+                    'success': True,
+                    'error': None
+                }
+    finally:
+        doc.close()
+    
+    return page_results
+
+
+def _process_pages_with_prefetch(pdf_bytes: bytes, total_pages: int) -> List[tuple]:
+    """Sequential OCR that renders the next page on a background thread while the current page OCRs"""
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    results_list = []
+    try:
+        # Only the prefetch thread touches the document, so one open doc is safe here
+        with ThreadPoolExecutor(max_workers=1) as render_pool:
+            next_render = render_pool.submit(_render_page_image, doc, 1) if total_pages else None
+            for page_num in range(1, total_pages + 1):
+                print(f"\nProcessing Page {page_num}...")
+                current_render = next_render
+                if page_num < total_pages:
+                    next_render = render_pool.submit(_render_page_image, doc, page_num + 1)
+                try:
+                    image = current_render.result()
+                except Exception as e:
+                    print(f"  [ERROR] OCR failed on page {page_num}: {e}")
+                    results_list.append((page_num, {
+                        'text': '',
+                        'metrics': {'total_chars': 0, 'readable_words': 0, 'confidence_score': 0},
+                        'success': False,
+                        'error': str(e)
+                    }))
+                    continue
+                results_list.append((page_num, _ocr_page_image(image, page_num)))
+    finally:
+        doc.close()
+    return results_list
+
+
 def process_all_pages_with_ocr(pdf_bytes: bytes, total_pages: int, n_jobs: int = 2) -> Dict[str, Any]:
     """
     Process ALL pages with Tesseract OCR - PARALLELIZED with Joblib
     
+    Set OCR_BACKEND=paddle to use the PaddleOCR GPU backend instead;
+    Tesseract is used as a fallback if PaddleOCR is unavailable or fails.
+    
     Args:
         pdf_bytes: PDF file bytes
         total_pages: Total number of pages
         n_jobs: Number of parallel workers (default: 4, -1 for all cores)
     """
+    if OCR_BACKEND == 'paddle':
+        if PADDLE_AVAILABLE:
+            try:
+                print("PHASE 2: OCR EXTRACTION - ALL PAGES (PADDLEOCR)")
+                print("=" * 80)
+                paddle_results = process_all_pages_with_paddle_ocr(pdf_bytes, total_pages)
+                return _organize_ocr_results(
+                    [(page_num, paddle_results[page_num]) for page_num in range(1, total_pages + 1)],
+                    total_pages,
+                    method='PaddleOCR'
+                )
+            except Exception as e:
+                print(f"Warning: PaddleOCR failed, falling back to Tesseract: {e}")
+        else:
+            print("Warning: OCR_BACKEND=paddle but paddleocr is not installed, using Tesseract")
+    
     print("PHASE 2: OCR EXTRACTION - ALL PAGES (PARALLEL)")
     print("=" * 80)
     print(f"Processing {total_pages} pages with Tesseract OCR")
     print(f"Parallel Workers: {n_jobs}")
     print("=" * 80)
     
+    if n_jobs == 1:
+        results_list = _process_pages_with_prefetch(pdf_bytes, total_pages)
+        return _organize_ocr_results(results_list, total_pages, method='Tesseract OCR (adaptive 1.5x-2.5x zoom)')
+    
     def process_single_page(page_num):
         """Process single page - called in parallel by Joblib"""
         print(f"\nProcessing Page {page_num}...")
@@ -189,14 +479,24 @@ def process_all_pages_with_ocr(pdf_bytes: bytes, total_pages: int, n_jobs: int =
         for page_num in range(1, total_pages + 1)
     )
     
-    # Organize results
+    return _organize_ocr_results(results_list, total_pages, method='Tesseract OCR (adaptive 1.5x-2.5x zoom)')
+
+
+def _organize_ocr_results(results_list: List[Any], total_pages: int, method: str) -> Dict[str, Any]:
+    """Group (page_num, ocr_result) pairs into successful/failed page lists"""
     results = {
         'successful_pages': [],
         'failed_pages': [],
         'all_results': {},
-        'total_pages': total_pages
+        'total_pages': total_pages,
+        'method': method
     }
     
+    # Score every successful page in one vectorized pass
+    successful = [ocr_result for _, ocr_result in results_list if ocr_result['success']]
+    for ocr_result, metrics in zip(successful, analyze_ocr_quality_batch([r['text'] for r in successful])):
+        ocr_result['metrics'] = metrics
+    
     # Process results from parallel execution
     for page_num, ocr_result in results_list:
         # Store results
@@ -217,7 +517,7 @@ def process_all_pages_with_ocr(pdf_bytes: bytes, total_pages: int, n_jobs: int =
             })
             print(f"  ❌ Page {page_num} FAILED - {ocr_result['error']}")
     
-    print(f"\n✅ Parallel Tesseract OCR processing complete: {len(results['successful_pages'])}/{total_pages} pages successful")
+    print(f"\n✅ {method} processing complete: {len(results['successful_pages'])}/{total_pages} pages successful")
     
     return results
 
@@ -233,7 +533,7 @@ def save_ocr_results_to_gcs(bucket: storage.bucket.Bucket, carrier_name: str, sa
     report_lines.append("=" * 80)
     report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     report_lines.append(f"Carrier: {carrier_name}")
-    report_lines.append(f"Method: Tesseract OCR (2.0x zoom)")
+    report_lines.append(f"Method: {results.get('method', 'Tesseract OCR')}")
     report_lines.append(f"Total Pages: {len(results['successful_pages'])}")
     report_lines.append(f"Success Rate: {len(results['successful_pages'])}/{len(results['all_results'])} ({len(results['successful_pages'])/len(results['all_results'])*100:.1f}%)")
     report_lines.append("=" * 80)
@@ -260,6 +560,37 @@ def save_ocr_results_to_gcs(bucket: storage.bucket.Bucket, carrier_name: str, sa
     print(f"✅ Saved OCR results to: gs://{BUCKET_NAME}/{ocr_file_path}")
 
 
+def _read_phase1_problem_pages(bucket: storage.bucket.Bucket, safe_carrier_name: str, type_short: str, total_pages: int) -> Set[int]:
+    """
+    Pages Phase 1 did not mark as clean (problem + borderline).
+    Only the report header is fetched; every page counts as a problem page
+    when no Phase 1 clean-pages file exists.
+    """
+    all_pages = set(range(1, total_pages + 1))
+    phase1_files = list(bucket.list_blobs(prefix=f'phase1/results/{safe_carrier_name}_{type_short}_pymupdf_clean_pages_only_'))
+    if not phase1_files:
+        return all_pages
+    
+    latest = max(phase1_files, key=lambda b: b.name)
+    header = latest.download_as_bytes(start=0, end=4095).decode('utf-8', errors='ignore')
+    match = _CLEAN_PAGES_RE.search(header)
+    if not match:
+        return all_pages
+    
+    clean_pages = {int(n) for n in re.findall(r'\d+', match.group(1))}
+    return all_pages - clean_pages
+
+
+def _filter_ocr_results(ocr_results: Dict[str, Any], pages: Set[int]) -> Dict[str, Any]:
+    """Keep only the given pages of an OCR result set (full report stays in GCS)"""
+    return {
+        **ocr_results,
+        'successful_pages': [p for p in ocr_results['successful_pages'] if p['page_num'] in pages],
+        'failed_pages': [p for p in ocr_results['failed_pages'] if p['page_num'] in pages],
+        'all_results': {p: r for p, r in ocr_results['all_results'].items() if p in pages},
+    }
+
+
 def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
     """
     Given an upload_id, read metadata, fetch PDFs from GCS, run OCR on all pages.
@@ -305,6 +636,15 @@ def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
                 # Process all pages with OCR
                 ocr_results = process_all_pages_with_ocr(pdf_bytes, total_pages)
                 
+                # Save full OCR results to GCS
+                safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                save_ocr_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, ocr_results)
+                
+                # Only hand Phase 1's problem pages forward in memory
+                type_short = file_type.replace('PDF', '').lower()
+                problem_pages = _read_phase1_problem_pages(bucket, safe_carrier_name, type_short, total_pages)
+                
                 files_analysis.append({
                     'type': file_type,
                     'path': gs_path,
@@ -312,14 +652,10 @@ def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
                     'successful_pages': len(ocr_results.get('successful_pages', [])),
                     'failed_pages': len(ocr_results.get('failed_pages', [])),
                     'success_rate': f"{len(ocr_results['successful_pages'])}/{total_pages}",
-                    'ocr_results': ocr_results
+                    'problem_pages': sorted(problem_pages),
+                    'ocr_results': _filter_ocr_results(ocr_results, problem_pages)
                 })
                 
-                # Save OCR results to GCS
-                safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                save_ocr_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, ocr_results)
-                
             except Exception as e:
                 files_analysis.append({
                     'type': file_type,
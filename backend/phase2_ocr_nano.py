@@ -1,48 +1,168 @@
 """
 Phase 2: OCR Extraction
-After Phase 1 identifies problem pages, OCR extracts text from all pages
+After Phase 1 identifies problem pages, OCR extracts text from those pages
+(pages Phase 1 marked clean use their PyMuPDF text layer)
 Works with Google Cloud Storage
-Uses Joblib for parallel processing
+Uses a thread pool for parallel processing
 """
 import fitz
-from docstrange import DocumentExtractor
+import requests
+from requests.adapters import HTTPAdapter
 import os
 import json
 import re
-import time
 import tempfile
+import threading
+import queue
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, TextIO, Tuple
+import logging
+import logging.handlers
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import storage
-from joblib import Parallel, delayed
+from google.cloud.storage import transfer_manager
+from gcs_client import get_bucket
+from phase1 import _read_upload_record
+from phase2c_smart_selection import process_upload_smart_selection_analysis
 
-# Note: JOBLIB_MAX_NUM_THREADS is set by cpu_allocator.py based on workload
-# This allows dynamic CPU allocation (6 CPU for QC, 2-8 CPU for Summary)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import fastpdf2png  # PDFium + SIMD PNG encoder, optional
+    FASTPDF2PNG_AVAILABLE = True
+except ImportError:
+    FASTPDF2PNG_AVAILABLE = False
+
+# Buffered logger: per-page messages are batched instead of one stdout write per line.
+# The buffer flushes every 1024 records, on any ERROR, and at the end of each upload.
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_target = logging.StreamHandler(sys.stdout)
+    _log_target.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [phase2] %(message)s'))
+    logger.addHandler(logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=_log_target))
+    logger.setLevel(os.getenv('PHASE2_LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+
+
+def _flush_logs() -> None:
+    for handler in logger.handlers:
+        handler.flush()
+
+
+# Note: OCR pages are sent to NanoNets over HTTPS, so the worker count (OCR_WORKERS)
+# is independent of the JOBLIB_MAX_NUM_THREADS CPU allocation set by cpu_allocator.py
 
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 PDF_FOLDER = 'pdf'
 METADATA_FILE = f'{PDF_FOLDER}/uploads_metadata.json'
 
+# Whitespace-delimited all-letter tokens of 3+ chars (same as split() + len > 2 + isalpha())
+_READABLE_WORD_RE = re.compile(r'(?<!\S)[^\W\d_]{3,}(?!\S)')
+# Lines with at least one non-whitespace character
+_NON_EMPTY_LINE_RE = re.compile(r'^[^\n]*\S', re.MULTILINE)
+# Header line of the Phase 1 clean-pages report
+_CLEAN_PAGES_RE = re.compile(r'^Clean Page Numbers: \[(.*?)\]', re.MULTILINE)
+# First ranged read of that report; widened when the page list runs past it
+_PHASE1_HEADER_READ_BYTES = 4096
+# Upload timestamp in PDF paths, and run timestamp in Phase 1 report names
+_PDF_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})\.pdf$')
+_PHASE1_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})\.txt$')
+
+# PDFs at least this large are fetched with concurrent ranged requests
+PARALLEL_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024
+PARALLEL_DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+# Reports at least this large are uploaded as parallel chunks (below it the compose overhead dominates)
+PARALLEL_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+PARALLEL_UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+
+# NanoNets calls are network-bound, so this can safely exceed the CPU count
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', '8'))
+
+# Render matrix shared by every page (read-only, so safe to reuse)
+_MAT_2X = fitz.Matrix(2.0, 2.0)
+
+# Insurance forms are text; grayscale PNGs are ~3x smaller to upload. OCR_GRAYSCALE=false keeps RGB.
+OCR_GRAYSCALE = os.getenv('OCR_GRAYSCALE', 'true').strip().lower() != 'false'
+_OCR_COLORSPACE = fitz.csGRAY if OCR_GRAYSCALE else fitz.csRGB
+
+# 144 DPI matches the 2.0x PyMuPDF zoom used when fastpdf2png is not installed
+FASTPDF2PNG_DPI = int(os.getenv('FASTPDF2PNG_DPI', '144'))
+FASTPDF2PNG_WORKERS = int(os.getenv('FASTPDF2PNG_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Same endpoint docstrange's cloud mode posts to; called directly so page PNGs can be sent from memory
+NANONETS_API_URL = os.getenv('NANONETS_API_URL', 'https://extraction-api.nanonets.com/extract')
+NANONETS_OCR_MODEL = (os.getenv("NANONETS_OCR_MODEL", "nanonets-ocr-s") or "nanonets-ocr-s").strip()
+
 # NanoNets credentials must come from the environment (never commit keys to git).
-_nanonets_extractor: Optional[DocumentExtractor] = None
+_nanonets_session: Optional[requests.Session] = None
 
 
-def _get_nanonets_extractor() -> DocumentExtractor:
-    global _nanonets_extractor
-    if _nanonets_extractor is None:
+def _get_nanonets_session() -> requests.Session:
+    """Shared keep-alive session so parallel page uploads reuse TLS connections"""
+    global _nanonets_session
+    if _nanonets_session is None:
         api_key = os.getenv("NANONETS_API_KEY", "").strip()
         if not api_key:
             raise ValueError(
                 "NANONETS_API_KEY is not set. Add it in Railway (or .env) with your NanoNets API key."
             )
-        model = (os.getenv("NANONETS_OCR_MODEL", "nanonets-ocr-s") or "nanonets-ocr-s").strip()
-        _nanonets_extractor = DocumentExtractor(api_key=api_key, model=model)
-    return _nanonets_extractor
+        session = requests.Session()
+        session.headers['Authorization'] = f'Bearer {api_key}'
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max(OCR_WORKERS, 10)))
+        _nanonets_session = session
+    return _nanonets_session
 
 
-def _get_bucket() -> storage.bucket.Bucket:
-    client = storage.Client()
-    return client.bucket(BUCKET_NAME)
+def _nanonets_extract_markdown(png_bytes: bytes, page_num: int) -> str:
+    """Send one page PNG to NanoNets and return the markdown it extracted"""
+    response = _get_nanonets_session().post(
+        NANONETS_API_URL,
+        files={'file': (f'page{page_num}.png', png_bytes, 'image/png')},
+        data={'output_type': 'markdown', 'model_type': NANONETS_OCR_MODEL},
+        timeout=300
+    )
+    if response.status_code == 429:
+        raise RuntimeError("NanoNets rate limit exceeded. Please try again later.")
+    response.raise_for_status()
+    result_data = response.json()
+    # API returns the extracted text in 'content'
+    return result_data.get('content') or ''
+
+
+def _reset_clients_after_fork() -> None:
+    """Celery prefork children must not reuse the parent's sockets"""
+    global _nanonets_session
+    _nanonets_session = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
+
+_uploads_index_cache: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
+
+
+def _read_uploads_by_id(bucket: storage.bucket.Bucket) -> Dict[str, Dict[str, Any]]:
+    """uploadId -> upload record; only re-downloaded when the metadata blob generation changes"""
+    global _uploads_index_cache
+    blob = bucket.get_blob(METADATA_FILE)
+    if blob is None:
+        raise FileNotFoundError(f"{METADATA_FILE} not found in bucket {BUCKET_NAME}")
+    
+    cached = _uploads_index_cache
+    if cached is not None and cached[0] == blob.generation:
+        return cached[1]
+    
+    # blob carries its generation, so this downloads exactly the version we just checked
+    metadata = json.loads(blob.download_as_bytes())
+    uploads_by_id = {u.get('uploadId'): u for u in metadata.get('uploads', [])}
+    _uploads_index_cache = (blob.generation, uploads_by_id)
+    return uploads_by_id
 
 
 def _blob_path_from_gs_uri(gs_uri: str) -> str:
@@ -53,23 +173,38 @@ def _blob_path_from_gs_uri(gs_uri: str) -> str:
     return gs_uri  # assume already relative
 
 
-def _download_bytes(bucket: storage.bucket.Bucket, blob_path: str) -> bytes:
-    blob = bucket.blob(blob_path)
-    return blob.download_as_bytes()
-
-
-def _upload_text_to_gcs(bucket: storage.bucket.Bucket, file_path: str, content: str) -> None:
-    """Upload text file to GCS"""
-    blob = bucket.blob(file_path)
-    blob.upload_from_string(content, content_type='text/plain')
+def _download_pdf_to_tempfile(bucket: storage.bucket.Bucket, blob_path: str) -> str:
+    """Download a PDF to a local temp file (sliced parallel download for large files); caller deletes it"""
+    blob = bucket.get_blob(blob_path)
+    if blob is None:
+        raise FileNotFoundError(f"gs://{BUCKET_NAME}/{blob_path} not found")
+    
+    with tempfile.NamedTemporaryFile(suffix='.pdf', prefix='phase2_', delete=False) as f:
+        pdf_path = f.name
+    try:
+        download_chunks = getattr(transfer_manager, 'download_chunks_concurrently', None)
+        if download_chunks and (blob.size or 0) >= PARALLEL_DOWNLOAD_THRESHOLD:
+            # Several ranged GETs instead of one TCP stream
+            download_chunks(
+                blob, pdf_path,
+                chunk_size=PARALLEL_DOWNLOAD_CHUNK_SIZE,
+                worker_type=transfer_manager.THREAD,
+                max_workers=8
+            )
+        else:
+            blob.download_to_filename(pdf_path)
+    except Exception:
+        os.remove(pdf_path)
+        raise
+    return pdf_path
 
 
 def analyze_ocr_quality(text: str) -> Dict[str, Any]:
     """Analyze OCR text quality"""
     metrics = {
         'total_chars': len(text),
-        'readable_words': len([word for word in text.split() if len(word) > 2 and word.isalpha()]),
-        'lines': len([line for line in text.split('\n') if line.strip()]),
+        'readable_words': sum(1 for _ in _READABLE_WORD_RE.finditer(text)),
+        'lines': sum(1 for _ in _NON_EMPTY_LINE_RE.finditer(text)),
         'confidence_score': 0
     }
     
@@ -99,190 +234,200 @@ def analyze_ocr_quality(text: str) -> Dict[str, Any]:
     return metrics
 
 
-def extract_with_nanonets_ocr(pdf_bytes: bytes, page_num: int) -> Dict[str, Any]:
-    """Extract text using NanoNets OCR from PDF bytes
+def analyze_ocr_quality_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Analyze OCR quality for all pages of a document at once.
+    Same metrics as analyze_ocr_quality, but the confidence scoring runs as
+    one vectorized numpy computation instead of per-page branching.
+    """
+    if not NUMPY_AVAILABLE:
+        return [analyze_ocr_quality(text) for text in texts]
+    
+    chars = np.fromiter((len(t) for t in texts), dtype=np.int32, count=len(texts))
+    words = np.fromiter(
+        (sum(1 for _ in _READABLE_WORD_RE.finditer(t)) for t in texts),
+        dtype=np.int32, count=len(texts)
+    )
+    lines = [sum(1 for _ in _NON_EMPTY_LINE_RE.finditer(t)) for t in texts]
     
-    Thread-safe: Uses tempfile which generates unique file names automatically.
-    Each concurrent request gets its own unique temp file, preventing conflicts.
+    conf = (
+        100
+        - np.where(chars < 100, 30, np.where(chars < 500, 15, 0))
+        - np.where(words < 20, 40, np.where(words < 50, 20, 0))
+        + np.where(chars > 1000, 10, 0)
+        + np.where(words > 100, 10, 0)
+    )
+    conf = np.maximum(conf, 0)
+    
+    return [
+        {
+            'total_chars': int(chars[i]),
+            'readable_words': int(words[i]),
+            'lines': lines[i],
+            'confidence_score': int(conf[i])
+        }
+        for i in range(len(texts))
+    ]
+
+
+def _render_pages_with_fastpdf2png(pdf_path: str) -> Optional[List[bytes]]:
+    """Render every page to PNG bytes in one fastpdf2png call, None if unavailable or failed"""
+    if not FASTPDF2PNG_AVAILABLE:
+        return None
+    try:
+        pages_png = fastpdf2png.to_bytes(pdf_path, dpi=FASTPDF2PNG_DPI, workers=FASTPDF2PNG_WORKERS)
+        logger.info("Rendered %d pages with fastpdf2png (%d DPI)", len(pages_png), FASTPDF2PNG_DPI)
+        return pages_png
+    except Exception as e:
+        logger.warning("fastpdf2png rendering failed, falling back to PyMuPDF: %s", e)
+        return None
+
+
+def _render_page_png(page: "fitz.Page") -> bytes:
+    """Render a page to PNG bytes (2.0x zoom for better table detection, grayscale by default)"""
+    pix = page.get_pixmap(matrix=_MAT_2X, alpha=False, colorspace=_OCR_COLORSPACE)
+    return pix.tobytes("png")
+
+
+def _failed_page_result(error: str) -> Dict[str, Any]:
+    return {
+        'text': '',
+        'metrics': {'total_chars': 0, 'readable_words': 0, 'lines': 0, 'confidence_score': 0},
+        'success': False,
+        'error': error
+    }
+
+
+def extract_with_nanonets_ocr(png_bytes: bytes, page_num: int) -> Dict[str, Any]:
+    """Extract text using NanoNets OCR from an already rendered page PNG
+    
+    Thread-safe: no PDF access here, the PNG stays in memory and is uploaded directly.
     """
-    import threading
-    temp_image_path = None
-    doc = None
     try:
-        print(f"  Converting page {page_num} to image...")
-        
-        # Open PDF and get page
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        page = doc[page_num - 1]  # PyMuPDF uses 0-based indexing
-        
-        # Convert page to image (2.0x zoom for better table detection)
-        mat = fitz.Matrix(2.0, 2.0)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        
-        # Create unique temp file for the image
-        # Generate unique filename and let pix.save() create the file
-        process_id = os.getpid()
-        thread_id = threading.get_ident()
-        
-        # Use system temp directory (handles concurrent users properly)
-        temp_dir = tempfile.gettempdir()
-        
-        # Generate unique filename WITHOUT pre-creating the file
-        # This lets pix.save() create and manage the file properly
-        unique_name = f"nanonets_ocr_{process_id}_{thread_id}_page{page_num}_{int(time.time()*1000000)}.png"
-        temp_image_path = os.path.join(temp_dir, unique_name)
+        if not png_bytes:
+            logger.warning("Page %d image is EMPTY! This might cause OCR to fail.", page_num)
         
-        # Save image to temp file
-        # Let pix.save() create and write the file - it handles this better than we can
-        pix.save(temp_image_path)
-        
-        # CRITICAL: Release pixmap resources immediately after saving
-        # This ensures the file is fully written and released before NanoNets accesses it
-        pix = None  # Release pixmap reference
-        
-        # Debug: Verify temp file was created and has content
-        if os.path.exists(temp_image_path):
-            file_size = os.path.getsize(temp_image_path)
-            print(f"    [DEBUG] Temp image created: {temp_image_path} ({file_size} bytes)")
-            if file_size == 0:
-                print(f"    [WARNING] Temp image file is EMPTY! This might cause OCR to fail.")
-        else:
-            print(f"    [ERROR] Temp image file was NOT created: {temp_image_path}")
-        
-        # Close PDF document and release resources before calling NanoNets
-        doc.close()
-        doc = None  # Mark as closed
-        
-        # Small delay to ensure all file handles are fully released on Windows
-        time.sleep(0.2)
-        
-        print(f"  Running NanoNets OCR on page {page_num}...")
+        logger.debug("Running NanoNets OCR on page %d...", page_num)
         
         page_text = ""
         ocr_success = False
         ocr_error = None
         
         try:
-            # Extract text using NanoNets
-            result = _get_nanonets_extractor().extract(temp_image_path)
-            
-            # Wait a bit for processing (especially for larger pages)
-            time.sleep(1)
-            
-            # Extract markdown content
-            markdown_content = result.extract_markdown()
+            # Extract markdown content (blocking HTTP call, returns once NanoNets is done)
+            markdown_content = _nanonets_extract_markdown(png_bytes, page_num)
             
             if markdown_content and len(markdown_content.strip()) > 0:
                 page_text = markdown_content.strip()
                 ocr_success = True
-                print(f"    [SUCCESS] NanoNets OCR successful ({len(page_text)} chars)")
+                logger.debug("NanoNets OCR successful on page %d (%d chars)", page_num, len(page_text))
             else:
                 ocr_error = "Empty OCR result"
-                print(f"    [WARNING] NanoNets OCR returned empty content")
+                logger.warning("NanoNets OCR returned empty content for page %d", page_num)
                 
         except Exception as e:
-            error_str = str(e)
-            # Check if this is a file deletion/permission error (likely from NanoNets cleanup)
-            # If OCR actually succeeded before cleanup failed, we should still mark as success if we got content
-            if "cannot remove file" in error_str.lower() or "permission denied" in error_str.lower():
-                # This might be a cleanup error, but OCR may have actually worked
-                # Check if we can extract any result despite the error
-                try:
-                    # Try to get the result again if possible, or check if we got content
-                    if 'result' in locals() and hasattr(result, 'extract_markdown'):
-                        markdown_content = result.extract_markdown()
-                        if markdown_content and len(markdown_content.strip()) > 0:
-                            page_text = markdown_content.strip()
-                            ocr_success = True
-                            print(f"    [SUCCESS] NanoNets OCR successful ({len(page_text)} chars) (cleanup warning ignored)")
-                        else:
-                            ocr_error = "Empty OCR result"
-                            print(f"    [WARNING] NanoNets OCR returned empty content")
-                    else:
-                        ocr_error = f"OCR extraction failed: {error_str}"
-                        print(f"    [ERROR] NanoNets OCR extraction failed: {e}")
-                except:
-                    ocr_error = f"OCR failed: {error_str}"
-                    print(f"    [ERROR] NanoNets OCR failed: {e}")
-            else:
-                # Real OCR error
-                ocr_error = f"OCR extraction failed: {error_str}"
-                print(f"    [ERROR] NanoNets OCR failed: {e}")
-        
-        # Analyze OCR quality
-        metrics = analyze_ocr_quality(page_text)
+            # page_text is only set after a successful response, so any exception is a failed page
+            ocr_error = f"OCR extraction failed: {e}"
+            logger.error("NanoNets OCR failed on page %d: %s", page_num, e)
         
+        # Quality metrics are computed for the whole document in process_all_pages_with_ocr
         return {
             'text': page_text,
-            'metrics': metrics,
             'success': ocr_success,
-            'error': None if ocr_success else (ocr_error or "Empty or failed OCR result"),
-            'temp_file_path': temp_image_path  # Return temp file path for later cleanup
+            'error': None if ocr_success else (ocr_error or "Empty or failed OCR result")
         }
         
     except Exception as e:
-        print(f"  [ERROR] OCR failed on page {page_num}: {e}")
-        return {
-            'text': '',
-            'metrics': {'total_chars': 0, 'readable_words': 0, 'lines': 0, 'confidence_score': 0},
-            'success': False,
-            'error': str(e),
-            'temp_file_path': temp_image_path  # Still return temp file path for cleanup
-        }
-    finally:
-        # Ensure PDF document is closed
-        if doc:
-            try:
-                doc.close()
-            except:
-                pass
-        # NOTE: Temp file cleanup is deferred until all pages are processed
-        # This avoids Windows file locking issues during OCR processing
+        logger.error("OCR failed on page %d: %s", page_num, e)
+        return _failed_page_result(str(e))
 
 
-def process_all_pages_with_ocr(pdf_bytes: bytes, total_pages: int, n_jobs: int = -1) -> Dict[str, Any]:
+def process_all_pages_with_ocr(doc: "fitz.Document", n_jobs: int = -1, problem_pages: Optional[Set[int]] = None) -> Dict[str, Any]:
     """
-    Process ALL pages with OCR - PARALLELIZED with Joblib
+    Process ALL pages with OCR - PARALLELIZED with a thread pool
+    
+    One producer thread renders pages from the open document (PyMuPDF is not thread-safe)
+    into a bounded queue; worker threads pull PNGs and upload them to NanoNets, so
+    rendering overlaps with the HTTP round-trips without holding every page in memory.
     
     Args:
-        pdf_bytes: PDF file bytes
-        total_pages: Total number of pages
-        n_jobs: Number of parallel workers (default: -1 for all cores)
+        doc: Open PDF document (opened from a local file)
+        n_jobs: Number of parallel workers (default: -1 uses OCR_WORKERS)
+        problem_pages: Pages that need OCR. Other pages are left out of the results, so
+            Phase 2C uses their Phase 1 PyMuPDF text. None means OCR every page.
     """
-    import os
+    total_pages = doc.page_count
     cpu_count = os.cpu_count() or 1
     
-    # Get actual worker count from JOBLIB_MAX_NUM_THREADS (set by cpu_allocator)
-    joblib_threads = int(os.environ.get('JOBLIB_MAX_NUM_THREADS', cpu_count))
-    actual_workers = joblib_threads if n_jobs == -1 else n_jobs
-    
-    print("\n" + "=" * 80)
-    print("PHASE 2: OCR EXTRACTION - ALL PAGES (PARALLEL)")
-    print("=" * 80)
-    print(f"Processing {total_pages} pages with NanoNets OCR")
-    print(f"System CPU Cores: {cpu_count}")
-    print(f"JOBLIB_MAX_NUM_THREADS: {joblib_threads}")
-    print(f"Allocated Workers: {actual_workers}")
-    print(f"Task Type: Summary (Dynamic CPU allocation)")
-    print("=" * 80 + "\n")
-    
-    def process_single_page(page_num):
-        """Process single page - called in parallel by Joblib"""
-        print(f"\nProcessing Page {page_num}...")
-        ocr_result = extract_with_nanonets_ocr(pdf_bytes, page_num)
-        return page_num, ocr_result
-    
-    # Process all pages in parallel using Joblib
-    # backend='threading' is perfect for I/O-bound tasks (API calls)
-    # verbose=5 shows progress (0-50, higher = more verbose)
-    results_list = Parallel(
-        n_jobs=n_jobs,
-        backend='threading',
-        verbose=5
-    )(
-        delayed(process_single_page)(page_num)
-        for page_num in range(1, total_pages + 1)
-    )
+    # Each page is one NanoNets HTTPS round-trip, so the pool is sized for I/O, not CPU cores
+    actual_workers = max(1, OCR_WORKERS if n_jobs == -1 else n_jobs)
+    
+    logger.info("PHASE 2: OCR EXTRACTION - ALL PAGES (PARALLEL) | %d pages with NanoNets OCR | CPU cores: %d | OCR workers: %d",
+                total_pages, cpu_count, actual_workers)
+    
+    # One request per page on purpose: Phase 2C/2D compare OCR vs PyMuPDF page by page, and the
+    # extraction endpoint returns a single markdown blob for a multi-page PDF with no page mapping.
+    # Results are keyed by page_num so completion order doesn't matter
+    if problem_pages is None:
+        pages_to_ocr = list(range(1, total_pages + 1))
+    else:
+        pages_to_ocr = sorted(p for p in problem_pages if 1 <= p <= total_pages)
+        logger.info("OCR on %d/%d Phase 1 problem pages, PyMuPDF text for the rest", len(pages_to_ocr), total_pages)
+    pages_png = None
+    # fastpdf2png can only render the whole document, so it is used only when every page needs OCR
+    if len(pages_to_ocr) == total_pages:
+        pages_png = _render_pages_with_fastpdf2png(doc.name)
+    if pages_png is not None and len(pages_png) != total_pages:
+        logger.warning("fastpdf2png returned %d pages, expected %d; using PyMuPDF", len(pages_png), total_pages)
+        pages_png = None
+    
+    ocr_by_page: Dict[int, Dict[str, Any]] = {}
+    # Backpressure: the producer blocks once this many rendered pages are waiting
+    png_queue: "queue.Queue" = queue.Queue(maxsize=actual_workers * 2)
+    
+    def produce_pages():
+        try:
+            for page_num in pages_to_ocr:
+                if pages_png:
+                    png_queue.put((page_num, pages_png[page_num - 1], None))
+                    continue
+                try:
+                    logger.debug("Converting page %d to image...", page_num)
+                    png_bytes = _render_page_png(doc[page_num - 1])
+                except Exception as e:
+                    png_queue.put((page_num, None, str(e)))
+                    continue
+                png_queue.put((page_num, png_bytes, None))
+        finally:
+            for _ in range(actual_workers):
+                png_queue.put(None)  # one stop marker per worker
+    
+    def consume_pages():
+        while True:
+            item = png_queue.get()
+            if item is None:
+                return
+            page_num, png_bytes, render_error = item
+            if render_error:
+                logger.error("OCR failed on page %d: %s", page_num, render_error)
+                ocr_by_page[page_num] = _failed_page_result(render_error)
+            else:
+                ocr_by_page[page_num] = extract_with_nanonets_ocr(png_bytes, page_num)
+            logger.debug("Progress: %d/%d pages", len(ocr_by_page), total_pages)
+    
+    producer = threading.Thread(target=produce_pages, name="phase2-render", daemon=True)
+    producer.start()
+    with ThreadPoolExecutor(max_workers=actual_workers) as executor:
+        workers = [executor.submit(consume_pages) for _ in range(actual_workers)]
+        for worker in workers:
+            worker.result()
+    producer.join()
+    
+    # A page the producer never reached still gets an entry, so one bad page cannot fail the file
+    results_list = [
+        (page_num, ocr_by_page.get(page_num) or _failed_page_result("Page was not rendered"))
+        for page_num in pages_to_ocr
+    ]
     
     # Organize results
     results = {
@@ -292,17 +437,14 @@ def process_all_pages_with_ocr(pdf_bytes: bytes, total_pages: int, n_jobs: int =
         'total_pages': total_pages
     }
     
-    temp_files_to_cleanup = []
+    # Score every OCR'd page in one vectorized pass (render/request failures already carry zero metrics)
+    unscored = [ocr_result for _, ocr_result in results_list if 'metrics' not in ocr_result]
+    for ocr_result, metrics in zip(unscored, analyze_ocr_quality_batch([r['text'] for r in unscored])):
+        ocr_result['metrics'] = metrics
     
     # Process results from parallel execution
     for page_num, ocr_result in results_list:
-        # Collect temp file path for cleanup
-        if ocr_result.get('temp_file_path'):
-            temp_files_to_cleanup.append(ocr_result['temp_file_path'])
-        
-        # Store results (without temp_file_path)
-        result_to_store = {k: v for k, v in ocr_result.items() if k != 'temp_file_path'}
-        results['all_results'][page_num] = result_to_store
+        results['all_results'][page_num] = ocr_result
         
         if ocr_result['success']:
             results['successful_pages'].append({
@@ -311,90 +453,141 @@ def process_all_pages_with_ocr(pdf_bytes: bytes, total_pages: int, n_jobs: int =
                 'metrics': ocr_result['metrics']
             })
             metrics = ocr_result['metrics']
-            print(f"  ✅ Page {page_num} SUCCESS - {metrics['total_chars']} chars, {metrics['readable_words']} words, {metrics['confidence_score']:.1f}% confidence")
+            logger.debug("Page %d SUCCESS - %d chars, %d words, %.1f%% confidence",
+                         page_num, metrics['total_chars'], metrics['readable_words'], metrics['confidence_score'])
         else:
             results['failed_pages'].append({
                 'page_num': page_num,
                 'error': ocr_result.get('error')
             })
-            print(f"  ❌ Page {page_num} FAILED - {ocr_result.get('error')}")
-    
-    # Clean up temp files
-    if temp_files_to_cleanup:
-        print(f"\n🧹 Cleaning up {len(temp_files_to_cleanup)} temporary files...")
-        cleanup_count = 0
-        for temp_file_path in temp_files_to_cleanup:
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    time.sleep(0.1)
-                    os.remove(temp_file_path)
-                    cleanup_count += 1
-                except Exception as e:
-                    print(f"    [WARNING] Could not delete temp file {os.path.basename(temp_file_path)}: {e}")
-        
-        if cleanup_count == len(temp_files_to_cleanup):
-            print(f"✅ Successfully cleaned up {cleanup_count} temporary files")
-        elif cleanup_count > 0:
-            print(f"⚠️  Cleaned up {cleanup_count}/{len(temp_files_to_cleanup)} temporary files (OS will handle the rest)")
-        else:
-            print(f"⚠️  Could not clean up temp files (OS will handle cleanup automatically)")
+            logger.warning("Page %d FAILED - %s", page_num, ocr_result.get('error'))
     
-    print(f"\n✅ Parallel OCR processing complete: {len(results['successful_pages'])}/{total_pages} pages successful")
+    logger.info("Parallel OCR processing complete: %d/%d pages successful", len(results['successful_pages']), len(pages_to_ocr))
+    _flush_logs()
     
     return results
 
 
+def _write_ocr_report(out: TextIO, carrier_name: str, results: Dict[str, Any]) -> None:
+    """Write the Phase 2 OCR text report to a file-like object"""
+    w = out.write
+    w("OCR EXTRACTION RESULTS - ALL PAGES\n")
+    w("=" * 80 + "\n")
+    w(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    w(f"Carrier: {carrier_name}\n")
+    w(f"Method: NanoNets OCR (2.0x zoom{', grayscale' if OCR_GRAYSCALE else ''})\n")
+    w(f"Total Pages: {len(results['successful_pages'])}\n")
+    w(f"Success Rate: {len(results['successful_pages'])}/{len(results['all_results'])} ({len(results['successful_pages'])/max(1, len(results['all_results']))*100:.1f}%)\n")
+    w("=" * 80 + "\n")
+    
+    for page_result in results['successful_pages']:
+        metrics = page_result['metrics']
+        w("\n")
+        w(f"PAGE {page_result['page_num']}:\n")
+        w("-" * 40 + "\n")
+        w(f"Total Characters: {metrics['total_chars']}\n")
+        w(f"Readable Words: {metrics['readable_words']}\n")
+        w(f"Lines: {metrics['lines']}\n")
+        w(f"Confidence Score: {metrics['confidence_score']:.1f}%\n")
+        w("\n")
+        w("OCR EXTRACTED TEXT:\n")
+        w("-" * 40 + "\n")
+        w(page_result['text'])
+        w("\n")
+        w("=" * 80 + "\n")
+
+
 def save_ocr_results_to_gcs(bucket: storage.bucket.Bucket, carrier_name: str, safe_carrier_name: str, file_type: str, timestamp: str, results: Dict[str, Any]) -> None:
     """Save OCR results to GCS with file type in filename"""
     # Convert file_type: 'propertyPDF' -> 'property', 'liabilityPDF' -> 'liability'
     type_short = file_type.replace('PDF', '').lower()
     ocr_file_path = f'phase2/results/{safe_carrier_name}_{type_short}_ocr_all_pages_{timestamp}.txt'
     
-    report_lines = []
-    report_lines.append("OCR EXTRACTION RESULTS - ALL PAGES")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append(f"Carrier: {carrier_name}")
-    report_lines.append(f"Method: NanoNets OCR (2.0x zoom)")
-    report_lines.append(f"Total Pages: {len(results['successful_pages'])}")
-    report_lines.append(f"Success Rate: {len(results['successful_pages'])}/{len(results['all_results'])} ({len(results['successful_pages'])/len(results['all_results'])*100:.1f}%)")
-    report_lines.append("=" * 80)
-    report_lines.append("")
+    blob = bucket.blob(ocr_file_path)
+    upload_chunks = getattr(transfer_manager, 'upload_chunks_concurrently', None)
+    approx_size = sum(len(p['text']) for p in results['successful_pages'])
     
-    for page_result in results['successful_pages']:
-        page_num = page_result['page_num']
-        report_lines.append(f"PAGE {page_num}:")
-        report_lines.append("-" * 40)
-        report_lines.append(f"Total Characters: {page_result['metrics']['total_chars']}")
-        report_lines.append(f"Readable Words: {page_result['metrics']['readable_words']}")
-        report_lines.append(f"Lines: {page_result['metrics']['lines']}")
-        report_lines.append(f"Confidence Score: {page_result['metrics']['confidence_score']:.1f}%")
-        report_lines.append("")
-        report_lines.append("OCR EXTRACTED TEXT:")
-        report_lines.append("-" * 40)
-        report_lines.append(page_result['text'])
-        report_lines.append("=" * 80)
-        report_lines.append("")
-    
-    report_content = "\n".join(report_lines)
-    _upload_text_to_gcs(bucket, ocr_file_path, report_content)
-    
-    print(f"✅ Saved OCR results to: gs://{BUCKET_NAME}/{ocr_file_path}")
+    if upload_chunks and approx_size >= PARALLEL_UPLOAD_THRESHOLD:
+        # Large report: spool to disk, then upload chunks over several connections
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', prefix='phase2_report_', delete=False) as out:
+            report_path = out.name
+            _write_ocr_report(out, carrier_name, results)
+        try:
+            upload_chunks(
+                report_path, blob,
+                content_type='text/plain',
+                chunk_size=PARALLEL_UPLOAD_CHUNK_SIZE,
+                worker_type=transfer_manager.THREAD,
+                max_workers=8
+            )
+        finally:
+            os.remove(report_path)
+    else:
+        # Stream the report straight into a resumable upload instead of building it in memory
+        with blob.open('w', content_type='text/plain') as out:
+            _write_ocr_report(out, carrier_name, results)
+    
+    logger.info("Saved OCR results to: gs://%s/%s", BUCKET_NAME, ocr_file_path)
+
+
+def _read_phase1_problem_pages(bucket: storage.bucket.Bucket, pdf_info: Dict[str, Any], safe_carrier_name: str, type_short: str, total_pages: int) -> Set[int]:
+    """
+    Pages Phase 1 did not mark as clean (problem + borderline).
+    Uses the cleanPageNumbers Phase 1 stores in the upload record; uploads analysed before
+    that fall back to the header of the Phase 1 clean-pages report for this PDF.
+    Every page counts as a problem page when neither is available.
+    """
+    all_pages = set(range(1, total_pages + 1))
+    clean_page_numbers = pdf_info.get('cleanPageNumbers')
+    if clean_page_numbers is not None:
+        return all_pages - set(clean_page_numbers)
+    
+    phase1_files = list(bucket.list_blobs(
+        prefix=f'phase1/results/{safe_carrier_name}_{type_short}_pymupdf_clean_pages_only_',
+        fields='items(name),nextPageToken'
+    ))
+    # Phase 1 runs after the upload, so this PDF's report is the first one stamped at or after it;
+    # newer reports for the same carrier may belong to a later upload
+    pdf_match = _PDF_TIMESTAMP_RE.search(pdf_info.get('path', ''))
+    if pdf_match:
+        reports_for_pdf = []
+        for blob in phase1_files:
+            report_match = _PHASE1_TIMESTAMP_RE.search(blob.name)
+            if report_match and report_match.group(1) >= pdf_match.group(1):
+                reports_for_pdf.append(blob)
+        report = min(reports_for_pdf, key=lambda b: b.name, default=None)
+    else:
+        report = max(phase1_files, key=lambda b: b.name, default=None)
+    if report is None:
+        return all_pages
+    
+    # The page list sits on one header line; keep widening the read while that line is cut off
+    read_size = _PHASE1_HEADER_READ_BYTES
+    while True:
+        header = report.download_as_bytes(start=0, end=read_size - 1)
+        match = _CLEAN_PAGES_RE.search(header.decode('utf-8', errors='ignore'))
+        if match or len(header) < read_size or b'Clean Page Numbers: [' not in header:
+            break
+        read_size *= 4
+    if not match:
+        logger.warning("No clean page list in %s header; running OCR on all %d pages", report.name, total_pages)
+        return all_pages
+    
+    clean_pages = {int(n) for n in re.findall(r'\d+', match.group(1))}
+    return all_pages - clean_pages
 
 
 def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
     """
-    Given an upload_id, read metadata, fetch PDFs from GCS, run OCR on all pages.
+    Given an upload_id, read metadata, fetch PDFs from GCS, run OCR on Phase 1 problem pages.
     Automatically called after Phase 1 quality analysis.
     """
-    bucket = _get_bucket()
-    
-    # Read metadata
-    from phase1 import _read_metadata
-    metadata = _read_metadata(bucket)
+    bucket = get_bucket(BUCKET_NAME)
     
-    uploads: List[Dict[str, Any]] = metadata.get('uploads', [])
-    record = next((u for u in uploads if u.get('uploadId') == upload_id), None)
+    # Read the per-upload record; older uploads only exist in uploads_metadata.json
+    record = _read_upload_record(bucket, upload_id)
+    if record is None:
+        record = _read_uploads_by_id(bucket).get(upload_id)
     if record is None:
         return {"success": False, "error": f"uploadId {upload_id} not found"}
     
@@ -415,17 +608,21 @@ def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
             
             blob_path = _blob_path_from_gs_uri(gs_path)
             
+            pdf_path = None
+            doc = None
             try:
-                # Download PDF bytes
-                pdf_bytes = _download_bytes(bucket, blob_path)
+                # Download PDF to disk; MuPDF reads it from the file instead of a Python bytes copy
+                pdf_path = _download_pdf_to_tempfile(bucket, blob_path)
                 
-                # Open PDF to get total pages
-                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+                # Open the PDF once; the same document is used for page count and rendering
+                doc = fitz.open(pdf_path)
                 total_pages = doc.page_count
-                doc.close()
                 
-                # Process all pages with OCR
-                ocr_results = process_all_pages_with_ocr(pdf_bytes, total_pages)
+                # OCR only the pages Phase 1 did not mark clean
+                safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+                type_short = file_type.replace('PDF', '').lower()
+                problem_pages = _read_phase1_problem_pages(bucket, pdf_info, safe_carrier_name, type_short, total_pages)
+                ocr_results = process_all_pages_with_ocr(doc, problem_pages=problem_pages)
                 
                 files_analysis.append({
                     'type': file_type,
@@ -433,12 +630,11 @@ def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
                     'total_pages': total_pages,
                     'successful_pages': len(ocr_results.get('successful_pages', [])),
                     'failed_pages': len(ocr_results.get('failed_pages', [])),
-                    'success_rate': f"{len(ocr_results['successful_pages'])}/{total_pages}",
+                    'success_rate': f"{len(ocr_results['successful_pages'])}/{len(ocr_results['all_results'])}",
                     'ocr_results': ocr_results
                 })
                 
                 # Save OCR results to GCS
-                safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 save_ocr_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, ocr_results)
                 
@@ -448,6 +644,11 @@ def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
                     'path': gs_path,
                     'error': str(e)
                 })
+            finally:
+                if doc:
+                    doc.close()
+                if pdf_path and os.path.exists(pdf_path):
+                    os.remove(pdf_path)
         
         results.append({
             'carrierName': carrier_name,
@@ -463,14 +664,17 @@ def process_upload_ocr_analysis(upload_id: str) -> Dict[str, Any]:
     
     # Automatically trigger Phase 2C Smart Selection after OCR completes
     try:
-        print("\n✅ Phase 2 OCR complete. Starting Phase 2C Smart Selection...")
-        from phase2c_smart_selection import process_upload_smart_selection_analysis
+        logger.info("Phase 2 OCR complete. Starting Phase 2C Smart Selection...")
+        _flush_logs()
         selection_result = process_upload_smart_selection_analysis(upload_id)
         if selection_result.get('success'):
-            print("✅ Phase 2C Smart Selection complete!")
+            logger.info("Phase 2C Smart Selection complete!")
         else:
-            print(f"Warning: Phase 2C had issues: {selection_result.get('error')}")
+            logger.warning("Phase 2C had issues: %s", selection_result.get('error'))
     except Exception as e:
-        print(f"Warning: Phase 2C Smart Selection failed: {e}")
+        logger.warning("Phase 2C Smart Selection failed: %s", e)
+    finally:
+        # Write out the Phase 2C outcome too, not only the OCR records flushed above
+        _flush_logs()
     
     return result
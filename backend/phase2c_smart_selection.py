@@ -5,36 +5,98 @@ Fallback to PyMuPDF only if OCR is unavailable.
 Works with Google Cloud Storage.
 No LLM calls - faster and cheaper.
 """
-import openai
 import json
 import os
 import re
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from dotenv import load_dotenv
+from gcs_client import get_bucket
 
 load_dotenv()
 
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 
-# Initialize OpenAI
-openai.api_key = os.getenv('OPENAI_API_KEY')
+# Carrier files processed concurrently (each is dominated by GCS round trips)
+SELECTION_WORKERS = int(os.getenv('PHASE2C_WORKERS', '8'))
 
-if not openai.api_key:
-    print("Warning: OPENAI_API_KEY not found in environment variables!")
-    print("Phase 2C Smart Selection will fail without OpenAI API key")
+# Page sections in the Phase 1 clean-pages and Phase 2 OCR reports
+_PAGE_HEADER = re.compile(r'^PAGE (\d+):', re.MULTILINE)
+_PAGE_SEPARATOR = '\n' + '=' * 80
+_PYMUPDF_TEXT_MARKERS = ('TEXT CONTENT:\n',)
+_OCR_TEXT_MARKERS = ('OCR EXTRACTED TEXT:', '-' * 40 + '\n')
 
-
-def _get_bucket() -> storage.bucket.Bucket:
-    client = storage.Client()
-    return client.bucket(BUCKET_NAME)
+# Text results at least this large are downloaded as parallel ranged chunks
+PARALLEL_DOWNLOAD_THRESHOLD = 8 * 1024 * 1024
+PARALLEL_DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
 
 
 def _download_text_from_gcs(bucket: storage.bucket.Bucket, blob_path: str) -> str:
-    """Download text file from GCS"""
-    blob = bucket.blob(blob_path)
-    return blob.download_as_string().decode('utf-8')
+    """Download text file from GCS (sliced parallel download for large files)"""
+    blob = bucket.get_blob(blob_path)
+    if blob is None:
+        return ""
+    
+    download_chunks = getattr(transfer_manager, 'download_chunks_concurrently', None)
+    if download_chunks and (blob.size or 0) >= PARALLEL_DOWNLOAD_THRESHOLD:
+        with tempfile.NamedTemporaryFile(suffix='.txt', prefix='phase2c_', delete=False) as f:
+            text_path = f.name
+        try:
+            # Several ranged GETs instead of one TCP stream
+            download_chunks(
+                blob, text_path,
+                chunk_size=PARALLEL_DOWNLOAD_CHUNK_SIZE,
+                worker_type=transfer_manager.THREAD,
+                max_workers=8
+            )
+            with open(text_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        finally:
+            os.remove(text_path)
+    
+    # crc32c validation runs in the C extension; md5 is computed in Python
+    return blob.download_as_bytes(checksum='crc32c').decode('utf-8')
+
+
+def _index_result_blobs(bucket: storage.bucket.Bucket, folder: str, marker: str) -> Dict[Tuple[str, str], List[storage.Blob]]:
+    """
+    List a results folder once and group its blobs by (safe_carrier_name, type_short).
+    Result files are named {safe_carrier_name}_{type_short}{marker}{timestamp}.ext, so within
+    one key the largest name is the newest file (no time_created lookups needed).
+    """
+    index: Dict[Tuple[str, str], List[storage.Blob]] = defaultdict(list)
+    # Only the names are needed, so skip the rest of each object's metadata
+    for blob in bucket.list_blobs(prefix=folder, fields='items(name),nextPageToken'):
+        name_key, found, _ = blob.name[len(folder):].partition(marker)
+        if not found:
+            continue
+        safe_carrier_name, _, type_short = name_key.rpartition('_')
+        index[(safe_carrier_name, type_short)].append(blob)
+    return index
+
+
+def _iter_page_sections(content: str, *text_markers: str):
+    """
+    Yield (page_num, page_text) for each PAGE section of a Phase 1/2 text report.
+    A section ends at an '=' * 80 line; its text starts after the last of text_markers.
+    """
+    for section in content.split(_PAGE_SEPARATOR):
+        header = _PAGE_HEADER.search(section)
+        if not header:
+            continue
+        pos = header.end()
+        for marker in text_markers:
+            pos = section.find(marker, pos)
+            if pos == -1:
+                break
+            pos += len(marker)
+        else:
+            yield int(header.group(1)), section[pos:]
 
 
 def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: dict) -> None:
@@ -53,10 +115,10 @@ def read_pymupdf_clean_pages_from_gcs(bucket: storage.bucket.Bucket, file_path:
         clean_pages = {}
         
         # Extract clean pages
-        page_sections = re.findall(r'PAGE (\d+):.*?TEXT CONTENT:\n(.*?)\n={80}', content, re.DOTALL)
+        page_sections = _iter_page_sections(content, *_PYMUPDF_TEXT_MARKERS)
         
         for page_num, page_text in page_sections:
-            clean_pages[int(page_num)] = {
+            clean_pages[page_num] = {
                 'text': page_text.strip(),
                 'source': 'PyMuPDF'
             }
@@ -75,10 +137,10 @@ def read_ocr_all_pages_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -
         ocr_pages = {}
         
         # Extract OCR pages
-        page_sections = re.findall(r'PAGE (\d+):.*?OCR EXTRACTED TEXT:.*?----------------------------------------\n(.*?)\n={80}', content, re.DOTALL)
+        page_sections = _iter_page_sections(content, *_OCR_TEXT_MARKERS)
         
         for page_num, page_text in page_sections:
-            ocr_pages[int(page_num)] = {
+            ocr_pages[page_num] = {
                 'text': page_text.strip(),
                 'source': 'OCR'
             }
@@ -96,110 +158,6 @@ def get_all_page_numbers(pymupdf_pages: Dict[int, Dict], ocr_pages: Dict[int, Di
     return sorted(list(all_pages))
 
 
-def create_selection_prompt(page_num: int, pymupdf_text: str, ocr_text: str) -> str:
-    """Create prompt for LLM to select best text source"""
-    
-    # Truncate texts to focus on key information (first 300 chars)
-    pymupdf_preview = pymupdf_text[:300] if pymupdf_text else "NOT AVAILABLE"
-    ocr_preview = ocr_text[:300] if ocr_text else "NOT AVAILABLE"
-    
-    # Add truncation notice if text was cut
-    pymupdf_notice = "\n[... text truncated for analysis ...]" if len(pymupdf_text) > 3000 else ""
-    ocr_notice = "\n[... text truncated for analysis ...]" if len(ocr_text) > 3000 else ""
-    
-    prompt = f"""
-You are a text quality analyzer for insurance documents. Compare two text extractions for Page {page_num} and decide which one is better.
-
-CRITICAL INSURANCE DOCUMENT CRITERIA:
-1. DATA COMPLETENESS - Which text contains actual data values vs blank fields?
-2. DATA CORRECTNESS - Which text has accurate data without OCR errors?
-3. READABILITY - Which text is more readable and coherent?
-
-IMPORTANT: For insurance documents, DATA COMPLETENESS AND CORRECTNESS are the most critical factors. 
-- A form with blank fields (like "Account No. ______________________") is WORSE than a form with actual data values
-- A form with incorrect OCR data (like "Account No. 8l7553.l" instead of "817553.1") is WORSE than a form with correct data
-- Choose the source that provides the most complete AND accurate data
-
-PYMUPDF EXTRACTION (Page {page_num}):
-{pymupdf_preview}{pymupdf_notice}
-
-OCR EXTRACTION (Page {page_num}):
-{ocr_preview}{ocr_notice}
-
-SELECTION RULES:
-- If PyMuPDF text is NOT AVAILABLE, choose OCR
-- If OCR text is NOT AVAILABLE, choose PyMuPDF  
-- If PyMuPDF has blank fields (like "______________________") and OCR has actual data, choose OCR
-- If OCR has obvious errors and PyMuPDF has correct data, choose PyMuPDF
-- If both have data, choose the more complete AND accurate one
-
-SPECIFIC RED FLAGS TO AVOID:
-- Blank account numbers, policy numbers, or dollar amounts
-- Forms with empty fields where data should be
-- OCR character recognition errors (0/O, 1/I, 6/G, 8/B, etc.)
-
-Return ONLY a JSON response with this exact format:
-{{
-    "page": {page_num},
-    "selected_source": "PyMuPDF" or "OCR",
-    "reason": "Brief explanation focusing on data completeness and correctness",
-    "confidence": "high" or "medium" or "low"
-}}
-
-Do not provide any other text, only the JSON response.
-"""
-    
-    return prompt
-
-
-def select_best_source_with_llm(page_num: int, pymupdf_text: str, ocr_text: str) -> Dict[str, Any]:
-    """Use GPT-3.5 to select best text source for a page"""
-    
-    prompt = create_selection_prompt(page_num, pymupdf_text, ocr_text)
-    
-    try:
-        print(f"  Analyzing Page {page_num} with GPT-3.5...")
-        
-        # Use OpenAI API
-        if not openai.api_key:
-            print("  [ERROR] OpenAI API key not configured")
-            return None
-        client = openai.OpenAI(api_key=openai.api_key)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a text quality analyzer specializing in insurance documents. Your primary focus is DATA COMPLETENESS AND CORRECTNESS - actual data values that are accurate are more important than clean formatting. Watch for OCR character recognition errors. Return ONLY valid JSON responses."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.1
-        )
-        
-        result_text = response.choices[0].message.content.strip()
-        
-        # Clean up markdown code blocks if present
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.startswith('```'):
-            result_text = result_text[3:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-        
-        # Parse JSON response
-        try:
-            result_json = json.loads(result_text)
-            return result_json
-        except json.JSONDecodeError as e:
-            print(f"  [ERROR] Failed to parse JSON response: {e}")
-            print(f"  Raw response: {result_text[:100]}...")
-            return None
-            
-    except Exception as e:
-        print(f"  [ERROR] LLM processing failed: {e}")
-        return None
-
-
 def process_all_pages_selection(pymupdf_pages: Dict[int, Dict], ocr_pages: Dict[int, Dict]) -> Dict[int, Dict]:
     """
     Process smart selection for all pages using simple rule-based selection.
@@ -264,7 +222,7 @@ def process_upload_smart_selection(upload_id: str, pymupdf_file: str, ocr_file:
     Process smart selection for a single file pair (PyMuPDF + OCR).
     Returns selection results.
     """
-    bucket = _get_bucket()
+    bucket = get_bucket(BUCKET_NAME)
     
     # Read both source files
     pymupdf_pages = read_pymupdf_clean_pages_from_gcs(bucket, pymupdf_file)
@@ -279,10 +237,96 @@ def process_upload_smart_selection(upload_id: str, pymupdf_file: str, ocr_file:
     
     return {
         "success": True,
-        "selection_results": selection_results
+        "selection_results": selection_results,
+        "pymupdf_pages": pymupdf_pages,
+        "ocr_pages": ocr_pages
     }
 
 
+def _select_file(
+    upload_id: str,
+    carrier_name: str,
+    file_type: str,
+    pymupdf_index: Dict[Tuple[str, str], List[storage.Blob]],
+    ocr_index: Dict[Tuple[str, str], List[storage.Blob]],
+    prefetched: Dict[Tuple[str, str], Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Run smart selection for one carrier file and save the results to GCS.
+    Returns the files_analysis entry, or None when Phase 1/2 results are missing.
+    Parsed pages are added to prefetched, keyed by (carrier_name, file_type), for Phase 2D.
+    """
+    bucket = get_bucket(BUCKET_NAME)
+    try:
+        # Find corresponding Phase 1 and Phase 2 results in GCS
+        # Phase 1 file: phase1/results/{carrier}_{type}_pymupdf_clean_pages_only_{timestamp}.txt
+        # Phase 2 file: phase2/results/{carrier}_{type}_ocr_all_pages_{timestamp}.txt
+        safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+        type_short = file_type.replace('PDF', '').lower()
+        
+        # Find latest Phase 1 and Phase 2 files
+        pymupdf_files = pymupdf_index.get((safe_carrier_name, type_short), [])
+        ocr_files = ocr_index.get((safe_carrier_name, type_short), [])
+        
+        # Workers Comp doesn't have Phase 1, only OCR
+        if file_type == 'workersCompPDF':
+            if not ocr_files:
+                print(f"Warning: Missing Phase 2 OCR results for {carrier_name} {file_type}")
+                return None
+            # For Workers Comp, skip smart selection and go directly to Phase 2D with OCR only
+            ocr_file = max(blob.name for blob in ocr_files)
+            # Save to GCS
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            save_selection_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, {'use_ocr_only': True})
+            return {
+                'type': file_type,
+                'selection_results': {'use_ocr_only': True},  # Signal to use OCR only
+                'ocr_source': f'gs://{BUCKET_NAME}/{ocr_file}'
+            }
+        
+        if not pymupdf_files or not ocr_files:
+            print(f"Warning: Missing Phase 1 or Phase 2 results for {carrier_name} {file_type}")
+            return None
+        
+        # Get latest files (most recently uploaded)
+        pymupdf_file = max(blob.name for blob in pymupdf_files)
+        ocr_file = max(blob.name for blob in ocr_files)
+        
+        # Process smart selection
+        selection_result = process_upload_smart_selection(upload_id, pymupdf_file, ocr_file)
+        if not selection_result.get('success'):
+            return None
+        
+        selection_results = selection_result['selection_results']
+        
+        if 'ocr_pages' in selection_result:
+            # Phase 2D runs in this process next; hand it the parsed pages so it
+            # doesn't download and parse the same files again
+            prefetched[(carrier_name, file_type)] = {
+                'pymupdfFile': pymupdf_file,
+                'ocrFile': ocr_file,
+                'selectionResults': selection_results,
+                'pymupdfPages': {page_num: page['text'] for page_num, page in selection_result['pymupdf_pages'].items()},
+                'ocrPages': {page_num: page['text'] for page_num, page in selection_result['ocr_pages'].items()},
+            }
+        
+        # Save to GCS
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        save_selection_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, selection_results)
+        return {
+            'type': file_type,
+            'selection_results': selection_results,
+            'pymupdf_source': f'gs://{BUCKET_NAME}/{pymupdf_file}',
+            'ocr_source': f'gs://{BUCKET_NAME}/{ocr_file}'
+        }
+        
+    except Exception as e:
+        return {
+            'type': file_type,
+            'error': str(e)
+        }
+
+
 def process_upload_smart_selection_analysis(upload_id: str) -> Dict[str, Any]:
     """
     Given an upload_id, read Phase 1 and Phase 2 results from GCS,
@@ -290,7 +334,7 @@ def process_upload_smart_selection_analysis(upload_id: str) -> Dict[str, Any]:
     Automatically called after Phase 2 OCR.
     No LLM calls - faster and cheaper.
     """
-    bucket = _get_bucket()
+    bucket = get_bucket(BUCKET_NAME)
     
     # Read metadata
     from phase1 import _read_metadata
@@ -303,85 +347,41 @@ def process_upload_smart_selection_analysis(upload_id: str) -> Dict[str, Any]:
     
     results: List[Dict[str, Any]] = []
     
-    for carrier in record.get('carriers', []):
-        carrier_name = carrier.get('carrierName')
-        files_analysis: List[Dict[str, Any]] = []
-        
-        for file_type in ['propertyPDF', 'liabilityPDF', 'liquorPDF', 'workersCompPDF']:
-            pdf_info = carrier.get(file_type)
-            if not pdf_info:
-                continue
-            
-            gs_path = pdf_info.get('path')
-            if not gs_path:
-                continue
+    # List Phase 1 and Phase 2 results once for all carriers instead of once per file
+    pymupdf_index = _index_result_blobs(bucket, 'phase1/results/', '_pymupdf_clean_pages_only_')
+    ocr_index = _index_result_blobs(bucket, 'phase2/results/', '_ocr_all_pages_')
+    
+    # Parsed inputs per (carrier_name, file_type), passed on to Phase 2D
+    prefetched: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    
+    # Each (carrier, file_type) is independent and GCS-bound, so run them concurrently
+    with ThreadPoolExecutor(max_workers=SELECTION_WORKERS) as executor:
+        carrier_futures = []
+        for carrier in record.get('carriers', []):
+            carrier_name = carrier.get('carrierName')
+            futures = []
             
-            try:
-                # Find corresponding Phase 1 and Phase 2 results in GCS
-                # Phase 1 file: phase1/results/{carrier}_{type}_pymupdf_clean_pages_only_{timestamp}.txt
-                # Phase 2 file: phase2/results/{carrier}_{type}_ocr_all_pages_{timestamp}.txt
-                
-                # Get latest files for this carrier+type combination
-                # Since we just saved them, we can construct the path
-                safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
-                type_short = file_type.replace('PDF', '').lower()
-                
-                # Find latest Phase 1 and Phase 2 files
-                pymupdf_files = list(bucket.list_blobs(prefix=f'phase1/results/{safe_carrier_name}_{type_short}_pymupdf_clean_pages_only_'))
-                ocr_files = list(bucket.list_blobs(prefix=f'phase2/results/{safe_carrier_name}_{type_short}_ocr_all_pages_'))
-                
-                # Workers Comp doesn't have Phase 1, only OCR
-                if file_type == 'workersCompPDF':
-                    if not ocr_files:
-                        print(f"Warning: Missing Phase 2 OCR results for {carrier_name} {file_type}")
-                        continue
-                    # For Workers Comp, skip smart selection and go directly to Phase 2D with OCR only
-                    ocr_file = sorted(ocr_files, key=lambda x: x.time_created)[-1].name
-                    files_analysis.append({
-                        'type': file_type,
-                        'selection_results': {'use_ocr_only': True},  # Signal to use OCR only
-                        'ocr_source': f'gs://{BUCKET_NAME}/{ocr_file}'
-                    })
-                    # Save to GCS
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    save_selection_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, {'use_ocr_only': True})
+            for file_type in ['propertyPDF', 'liabilityPDF', 'liquorPDF', 'workersCompPDF']:
+                pdf_info = carrier.get(file_type)
+                if not pdf_info:
                     continue
                 
-                if not pymupdf_files or not ocr_files:
-                    print(f"Warning: Missing Phase 1 or Phase 2 results for {carrier_name} {file_type}")
+                gs_path = pdf_info.get('path')
+                if not gs_path:
                     continue
                 
-                # Get latest files (most recently uploaded)
-                pymupdf_file = sorted(pymupdf_files, key=lambda x: x.time_created)[-1].name
-                ocr_file = sorted(ocr_files, key=lambda x: x.time_created)[-1].name
-                
-                # Process smart selection
-                selection_result = process_upload_smart_selection(upload_id, pymupdf_file, ocr_file)
-                
-                if selection_result.get('success'):
-                    selection_results = selection_result['selection_results']
-                    
-                    files_analysis.append({
-                        'type': file_type,
-                        'selection_results': selection_results,
-                        'pymupdf_source': f'gs://{BUCKET_NAME}/{pymupdf_file}',
-                        'ocr_source': f'gs://{BUCKET_NAME}/{ocr_file}'
-                    })
-                    
-                    # Save to GCS
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    save_selection_results_to_gcs(bucket, carrier_name, safe_carrier_name, file_type, timestamp, selection_results)
-                
-            except Exception as e:
-                files_analysis.append({
-                    'type': file_type,
-                    'error': str(e)
-                })
+                futures.append(executor.submit(
+                    _select_file, upload_id, carrier_name, file_type, pymupdf_index, ocr_index, prefetched
+                ))
+            carrier_futures.append((carrier_name, futures))
         
-        results.append({
-            'carrierName': carrier_name,
-            'files': files_analysis,
-        })
+        # Collect in submission order so the response lists files as before
+        for carrier_name, futures in carrier_futures:
+            files_analysis = [future.result() for future in futures]
+            results.append({
+                'carrierName': carrier_name,
+                'files': [analysis for analysis in files_analysis if analysis is not None],
+            })
     
     # Prepare result
     result = {
@@ -394,7 +394,7 @@ def process_upload_smart_selection_analysis(upload_id: str) -> Dict[str, Any]:
     try:
         print("\n✅ Phase 2C Smart Selection complete. Starting Phase 2D Intelligent Combination...")
         from phase2d_intelligent_combination import process_upload_intelligent_combination
-        combination_result = process_upload_intelligent_combination(upload_id)
+        combination_result = process_upload_intelligent_combination(upload_id, prefetched=prefetched)
         if combination_result.get('success'):
             print("✅ Phase 2D Intelligent Combination complete!")
         else:
@@ -4,36 +4,128 @@ Combines the best text from each page based on smart selection results
 from Phase 2C, creating the final combined file for LLM extraction.
 Works with Google Cloud Storage.
 """
+import gzip
+import io
 import json
 import os
 import re
+import tempfile
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from dotenv import load_dotenv
+from gcs_client import get_bucket
 
 load_dotenv()
 
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 
+# Page sections in the Phase 1 clean-pages and Phase 2 OCR reports
+_PAGE_HEADER = re.compile(r'^PAGE (\d+):', re.MULTILINE)
+_PAGE_SEPARATOR = '\n' + '=' * 80
+_PYMUPDF_TEXT_MARKERS = ('TEXT CONTENT:\n',)
+_OCR_TEXT_MARKERS = ('OCR EXTRACTED TEXT:', '-' * 40 + '\n')
+# Upload timestamp embedded in the original PDF name
+_PDF_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})\.pdf$')
+_NON_EMPTY_LINE_RE = re.compile(r'^[^\n]*\S', re.MULTILINE)
 
-def _get_bucket() -> storage.bucket.Bucket:
-    client = storage.Client()
-    return client.bucket(BUCKET_NAME)
+# Text results at least this large are downloaded as parallel ranged chunks
+PARALLEL_DOWNLOAD_THRESHOLD = 8 * 1024 * 1024
+PARALLEL_DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
 
+# Write the human-readable combined text report instead of NDJSON
+VERBOSE_COMBINED_REPORT = os.getenv('PHASE2D_VERBOSE_REPORT', 'false').lower() == 'true'
 
-def _download_text_from_gcs(bucket: storage.bucket.Bucket, blob_path: str) -> str:
-    """Download text file from GCS"""
+# Threads for downloading Phase 1/2/2C results and uploading combined files for an upload
+DOWNLOAD_WORKERS = int(os.getenv('PHASE2D_DOWNLOAD_WORKERS', '16'))
+
+
+def _download_text_from_gcs(bucket: storage.bucket.Bucket, blob_path: str, size: Optional[int] = None) -> str:
+    """
+    Download text file from GCS in a single request; returns "" if it doesn't exist.
+    size (known from a listing) lets large files use a sliced parallel download.
+    """
     blob = bucket.blob(blob_path)
-    if not blob.exists():
+    try:
+        download_chunks = getattr(transfer_manager, 'download_chunks_concurrently', None)
+        if download_chunks and (size or 0) >= PARALLEL_DOWNLOAD_THRESHOLD:
+            with tempfile.NamedTemporaryFile(suffix='.txt', prefix='phase2d_', delete=False) as f:
+                text_path = f.name
+            try:
+                # Several ranged GETs instead of one TCP stream
+                download_chunks(
+                    blob, text_path,
+                    chunk_size=PARALLEL_DOWNLOAD_CHUNK_SIZE,
+                    worker_type=transfer_manager.THREAD,
+                    max_workers=8
+                )
+                with open(text_path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            finally:
+                os.remove(text_path)
+        
+        # crc32c validation runs in the C extension; md5 is computed in Python
+        return blob.download_as_bytes(checksum='crc32c').decode('utf-8')
+    except NotFound:
         return ""
-    return blob.download_as_string().decode('utf-8')
 
 
-def _upload_text_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, content: str) -> None:
-    """Upload text file to GCS"""
+def _index_result_blobs(bucket: storage.bucket.Bucket, folder: str, marker: str) -> Dict[Tuple[str, str], List[storage.Blob]]:
+    """
+    List a results folder once and group its blobs by (safe_carrier_name, type_short).
+    Result files are named {safe_carrier_name}_{type_short}{marker}{timestamp}.ext, so within
+    one key the largest name is the newest file (no time_created lookups needed).
+    """
+    index: Dict[Tuple[str, str], List[storage.Blob]] = defaultdict(list)
+    # Only names and sizes are needed, so skip the rest of each object's metadata
+    for blob in bucket.list_blobs(prefix=folder, fields='items(name,size),nextPageToken'):
+        name_key, found, _ = blob.name[len(folder):].partition(marker)
+        if not found:
+            continue
+        safe_carrier_name, _, type_short = name_key.rpartition('_')
+        index[(safe_carrier_name, type_short)].append(blob)
+    return index
+
+
+def _iter_page_sections(content: str, *text_markers: str):
+    """
+    Yield (page_num, page_text) for each PAGE section of a Phase 1/2 text report.
+    A section ends at an '=' * 80 line; its text starts after the last of text_markers.
+    """
+    for section in content.split(_PAGE_SEPARATOR):
+        header = _PAGE_HEADER.search(section)
+        if not header:
+            continue
+        pos = header.end()
+        for marker in text_markers:
+            pos = section.find(marker, pos)
+            if pos == -1:
+                break
+            pos += len(marker)
+        else:
+            yield int(header.group(1)), section[pos:]
+
+
+def _count_non_empty_lines(text: str) -> int:
+    """Count lines with visible text without splitting the page into a list"""
+    return sum(1 for _ in _NON_EMPTY_LINE_RE.finditer(text))
+
+
+def _upload_text_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, content: str, content_type: str = 'text/plain') -> None:
+    """
+    Upload text file to GCS gzip-compressed. The report text compresses several-fold and
+    download_as_bytes/download_as_string hand readers the decompressed content.
+    """
     blob = bucket.blob(blob_path)
-    blob.upload_from_string(content, content_type='text/plain')
+    blob.content_encoding = 'gzip'
+    blob.upload_from_string(
+        gzip.compress(content.encode('utf-8'), compresslevel=6),
+        content_type=f'{content_type}; charset=utf-8'
+    )
     print(f"✅ Uploaded to: gs://{BUCKET_NAME}/{blob_path}")
 
 
@@ -44,15 +136,18 @@ def _blob_path_from_gs_uri(gs_uri: str) -> str:
     return gs_uri
 
 
-def read_smart_selection_results_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -> Dict[str, Any]:
-    """Read smart selection results from GCS JSON file"""
+def read_smart_selection_results_from_gcs(bucket: storage.bucket.Bucket, file_path: str, size: Optional[int] = None) -> Dict[Any, Any]:
+    """Read smart selection results from GCS JSON file, keyed by int page number"""
     try:
-        content = _download_text_from_gcs(bucket, file_path)
+        content = _download_text_from_gcs(bucket, file_path, size)
         if not content:
             print(f"Warning: Smart selection results not found at {file_path}")
             return {}
         
         selection_results = json.loads(content)
+        if not selection_results.get('use_ocr_only'):
+            # JSON object keys are strings; normalize page numbers once here
+            selection_results = {int(page_num): selection for page_num, selection in selection_results.items()}
         print(f"Found selection results for {len(selection_results)} pages from {file_path}")
         return selection_results
     except Exception as e:
@@ -60,20 +155,20 @@ def read_smart_selection_results_from_gcs(bucket: storage.bucket.Bucket, file_pa
         return {}
 
 
-def read_pymupdf_clean_pages_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -> Dict[int, str]:
+def read_pymupdf_clean_pages_from_gcs(bucket: storage.bucket.Bucket, file_path: str, size: Optional[int] = None) -> Dict[int, str]:
     """Read PyMuPDF clean pages from GCS"""
     try:
-        content = _download_text_from_gcs(bucket, file_path)
+        content = _download_text_from_gcs(bucket, file_path, size)
         if not content:
             print(f"Warning: PyMuPDF clean pages not found at {file_path}")
             return {}
         
         clean_pages = {}
         # Extract clean pages
-        page_sections = re.findall(r'PAGE (\d+):.*?TEXT CONTENT:\n(.*?)\n={80}', content, re.DOTALL)
+        page_sections = _iter_page_sections(content, *_PYMUPDF_TEXT_MARKERS)
         
         for page_num, page_text in page_sections:
-            clean_pages[int(page_num)] = page_text.strip()
+            clean_pages[page_num] = page_text.strip()
         
         print(f"Found {len(clean_pages)} PyMuPDF clean pages from {file_path}: {list(clean_pages.keys())}")
         return clean_pages
@@ -82,20 +177,20 @@ def read_pymupdf_clean_pages_from_gcs(bucket: storage.bucket.Bucket, file_path:
         return {}
 
 
-def read_ocr_all_pages_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -> Dict[int, str]:
+def read_ocr_all_pages_from_gcs(bucket: storage.bucket.Bucket, file_path: str, size: Optional[int] = None) -> Dict[int, str]:
     """Read OCR all pages from GCS"""
     try:
-        content = _download_text_from_gcs(bucket, file_path)
+        content = _download_text_from_gcs(bucket, file_path, size)
         if not content:
             print(f"Warning: OCR results not found at {file_path}")
             return {}
         
         ocr_pages = {}
         # Extract OCR pages
-        page_sections = re.findall(r'PAGE (\d+):.*?OCR EXTRACTED TEXT:.*?----------------------------------------\n(.*?)\n={80}', content, re.DOTALL)
+        page_sections = _iter_page_sections(content, *_OCR_TEXT_MARKERS)
         
         for page_num, page_text in page_sections:
-            ocr_pages[int(page_num)] = page_text.strip()
+            ocr_pages[page_num] = page_text.strip()
         
         print(f"Found {len(ocr_pages)} OCR pages from {file_path}: {list(ocr_pages.keys())}")
         return ocr_pages
@@ -104,108 +199,139 @@ def read_ocr_all_pages_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -
         return {}
 
 
+def iter_combined_pages(
+    selection_results: Dict[Any, Any],
+    pymupdf_pages: Dict[int, str],
+    ocr_pages: Dict[int, str]
+):
+    """Yield {"page", "source", "text"} for each page's selected text, in page order"""
+    if selection_results.get('use_ocr_only'):
+        for page_num in sorted(ocr_pages):
+            yield {'page': page_num, 'source': 'OCR', 'text': ocr_pages[page_num]}
+        return
+    
+    for page_num in sorted(selection_results):
+        if selection_results[page_num]['selected_source'] == 'PyMuPDF':
+            yield {'page': page_num, 'source': 'PyMuPDF', 'text': pymupdf_pages.get(page_num, '')}
+        else:  # OCR
+            yield {'page': page_num, 'source': 'OCR', 'text': ocr_pages.get(page_num, '')}
+
+
 def create_intelligent_combined_file(
     bucket: storage.bucket.Bucket,
-    selection_results: Dict[str, Any],
+    selection_results: Dict[Any, Any],
     pymupdf_pages: Dict[int, str],
     ocr_pages: Dict[int, str],
     carrier_name: str,
     safe_carrier_name: str,
     file_type: str,
-    timestamp: str
+    timestamp: str,
+    verbose: bool = False
 ) -> str:
-    """Create final combined file with best text from each page"""
+    """
+    Create final combined file with best text from each page.
+    Writes NDJSON for Phase 3, one {"page", "source", "text"} record per line;
+    verbose=True writes the human-readable text report instead.
+    """
     type_short = file_type.replace('PDF', '').lower()
-    combined_file_path = f'phase2d/results/{safe_carrier_name}_{type_short}_intelligent_combined_{timestamp}.txt'
     
     print("PHASE 2D: INTELLIGENT COMBINING")
     print("=" * 80)
     
-    report_lines = []
-    report_lines.append("INTELLIGENT COMBINED PDF EXTRACTION RESULTS - ALL PAGES")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append(f"Carrier: {carrier_name}")
-    report_lines.append(f"File Type: {file_type.upper()}")
+    if not verbose:
+        combined_file_path = f'phase2d/results/{safe_carrier_name}_{type_short}_intelligent_combined_{timestamp}.ndjson'
+        buf = io.StringIO()
+        page_count = 0
+        for record in iter_combined_pages(selection_results, pymupdf_pages, ocr_pages):
+            # json.dumps escapes newlines inside the text, so each record stays on one line
+            buf.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            page_count += 1
+        _upload_text_to_gcs(bucket, combined_file_path, buf.getvalue(), content_type='application/x-ndjson')
+        print(f"✅ Saved combined pages ({page_count} pages) to: gs://{BUCKET_NAME}/{combined_file_path}")
+        return combined_file_path
+    
+    combined_file_path = f'phase2d/results/{safe_carrier_name}_{type_short}_intelligent_combined_{timestamp}.txt'
+    
+    buf = io.StringIO()
+    w = buf.write
+    w("INTELLIGENT COMBINED PDF EXTRACTION RESULTS - ALL PAGES\n")
+    w("=" * 80 + "\n")
+    w(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    w(f"Carrier: {carrier_name}\n")
+    w(f"File Type: {file_type.upper()}\n")
     
     # Handle OCR-only case (Workers Comp)
     if selection_results.get('use_ocr_only'):
-        report_lines.append(f"Method: OCR Only (No PyMuPDF)")
-        report_lines.append(f"Total Pages: {len(ocr_pages)}")
-        report_lines.append("=" * 80)
-        report_lines.append("")
+        w("Method: OCR Only (No PyMuPDF)\n")
+        w(f"Total Pages: {len(ocr_pages)}\n")
+        w("=" * 80 + "\n\n")
         
         # Process each OCR page
         for page_num in sorted(ocr_pages.keys()):
             page_text = ocr_pages[page_num]
-            report_lines.append(f"PAGE {page_num} (OCR Only):")
-            report_lines.append("-" * 50)
-            report_lines.append(f"Characters: {len(page_text):,}")
-            num_lines = len([line for line in page_text.split(chr(10)) if line.strip()])
-            report_lines.append(f"Lines: {num_lines}")
-            report_lines.append("")
-            report_lines.append("TEXT CONTENT:")
-            report_lines.append("-" * 30)
-            report_lines.append(page_text)
-            report_lines.append("=" * 80)
-            report_lines.append("")
+            w(
+                f"PAGE {page_num} (OCR Only):\n"
+                f"{'-' * 50}\n"
+                f"Characters: {len(page_text):,}\n"
+                f"Lines: {_count_non_empty_lines(page_text)}\n"
+                f"\n"
+                f"TEXT CONTENT:\n"
+                f"{'-' * 30}\n"
+                f"{page_text}\n"
+                f"{'=' * 80}\n\n"
+            )
         
-        report_content = "\n".join(report_lines)
+        report_content = buf.getvalue()[:-1]  # no blank line after the last page
         _upload_text_to_gcs(bucket, combined_file_path, report_content)
         print(f"✅ Saved OCR-only combined file to: gs://{BUCKET_NAME}/{combined_file_path}")
         return combined_file_path
     
     # Normal case: PyMuPDF + OCR smart selection
-    report_lines.append(f"Method: Smart LLM Selection + Intelligent Combining")
-    report_lines.append(f"Total Pages: {len(selection_results)}")
-    report_lines.append("=" * 80)
-    report_lines.append("")
+    w("Method: Smart LLM Selection + Intelligent Combining\n")
+    w(f"Total Pages: {len(selection_results)}\n")
+    w("=" * 80 + "\n\n")
     
-    # Count selections by source
-    pymupdf_count = len([s for s in selection_results.values() if s['selected_source'] == 'PyMuPDF'])
-    ocr_count = len([s for s in selection_results.values() if s['selected_source'] == 'OCR'])
-    
-    report_lines.append("INTELLIGENT SELECTION SUMMARY:")
-    report_lines.append("-" * 40)
-    report_lines.append(f"PyMuPDF Selected: {pymupdf_count} pages")
-    report_lines.append(f"OCR Selected: {ocr_count} pages")
-    report_lines.append(f"Total Pages: {len(selection_results)} pages")
-    report_lines.append("=" * 80)
-    report_lines.append("")
-    
-    # Process each page in order
-    for page_num_str in sorted(selection_results.keys(), key=int):
-        page_num = int(page_num_str)
-        selection = selection_results[page_num_str]
+    # One pass over the pages: write each page block and count selections by source.
+    # The summary goes above the pages, so pages are buffered separately.
+    body = io.StringIO()
+    source_counts: Counter = Counter()
+    for page_num in sorted(selection_results):
+        selection = selection_results[page_num]
         selected_source = selection['selected_source']
-        reason = selection['reason']
-        confidence = selection['confidence']
+        source_counts[selected_source] += 1
         
         # Get the selected text
         if selected_source == 'PyMuPDF':
             page_text = pymupdf_pages.get(page_num, '')
-            source_info = f"PyMuPDF (Clean)"
+            source_info = "PyMuPDF (Clean)"
         else:  # OCR
             page_text = ocr_pages.get(page_num, '')
-            source_info = f"OCR (All Pages)"
+            source_info = "OCR (All Pages)"
         
-        report_lines.append(f"PAGE {page_num} ({source_info}):")
-        report_lines.append("-" * 50)
-        report_lines.append(f"Selected Source: {selected_source}")
-        report_lines.append(f"Reason: {reason}")
-        report_lines.append(f"Confidence: {confidence}")
-        report_lines.append(f"Characters: {len(page_text):,}")
-        # Count lines (avoid backslash in f-string)
-        num_lines = len([line for line in page_text.split(chr(10)) if line.strip()])
-        report_lines.append(f"Lines: {num_lines}")
-        report_lines.append("")
-        report_lines.append("TEXT CONTENT:")
-        report_lines.append("-" * 30)
-        report_lines.append(page_text)
-        report_lines.append("=" * 80)
-        report_lines.append("")
+        body.write(
+            f"PAGE {page_num} ({source_info}):\n"
+            f"{'-' * 50}\n"
+            f"Selected Source: {selected_source}\n"
+            f"Reason: {selection['reason']}\n"
+            f"Confidence: {selection['confidence']}\n"
+            f"Characters: {len(page_text):,}\n"
+            f"Lines: {_count_non_empty_lines(page_text)}\n"
+            f"\n"
+            f"TEXT CONTENT:\n"
+            f"{'-' * 30}\n"
+            f"{page_text}\n"
+            f"{'=' * 80}\n\n"
+        )
+    
+    w("INTELLIGENT SELECTION SUMMARY:\n")
+    w("-" * 40 + "\n")
+    w(f"PyMuPDF Selected: {source_counts['PyMuPDF']} pages\n")
+    w(f"OCR Selected: {source_counts['OCR']} pages\n")
+    w(f"Total Pages: {len(selection_results)} pages\n")
+    w("=" * 80 + "\n\n")
+    w(body.getvalue())
     
-    report_content = "\n".join(report_lines)
+    report_content = buf.getvalue()[:-1]  # no blank line after the last page
     
     _upload_text_to_gcs(bucket, combined_file_path, report_content)
     print(f"✅ Saved intelligent combined file to: gs://{BUCKET_NAME}/{combined_file_path}")
@@ -213,13 +339,73 @@ def create_intelligent_combined_file(
     return combined_file_path
 
 
-def process_upload_intelligent_combination(upload_id: str) -> Dict[str, Any]:
+def _combine_job(bucket: storage.bucket.Bucket, job: Dict[str, Any], downloads: Dict[str, Any]) -> Dict[str, Any]:
+    """Create the combined file for one carrier file once its downloads complete"""
+    carrier_name = job['carrierName']
+    file_type = job['fileType']
+    try:
+        if 'prefetched' in job:
+            selection_results = job['prefetched']['selectionResults']
+            pymupdf_pages = job['prefetched']['pymupdfPages']
+            ocr_pages = job['prefetched']['ocrPages']
+        else:
+            ocr_pages = downloads[job['ocrFile']].result()
+            if file_type != 'workersCompPDF':
+                selection_results = downloads[job['selectionFile']].result()
+                pymupdf_pages = downloads[job['pymupdfFile']].result()
+        
+        if file_type == 'workersCompPDF':
+            # Create combined file with OCR only (no PyMuPDF)
+            combined_path = create_intelligent_combined_file(
+                bucket, {'use_ocr_only': True}, {}, ocr_pages,  # Empty PyMuPDF pages
+                carrier_name, job['safeCarrierName'], file_type, job['timestamp'],
+                verbose=VERBOSE_COMBINED_REPORT
+            )
+            
+            return {
+                'carrierName': carrier_name,
+                'fileType': file_type,
+                'combinedFile': f'gs://{BUCKET_NAME}/{combined_path}',
+                'totalPages': len(ocr_pages),
+                'pymupdfSelected': 0,
+                'ocrSelected': len(ocr_pages)
+            }
+        
+        # Create intelligent combined file
+        combined_path = create_intelligent_combined_file(
+            bucket, selection_results, pymupdf_pages, ocr_pages,
+            carrier_name, job['safeCarrierName'], file_type, job['timestamp'],
+            verbose=VERBOSE_COMBINED_REPORT
+        )
+        
+        source_counts = Counter(selection['selected_source'] for selection in selection_results.values())
+        return {
+            'carrierName': carrier_name,
+            'fileType': file_type,
+            'combinedFile': f'gs://{BUCKET_NAME}/{combined_path}',
+            'totalPages': len(selection_results),
+            'pymupdfSelected': source_counts['PyMuPDF'],
+            'ocrSelected': source_counts['OCR']
+        }
+        
+    except Exception as e:
+        print(f"Error processing {carrier_name} {file_type}: {e}")
+        return {
+            'carrierName': carrier_name,
+            'fileType': file_type,
+            'error': str(e)
+        }
+
+
+def process_upload_intelligent_combination(upload_id: str, prefetched: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Given an upload_id, read Phase 2C results from GCS,
     read corresponding PyMuPDF and OCR files,
     and create intelligent combined files.
+    prefetched: parsed pages and selection results from an in-process Phase 2C run,
+    keyed by (carrier_name, file_type); used instead of downloading the same files.
     """
-    bucket = _get_bucket()
+    bucket = get_bucket(BUCKET_NAME)
     
     # Read metadata
     from phase1 import _read_metadata
@@ -232,6 +418,13 @@ def process_upload_intelligent_combination(upload_id: str) -> Dict[str, Any]:
     
     all_results: List[Dict[str, Any]] = []
     
+    # List each results folder once for all carriers instead of once per file
+    selection_index = _index_result_blobs(bucket, 'phase2c/results/', '_smart_selection_')
+    pymupdf_index = _index_result_blobs(bucket, 'phase1/results/', '_pymupdf_clean_pages_only_')
+    ocr_index = _index_result_blobs(bucket, 'phase2/results/', '_ocr_all_pages_')
+    
+    # Resolve the files each (carrier, file_type) needs from the listings; no downloads yet
+    jobs: List[Dict[str, Any]] = []
     for carrier in record.get('carriers', []):
         carrier_name = carrier.get('carrierName')
         safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
@@ -248,7 +441,7 @@ def process_upload_intelligent_combination(upload_id: str) -> Dict[str, Any]:
             try:
                 # Extract timestamp from PDF path
                 original_pdf_path = pdf_info.get('path')
-                timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', original_pdf_path)
+                timestamp_match = _PDF_TIMESTAMP_RE.search(original_pdf_path)
                 if not timestamp_match:
                     report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 else:
@@ -257,74 +450,44 @@ def process_upload_intelligent_combination(upload_id: str) -> Dict[str, Any]:
                 type_short = file_type.replace('PDF', '').lower()
                 
                 # Find latest smart selection JSON file
-                selection_files = list(bucket.list_blobs(prefix=f'phase2c/results/{safe_carrier_name}_{type_short}_smart_selection_'))
+                selection_files = selection_index.get((safe_carrier_name, type_short), [])
                 if not selection_files:
                     print(f"Warning: No smart selection results found for {carrier_name} {file_type}")
                     continue
                 
-                # Get latest file
-                selection_file = sorted(selection_files, key=lambda x: x.time_created)[-1].name
-                
-                # Read smart selection results
-                selection_results = read_smart_selection_results_from_gcs(bucket, selection_file)
+                ocr_files = ocr_index.get((safe_carrier_name, type_short), [])
                 
                 # Workers Comp doesn't have Phase 1, only OCR
                 if file_type == 'workersCompPDF':
-                    # For Workers Comp, use OCR only
-                    ocr_files = list(bucket.list_blobs(prefix=f'phase2/results/{safe_carrier_name}_{type_short}_ocr_all_pages_'))
                     if not ocr_files:
                         print(f"Warning: Missing Phase 2 OCR results for {carrier_name} {file_type}")
                         continue
-                    
-                    ocr_file = sorted(ocr_files, key=lambda x: x.time_created)[-1].name
-                    ocr_pages = read_ocr_all_pages_from_gcs(bucket, ocr_file)
-                    
-                    # Create combined file with OCR only (no PyMuPDF)
-                    combined_path = create_intelligent_combined_file(
-                        bucket, {'use_ocr_only': True}, {}, ocr_pages,  # Empty PyMuPDF pages
-                        carrier_name, safe_carrier_name, file_type, report_timestamp
-                    )
-                    
-                    all_results.append({
-                        'carrierName': carrier_name,
-                        'fileType': file_type,
-                        'combinedFile': f'gs://{BUCKET_NAME}/{combined_path}',
-                        'totalPages': len(ocr_pages),
-                        'pymupdfSelected': 0,
-                        'ocrSelected': len(ocr_pages)
-                    })
-                    continue
-                
-                # Find corresponding Phase 1 and Phase 2 files
-                pymupdf_files = list(bucket.list_blobs(prefix=f'phase1/results/{safe_carrier_name}_{type_short}_pymupdf_clean_pages_only_'))
-                ocr_files = list(bucket.list_blobs(prefix=f'phase2/results/{safe_carrier_name}_{type_short}_ocr_all_pages_'))
-                
-                if not pymupdf_files or not ocr_files:
-                    print(f"Warning: Missing Phase 1 or Phase 2 results for {carrier_name} {file_type}")
-                    continue
-                
-                # Get latest files
-                pymupdf_file = sorted(pymupdf_files, key=lambda x: x.time_created)[-1].name
-                ocr_file = sorted(ocr_files, key=lambda x: x.time_created)[-1].name
-                
-                # Read both text sources
-                pymupdf_pages = read_pymupdf_clean_pages_from_gcs(bucket, pymupdf_file)
-                ocr_pages = read_ocr_all_pages_from_gcs(bucket, ocr_file)
-                
-                # Create intelligent combined file
-                combined_path = create_intelligent_combined_file(
-                    bucket, selection_results, pymupdf_pages, ocr_pages,
-                    carrier_name, safe_carrier_name, file_type, report_timestamp
-                )
+                    pymupdf_file = None
+                    selection_file = None  # Workers Comp always combines OCR only
+                else:
+                    pymupdf_files = pymupdf_index.get((safe_carrier_name, type_short), [])
+                    if not pymupdf_files or not ocr_files:
+                        print(f"Warning: Missing Phase 1 or Phase 2 results for {carrier_name} {file_type}")
+                        continue
+                    pymupdf_file = max(blob.name for blob in pymupdf_files)
+                    selection_file = max(blob.name for blob in selection_files)
                 
-                all_results.append({
+                job = {
                     'carrierName': carrier_name,
+                    'safeCarrierName': safe_carrier_name,
                     'fileType': file_type,
-                    'combinedFile': f'gs://{BUCKET_NAME}/{combined_path}',
-                    'totalPages': len(selection_results),
-                    'pymupdfSelected': len([s for s in selection_results.values() if s['selected_source'] == 'PyMuPDF']),
-                    'ocrSelected': len([s for s in selection_results.values() if s['selected_source'] == 'OCR'])
-                })
+                    'timestamp': report_timestamp,
+                    'selectionFile': selection_file,
+                    'pymupdfFile': pymupdf_file,
+                    'ocrFile': max(blob.name for blob in ocr_files),
+                }
+                
+                # Reuse Phase 2C's parsed pages when they came from these same files
+                prefetched_job = (prefetched or {}).get((carrier_name, file_type))
+                if prefetched_job and (prefetched_job['pymupdfFile'], prefetched_job['ocrFile']) == (pymupdf_file, job['ocrFile']):
+                    job['prefetched'] = prefetched_job
+                
+                jobs.append(job)
                 
             except Exception as e:
                 print(f"Error processing {carrier_name} {file_type}: {e}")
@@ -334,6 +497,33 @@ def process_upload_intelligent_combination(upload_id: str) -> Dict[str, Any]:
                     'error': str(e)
                 })
     
+    # Sizes from the listings pick the download strategy without a metadata request per file
+    blob_sizes = {
+        blob.name: blob.size
+        for index in (selection_index, pymupdf_index, ocr_index)
+        for blobs in index.values()
+        for blob in blobs
+    }
+    
+    # Download and parse every needed file concurrently, across all carriers
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        downloads = {}
+        for job in jobs:
+            if 'prefetched' in job:
+                continue
+            for reader, file_path in (
+                (read_smart_selection_results_from_gcs, job['selectionFile']),
+                (read_pymupdf_clean_pages_from_gcs, job['pymupdfFile']),
+                (read_ocr_all_pages_from_gcs, job['ocrFile']),
+            ):
+                if file_path and file_path not in downloads:
+                    downloads[file_path] = executor.submit(reader, bucket, file_path, blob_sizes.get(file_path))
+        
+        # Combine and upload each file as soon as its inputs arrive. Downloads were queued
+        # first, so these tasks only ever wait on downloads that are already running.
+        combine_futures = [executor.submit(_combine_job, bucket, job, downloads) for job in jobs]
+        all_results.extend(future.result() for future in combine_futures)
+    
     result = {
         "success": True,
         "uploadId": upload_id,
@@ -2,23 +2,107 @@
 Phase 3 GL: LLM Information Extraction for General Liability
 Extracts 22 specific general liability coverage fields from insurance documents using GPT.
 Works with Google Cloud Storage.
-Uses Joblib for parallel chunk processing.
+Uses asyncio with AsyncOpenAI for concurrent chunk processing.
 """
+import asyncio
+import copy
+import functools
+import hashlib
 import json
 import openai
 import os
 import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 from dotenv import load_dotenv
-from joblib import Parallel, delayed
+from gcs_client import get_bucket
+from llm_cache import llm_cache_get, llm_cache_key, llm_cache_put
 from schemas.gl_schema import GL_FIELDS_SCHEMA, get_gl_field_names, get_gl_required_fields
 
+# orjson is optional - faster JSON encode/decode, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pyahocorasick is optional - linear-time keyword scan, regex alternation otherwise
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 load_dotenv()
 
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 
+GL_MODEL = 'gpt-5'
+# Bump when the prompt or response handling changes so older cached responses are not reused
+LLM_CACHE_VERSION = 'gl-v1'
+# Max OpenAI requests in flight per carrier (keeps bursts under the TPM limit)
+LLM_CONCURRENCY = int(os.getenv('PHASE3_GL_LLM_CONCURRENCY', '32'))
+UPLOAD_RETRIES = 3
+
+# Legacy text-format Phase 2D combined files: sections end at an 80 '=' rule, and each page
+# section starts with a "PAGE N (PyMuPDF (Clean)):" / "PAGE N (OCR (All Pages)):" header
+_PAGE_SEPARATOR = '\n' + '=' * 80
+_PAGE_HEADER_RE = re.compile(r'\s*PAGE (\d+) \((PyMuPDF|OCR) \([^\n]*?\)\):')
+_TEXT_MARKER = 'TEXT CONTENT:'
+_TEXT_RULE = '-' * 30 + '\n'
+# Upload timestamp embedded in the original PDF name
+_PDF_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})\.pdf$')
+
+# Sheets service-account file, resolved once relative to the working directory at import
+_CREDS_PATH: Optional[Path] = next(
+    (
+        Path(path).resolve()
+        for path in (
+            'credentials/insurance-sheets-474717-7fc3fd9736bc.json',
+            '../credentials/insurance-sheets-474717-7fc3fd9736bc.json',
+        )
+        if Path(path).exists()
+    ),
+    None
+)
+
+# GL field -> cell in the "Insurance Fields Data" sheet
+_GL_FIELD_MAPPING = {
+    "Each Occurrence/General Aggregate Limits": "B8",
+    "Liability Deductible - Per claim or Per Occ basis": "B9",
+    "Hired Auto And Non-Owned Auto Liability - Without Delivery Service": "B10",
+    "Fuel Contamination coverage limits": "B11",
+    "Vandalism coverage": "B12",
+    "Garage Keepers Liability": "B13",
+    "Employment Practices Liability": "B14",
+    "Abuse & Molestation Coverage limits": "B15",
+    "Assault & Battery Coverage limits": "B16",
+    "Firearms/Active Assailant Coverage limits": "B17",
+    "Additional Insured": "B18",
+    "Additional Insured (Mortgagee)": "B19",
+    "Additional insured - Jobber": "B20",
+    "Exposure": "B21",
+    "Rating basis: If Sales - Subject to Audit": "B22",
+    "Terrorism": "B23",
+    "Personal and Advertising Injury Limit": "B24",
+    "Products/Completed Operations Aggregate Limit": "B25",
+    "Minimum Earned": "B26",
+    "General Liability Premium": "B27",
+    "Total Premium (With/Without Terrorism)": "B28",
+    "Policy Premium": "B29",
+    "Contaminated fuel": "B30",
+    "Liquor Liability": "B31",
+    "Additional Insured - Managers Or Lessors Of Premises": "B32",
+}
+
+# Result uploads run here so the next carrier can start extracting while the previous one uploads.
+_upload_pool = ThreadPoolExecutor(max_workers=4)
+
 # Initialize OpenAI
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
@@ -27,37 +111,160 @@ if not openai.api_key:
     print("Phase 3 GL LLM extraction will fail without OpenAI API key")
 
 
-def _get_bucket() -> storage.bucket.Bucket:
-    client = storage.Client()
-    return client.bucket(BUCKET_NAME)
+# GL fields as the LLM must name them (these match the sheet mapping), with a short hint and
+# the value/page used in the example response. The prompt below is built from this once at import.
+_GL_PROMPT_FIELDS = [
+    ("Each Occurrence/General Aggregate Limits", 'occurrence / aggregate limits, e.g. "$1M / $2M"', "$1,000,000 / $2,000,000", 5),
+    ("Liability Deductible - Per claim or Per Occ basis", 'amount and basis ("Per claim", "Per Occurrence")', "$0", 5),
+    ("Hired Auto And Non-Owned Auto Liability - Without Delivery Service", 'Included / Excluded or limits', "Included", 5),
+    ("Fuel Contamination coverage limits", 'each-customer and aggregate limits', "Each Customer's Auto Limit $1,000, Aggregate Limit $5,000", 3),
+    ("Vandalism coverage", 'any vandalism coverage details', None, None),
+    ("Garage Keepers Liability", 'limit plus comprehensive / collision deductibles', "Limit: $60,000, Comprehensive Deductible: $500, Collision Deductible: $500", 3),
+    ("Employment Practices Liability", 'each-claim and aggregate limits', "Each Claim Limit $25,000, Aggregate Limit $25,000", 3),
+    ("Abuse & Molestation Coverage limits", 'Included / Excluded, e.g. "Exclusion - Abuse or Molestation"', None, None),
+    ("Assault & Battery Coverage limits", 'limits or status, e.g. "Not Excluded", "Limited Coverage - Assault or Battery"', "$100,000 / $200,000", 5),
+    ("Firearms/Active Assailant Coverage limits", '"Not Excluded" / "Excluded"', "Not Excluded", 5),
+    ("Additional Insured", 'company names with full addresses', "786 ALLGOOD ROAD LLC C/O GIL MOOR 786 ALLGOOD RD MARIETTA GA 30062", 3),
+    ("Additional Insured (Mortgagee)", 'bank / lender names with full addresses', "FIRST HORIZON BANK PO BOX 132 MEMPHIS TN 38101", 3),
+    ("Additional Insured - Jobber", 'jobber / distributor name', "Premier Petroleum", 3),
+    ("Exposure", 'inside sales and gasoline gallons', "Inside Sales: $400,000, Gasoline Gallons: 400,000", 3),
+    ("Rating basis: If Sales - Subject to Audit", 'sales, gallons, area (e.g. "Area: 1,600 Sqft")', "Sales $300,000, Gasoline 48,000 Gallons", 3),
+    ("Terrorism", 'coverage status, e.g. "Excluded - Can be Added With Additional Premium"', "Excluded, Can be added with additional premium", 3),
+    ("Personal and Advertising Injury Limit", 'limit or "Excluded"', "$1,000,000", 5),
+    ("Products/Completed Operations Aggregate Limit", 'limit or "Excluded"', "Excluded", 5),
+    ("Minimum Earned", 'minimum earned premium %, e.g. "MEP: 25%"', "25%", 3),
+    ("General Liability Premium", 'GL premium; look first for "TOTAL excl Terrorism" or "TOTAL CHARGES W/O TRIA"', "$1,200.00", 3),
+    ("Total Premium (With/Without Terrorism)", 'both totals when shown (W/O TRIA and WITH TRIA, excl/incl Terrorism)', "Without Terrorism: $1,200.00, With Terrorism: $1,300.00", 3),
+    ("Policy Premium", 'policy / base premium amount', "$2,500.00", 3),
+]
+
+_GL_FIELD_TABLE = "\n".join(
+    f"{i}. {name} - {hint}" for i, (name, hint, _, _) in enumerate(_GL_PROMPT_FIELDS, 1)
+)
+_GL_EXAMPLE_JSON = "{\n" + ",\n".join(
+    f'    {json.dumps(name)}: {json.dumps({"value": value, "page": page}, ensure_ascii=False)}'
+    for name, _, value, page in _GL_PROMPT_FIELDS
+) + "\n}"
+
+# Lower-case words that appear near at least one GL field. A chunk containing none of them
+# (cover pages, blank OCR, boilerplate forms) gets an all-null result without an LLM call.
+# Deliberately broad - a false hit only costs the call we would have made anyway.
+_GL_TRIGGER_KEYWORDS = (
+    'occurrence', 'aggregate', 'deductible', 'hired', 'non-owned', 'fuel', 'contamina',
+    'vandalism', 'garage', 'employment practices', 'abuse', 'molestation', 'assault', 'battery',
+    'firearm', 'assailant', 'additional insured', 'mortgagee', 'jobber', 'exposure', 'rating',
+    'sales', 'gallons', 'audit', 'terrorism', 'tria', 'advertising', 'personal injury',
+    'completed operations', 'minimum earned', 'mep', 'premium', 'liability', 'limit'
+)
+
+if AHOCORASICK_AVAILABLE:
+    _GL_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _GL_TRIGGER_KEYWORDS:
+        _GL_KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _GL_KEYWORD_AUTOMATON.make_automaton()
+else:
+    _GL_KEYWORD_RE = re.compile('|'.join(re.escape(keyword) for keyword in _GL_TRIGGER_KEYWORDS))
+
+# Static extraction instructions - kept byte-for-byte identical across chunks and carriers
+# so the prompt prefix is cached. Everything chunk-specific goes in _GL_TAIL_TEMPLATE.
+_GL_SYSTEM_PROMPT = f"""Extract ONLY these {len(_GL_PROMPT_FIELDS)} general liability fields from the insurance document text. Do NOT create other field names or extract any other information.
+
+FIELDS (name - what to look for):
+{_GL_FIELD_TABLE}
+
+RULES:
+- Extract values EXACTLY as written, including similar patterns not shown in the examples; never hallucinate, combine or modify values.
+- Use the actual dollar amounts, limits and details - never "See Carrier Quote" or "See Quote". For tables, take the value from the appropriate column; if a quote has 2-3 carrier columns, extract each column as a separate entry.
+- For multi-line values (additional insureds, rating basis) keep the complete text block with names, addresses and line breaks.
+- Skip policy numbers, legal disclosures and administrative text.
+
+PAGE NUMBERS:
+- The text contains markers like "=== PAGE 7 (OCR) ===" or "=== PAGE 7 (PyMuPDF) ===".
+- A field's page is the number in the nearest marker ABOVE it; use that exact number, never a guess. Several fields can share a page.
+
+Return ONLY valid JSON in exactly this format, with no text outside the JSON object. Use {{"value": null, "page": null}} for fields that are not found:
+{_GL_EXAMPLE_JSON}
+"""
+
+_GL_TAIL_TEMPLATE = """IMPORTANT: This is chunk {chunk_num} of {total_chunks}. This chunk contains pages {page_nums}.
+
+Document text:
+{text}
+"""
+
+
+def _reset_client_after_fork() -> None:
+    """Celery prefork children must not reuse the parent's upload threads"""
+    global _upload_pool
+    _upload_pool = ThreadPoolExecutor(max_workers=4)
+    _get_sheet.cache_clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any, human_readable: bool = False) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, indented if human_readable (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if human_readable else 0)
+        return orjson.dumps(data, option=option)
+    if human_readable:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 
 def _download_text_from_gcs(bucket: storage.bucket.Bucket, blob_path: str) -> str:
-    """Download text file from GCS"""
-    blob = bucket.blob(blob_path)
-    if not blob.exists():
+    """Download text file from GCS in a single request; returns "" if it doesn't exist"""
+    try:
+        return bucket.blob(blob_path).download_as_bytes().decode('utf-8')
+    except NotFound:
         return ""
-    return blob.download_as_string().decode('utf-8')
 
 
 def _download_json_from_gcs(bucket: storage.bucket.Bucket, blob_path: str) -> Dict[str, Any]:
-    """Download JSON file from GCS"""
-    blob = bucket.blob(blob_path)
-    if not blob.exists():
+    """Download JSON file from GCS in a single request; returns {} if it doesn't exist"""
+    try:
+        return _json_loads(bucket.blob(blob_path).download_as_bytes())
+    except NotFound:
         return {}
-    return json.loads(blob.download_as_string().decode('utf-8'))
 
 
-def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: Dict[str, Any]) -> None:
-    """Upload JSON file to GCS"""
+def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: Dict[str, Any], human_readable: bool = False) -> None:
+    """Upload JSON file to GCS (compact; human_readable=True for debug dumps)"""
     blob = bucket.blob(blob_path)
     blob.upload_from_string(
-        json.dumps(data, indent=2, ensure_ascii=False),
+        _json_dumps(data, human_readable=human_readable),
         content_type='application/json'
     )
     print(f"✅ Uploaded to: gs://{BUCKET_NAME}/{blob_path}")
 
 
+def _upload_json_with_retry(bucket: storage.bucket.Bucket, blob_path: str, data: Dict[str, Any]) -> None:
+    """Upload JSON to GCS, retrying with exponential backoff (1s, 2s) before giving up"""
+    for attempt in range(UPLOAD_RETRIES):
+        try:
+            _upload_json_to_gcs(bucket, blob_path, data)
+            return
+        except Exception as e:
+            if attempt == UPLOAD_RETRIES - 1:
+                raise
+            print(f"⚠️  Upload of {blob_path} failed ({e}), retrying in {2 ** attempt}s...")
+            time.sleep(2 ** attempt)
+
+
+def _llm_cache_key(prompt_tail: str) -> str:
+    """Cache key over cache version, model and the full prompt (system + chunk tail)"""
+    return llm_cache_key(LLM_CACHE_VERSION, GL_MODEL, _GL_SYSTEM_PROMPT, prompt_tail)
+
+
 def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -> List[Dict[str, Any]]:
     """Read the intelligent combined file from Phase 2D"""
     try:
@@ -70,18 +277,34 @@ def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -
         
         # Extract all pages
         all_pages = []
-        page_sections = re.findall(
-            r'PAGE (\d+) \((PyMuPDF|OCR) \(.*?\)\):.*?TEXT CONTENT:.*?------------------------------\n(.*?)\n={80}',
-            content,
-            re.DOTALL
-        )
-        
-        for page_num, source, page_text in page_sections:
-            all_pages.append({
-                'page_num': int(page_num),
-                'source': source,
-                'text': page_text.strip()
-            })
+        if file_path.endswith('.ndjson'):
+            # Phase 2D NDJSON: one {"page": ..., "source": ..., "text": ...} record per line
+            for line in content.split('\n'):
+                if not line:
+                    continue
+                page = _json_loads(line)
+                all_pages.append({
+                    'page_num': page['page'],
+                    'source': page['source'],
+                    'text': page['text']
+                })
+        else:
+            # Split on the fixed section rule instead of one DOTALL regex over the whole file
+            for section in content.split(_PAGE_SEPARATOR):
+                header = _PAGE_HEADER_RE.match(section)
+                if not header:
+                    continue
+                _, marker, body = section.partition(_TEXT_MARKER)
+                if not marker:
+                    continue
+                _, rule, page_text = body.partition(_TEXT_RULE)
+                if not rule:
+                    continue
+                all_pages.append({
+                    'page_num': int(header.group(1)),
+                    'source': header.group(2),
+                    'text': page_text.strip()
+                })
         
         # Sort by page number
         all_pages.sort(key=lambda x: x['page_num'])
@@ -104,16 +327,18 @@ def create_chunks(all_pages: List[Dict[str, Any]], chunk_size: int = 4) -> List[
     for i in range(0, len(all_pages), chunk_size):
         chunk_pages = all_pages[i:i+chunk_size]
         
-        # Combine text from all pages in this chunk
-        chunk_text = ""
+        # Combine text from all pages in this chunk (joined once, not grown with +=)
+        parts = []
         page_nums = []
         sources = []
         
         for page in chunk_pages:
-            chunk_text += f"=== PAGE {page['page_num']} ({page['source']}) ===\n"
-            chunk_text += page['text'] + "\n\n"
+            parts.append(f"=== PAGE {page['page_num']} ({page['source']}) ===\n")
+            parts.append(page['text'])
+            parts.append("\n\n")
             page_nums.append(page['page_num'])
             sources.append(page['source'])
+        chunk_text = ''.join(parts)
         
         chunks.append({
             'chunk_num': len(chunks) + 1,
@@ -130,192 +355,267 @@ def create_chunks(all_pages: List[Dict[str, Any]], chunk_size: int = 4) -> List[
     
     return chunks
 
-def extract_with_llm(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> Dict[str, Any]:
-    """Extract information using LLM with your exact prompt"""
-    
-    prompt = f"""
-    Analyze the following general liability insurance document text and extract ONLY the 22 specific general liability coverage fields listed below.
-    
-    CRITICAL: Extract ONLY these 22 fields. Do NOT create new field names or extract any other information.
-    
-    THE 22 SPECIFIC FIELDS TO EXTRACT (with examples of what to look for):
-    1. Each Occurrence/General Aggregate Limits - Look for: "$1,000,000 / $2,000,000", "$1M / $2M", any occurrence/aggregate limits with dollar amounts and "/" separator
-    2. Liability Deductible - Per claim or Per Occ basis - Look for: "$0", "$500", "$1,000", "Per claim", "Per Occurrence", any liability deductible amount
-    3. Hired Auto And Non-Owned Auto Liability - Without Delivery Service - Look for: "Included", "Excluded", "$1,000,000 / $1,000,000", any hired/non-owned auto coverage
-    4. Fuel Contamination coverage limits - Look for: "Each Customer's Auto Limit $1,000", "Aggregate Limit $5,000", any fuel contamination coverage
-    5. Vandalism coverage - Look for: any vandalism coverage details
-    6. Garage Keepers Liability - Look for: "Limit: $60,000", "Comprehensive Deductible: $500", "Collision Deductible: $500", any garage keepers liability
-    7. Employment Practices Liability - Look for: "Each Claim Limit $25,000", "Aggregate Limit $25,000", any employment practices liability
-    8. Abuse & Molestation Coverage limits - Look for: "Excluded", "Included", "Exclusion - Abuse or Molestation", any abuse & molestation coverage status
-    9. Assault & Battery Coverage limits - Look for: "$100,000 / $200,000", "Not Excluded", "Excluded", "Limited Coverage - Assault or Battery", any assault & battery coverage
-    10. Firearms/Active Assailant Coverage limits - Look for: "Not Excluded", "Excluded", any firearms/active assailant coverage
-    11. Additional Insured - Look for: "786 ALLGOOD ROAD LLC", "C/O GIL MOOR", specific company names and addresses, any additional insured details
-    12. Additional Insured (Mortgagee) - Look for: "FIRST HORIZON BANK", "NORTHEAST BANK", "PO BOX", specific bank names and addresses, any mortgagee additional insured details
-    13. Additional Insured - Jobber - Look for: "Premier Petroleum", any jobber additional insured details
-    14. Exposure - Look for: "Inside Sales: $400,000", "Gasoline Gallons: 400,000", any exposure details with sales and gallons
-    15. Rating basis: If Sales - Subject to Audit - Look for: "Sales $300,000", "Gasoline 48,000 Gallons", "Area: 1,600 Sqft", any rating basis information
-    16. Terrorism - Look for: "Excluded", "Can be added with additional premium", "Excluded - Can be Added With Additional Premium", any terrorism coverage status
-    17. Personal and Advertising Injury Limit - Look for: "$1,000,000", "Excluded", any personal and advertising injury limit
-    18. Products/Completed Operations Aggregate Limit - Look for: "Excluded", any products/completed operations aggregate limit
-    19. Minimum Earned - Look for: "25%", "MEP: 25%", "35%", any minimum earned premium percentage
-    20. General Liability Premium - Look for: "$1,200.00", "GL Premium", "Liability Premium", "TOTAL excl Terrorism", "TOTAL CHARGES W/O TRIA", any GL premium amount (PRIORITY: Look for "TOTAL excl Terrorism" or "TOTAL CHARGES W/O TRIA" first)
-    21. Total Premium (With/Without Terrorism) - Look for: "TOTAL CHARGES W/O TRIA $7,176.09, TOTAL CHARGES WITH TRIA $7,441.13", "TOTAL excl Terrorism $2,019.68, TOTAL incl Terrorism $2,123.68", "Total Premium", "Annual Premium", any total premium amount (EXTRACT BOTH VALUES if available: "Without Terrorism: $X,XXX.XX, With Terrorism: $X,XXX.XX")
-    22. Policy Premium - Look for: "$2,500.00", "Policy Premium", "Base Premium", "General Liability" base amount, any policy premium amount
-    
-    EXTRACTION RULES:
-    - Extract EXACTLY as written in the document
-    - Look for SIMILAR PATTERNS even if exact examples don't match
-    - For Limits: Look for dollar amounts with "/" separator (e.g., "$X,XXX,XXX / $X,XXX,XXX")
-    - For Dollar Amounts: Look for any dollar amounts ($X,XXX, $X,XXX.XX, $XXX,XXX)
-    - For Coverage Status: Look for "Included", "Excluded", "Not Excluded"
-    - For Deductibles: Look for "Per claim", "Per Occurrence", "Per Occ" with amounts
-    - For Additional Insured: Extract complete details including names and addresses
-    - For Rating Basis: Extract complete sales/area/gasoline information
-    - For Multi-line Values: Extract everything related to that field, preserve line breaks
-    - For Complex Values: Extract the complete text block for that field
-    - CRITICAL: Do NOT extract "See Carrier Quote" or "See Quote" - extract the ACTUAL VALUES
-    - CRITICAL: Look for the actual dollar amounts, limits, and specific details
-    - CRITICAL: If you see a table with columns, extract the values from the appropriate column
-    - If field is not found, set to null
-    - Do NOT hallucinate or make up values
-    - Do NOT combine or modify existing values
-    - If you see variations not in examples, still extract them exactly as written
-    - Do NOT extract administrative, financial, or policy information
-    - Do NOT create new field names
-    - Do NOT extract policy numbers or legal disclosures
-    - Note: Some quotes may have multiple columns (2-3 carriers), extract values for EACH column as separate entries when applicable
-    
-    IMPORTANT: This is chunk {chunk_num} of {total_chunks}. This chunk contains pages {chunk['page_nums']}. 
-    
-    CRITICAL PAGE NUMBER EXTRACTION:
-    - The document text below has clear page markers: "=== PAGE X (OCR) ===" or "=== PAGE X (PyMuPDF) ==="
-    - For each field you extract, find which "=== PAGE X ===" section it appears in
-    - Extract the EXACT page number X from that section marker
-    - Look BACKWARDS from the field to find the most recent "=== PAGE X ===" marker
-    - DO NOT guess or estimate page numbers - use the exact number from the marker
-    - Multiple fields can be on the same page
-    
-    Example: If you see:
-    === PAGE 7 (OCR) ===
-    General Liability
-    Each Occurrence: $1,000,000
-    General Aggregate: $2,000,000
-    
-    Then those limits should have page: 7 (because they're under "=== PAGE 7 ===" marker)
-    
-    CRITICAL: Return ONLY valid JSON with this exact format:
-    {{
-        "Each Occurrence/General Aggregate Limits": {{"value": "$1,000,000 / $2,000,000", "page": 5}},
-        "Liability Deductible - Per claim or Per Occ basis": {{"value": "$0", "page": 5}},
-        "Hired Auto And Non-Owned Auto Liability - Without Delivery Service": {{"value": "Included", "page": 5}},
-        "Fuel Contamination coverage limits": {{"value": "Each Customer's Auto Limit $1,000, Aggregate Limit $5,000", "page": 3}},
-        "Vandalism coverage": {{"value": null, "page": null}},
-        "Garage Keepers Liability": {{"value": "Limit: $60,000, Comprehensive Deductible: $500, Collision Deductible: $500", "page": 3}},
-        "Employment Practices Liability": {{"value": "Each Claim Limit $25,000, Aggregate Limit $25,000", "page": 3}},
-        "Abuse & Molestation Coverage limits": {{"value": null, "page": null}},
-        "Assault & Battery Coverage limits": {{"value": "$100,000 / $200,000", "page": 5}},
-        "Firearms/Active Assailant Coverage limits": {{"value": "Not Excluded", "page": 5}},
-        "Additional Insured": {{"value": "786 ALLGOOD ROAD LLC C/O GIL MOOR 786 ALLGOOD RD MARIETTA GA 30062", "page": 3}},
-        "Additional Insured (Mortgagee)": {{"value": "FIRST HORIZON BANK PO BOX 132 MEMPHIS TN 38101", "page": 3}},
-        "Additional Insured - Jobber": {{"value": "Premier Petroleum", "page": 3}},
-        "Exposure": {{"value": "Inside Sales: $400,000, Gasoline Gallons: 400,000", "page": 3}},
-        "Rating basis: If Sales - Subject to Audit": {{"value": "Sales $300,000, Gasoline 48,000 Gallons", "page": 3}},
-        "Terrorism": {{"value": "Excluded, Can be added with additional premium", "page": 3}},
-        "Personal and Advertising Injury Limit": {{"value": "$1,000,000", "page": 5}},
-        "Products/Completed Operations Aggregate Limit": {{"value": "Excluded", "page": 5}},
-        "Minimum Earned": {{"value": "25%", "page": 3}},
-        "General Liability Premium": {{"value": "$1,200.00", "page": 3}},
-        "Total Premium (With/Without Terrorism)": {{"value": "Without Terrorism: $1,200.00, With Terrorism: $1,300.00", "page": 3}},
-        "Policy Premium": {{"value": "$2,500.00", "page": 3}}
-    }}
-    
-    PAGE DETECTION RULES:
-    - Look for "Page X" markers in the text above each field
-    - Use the nearest page number found above the field
-    - If no page number found, use null for page
-    - Multiple fields can share the same page number
-    - Extract the actual page number from the text (e.g., "Page 3" = page 3)
-    
-    If a field is not found, use: {{"value": null, "page": null}}
-    Do not provide explanations, context, or any text outside the JSON object.
-    
-    Document text:
-    {chunk['text']}
+def _build_prompt_tail(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> str:
+    """Chunk-specific user message that follows the cached system prompt"""
+    return _GL_TAIL_TEMPLATE.format(
+        chunk_num=chunk_num,
+        total_chunks=total_chunks,
+        page_nums=chunk['page_nums'],
+        text=chunk['text']
+    )
+
+
+def _gl_request_params(prompt_tail: str, prompt_cache_key: str) -> Dict[str, Any]:
+    """Arguments for responses.create, shared by the sync and async extractors"""
+    return {
+        "model": GL_MODEL,
+        "input": [
+            {"role": "system", "content": _GL_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt_tail}
+        ],
+        "prompt_cache_key": prompt_cache_key,
+        "reasoning": {
+            "effort": "low"
+        },
+        "text": {
+            "verbosity": "low"
+        }
+    }
+
+
+def _chunk_has_gl_keywords(text: str) -> bool:
+    """True if the chunk mentions any GL trigger keyword (single linear scan)"""
+    text = text.lower()
+    if AHOCORASICK_AVAILABLE:
+        return next(_GL_KEYWORD_AUTOMATON.iter(text), None) is not None
+    return _GL_KEYWORD_RE.search(text) is not None
+
+
+def _empty_gl_result(chunk: Dict[str, Any], chunk_num: int) -> Dict[str, Any]:
+    """All-null result for a chunk with no GL keywords, shaped like a parsed LLM reply"""
+    print(f"  Skipping chunk {chunk_num} (Pages {chunk['page_nums']}) - no GL keywords found")
+    result = {name: None for name, _, _, _ in _GL_PROMPT_FIELDS}
+    result['_metadata'] = {
+        'chunk_num': chunk_num,
+        'page_nums': chunk['page_nums'],
+        'sources': chunk['sources'],
+        'char_count': chunk['char_count'],
+        'individual_page_fields': {},
+        'skipped': 'no GL keywords'
+    }
+    return result
+
+
+def _chunk_content_hash(chunk: Dict[str, Any]) -> str:
+    """
+    BLAKE2b over the chunk's page texts, without the "=== PAGE N ===" markers, so identical
+    pages at different page numbers hash the same
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for page in chunk['pages']:
+        data = page['text'].encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _copy_result_for_chunk(result: Dict[str, Any], source_chunk: Dict[str, Any], chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Reuse a duplicate chunk's result, moving its page references onto this chunk's pages"""
+    copied = copy.deepcopy(result)
+    page_map = dict(zip(source_chunk['page_nums'], chunk['page_nums']))
+    metadata = copied['_metadata']
+    metadata['chunk_num'] = chunk['chunk_num']
+    metadata['page_nums'] = chunk['page_nums']
+    if 'sources' in metadata:
+        metadata['sources'] = chunk['sources']
+    if 'individual_page_fields' in metadata:
+        metadata['individual_page_fields'] = {
+            field: [page_map.get(page, page) for page in pages]
+            for field, pages in metadata['individual_page_fields'].items()
+        }
+    return copied
+
+
+def _parse_llm_response(result_text: str, chunk: Dict[str, Any], chunk_num: int) -> Dict[str, Any]:
+    """Turn the raw LLM reply for one chunk into field values plus _metadata"""
+    # Check if response is empty
+    if not result_text:
+        print(f"  [ERROR] Empty response from LLM")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response'}}
+    
+    # Clean up markdown code blocks if present
+    if result_text.startswith('```json'):
+        result_text = result_text[7:]  # Remove ```json
+    if result_text.startswith('```'):
+        result_text = result_text[3:]   # Remove ```
+    if result_text.endswith('```'):
+        result_text = result_text[:-3]  # Remove trailing ```
+    result_text = result_text.strip()
+    
+    # Try to parse JSON
+    try:
+        result_json = _json_loads(result_text)
+        
+        # Convert new format to old format for compatibility
+        converted_json = {}
+        individual_page_fields = {}
+        
+        for field, data in result_json.items():
+            if isinstance(data, dict) and 'value' in data and 'page' in data:
+                # New format: {"value": "FRAME", "page": 5}
+                converted_json[field] = data['value']
+                if data['value'] is not None and data['page'] is not None:
+                    individual_page_fields[field] = [data['page']]
+                    print(f"    Found {field} on Page {data['page']}")
+            else:
+                # Old format: direct value
+                converted_json[field] = data
+        
+        # Add metadata
+        converted_json['_metadata'] = {
+            'chunk_num': chunk_num,
+            'page_nums': chunk['page_nums'],
+            'sources': chunk['sources'],
+            'char_count': chunk['char_count'],
+            'individual_page_fields': individual_page_fields
+        }
+        
+        found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
+        print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
+        return converted_json
+        
+    except json.JSONDecodeError as e:
+        print(f"  [ERROR] Failed to parse JSON response")
+        print(f"  Raw LLM response: {result_text[:200]}...")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
+
+
+def extract_with_llm(
+    chunk: Dict[str, Any],
+    chunk_num: int,
+    total_chunks: int,
+    prompt_cache_key: str = 'phase3_gl',
+    bucket: Optional[storage.bucket.Bucket] = None
+) -> Dict[str, Any]:
     """
+    Extract information using LLM with your exact prompt.
+    The static instructions go first as the system message so OpenAI can reuse the cached
+    prefix across chunks; only the chunk number, pages and text change in the user message.
+    When a bucket is given, responses are cached in GCS under phase3/llm_cache/.
+    Chunks without any GL keyword are answered locally with all-null fields.
+    """
+    if not _chunk_has_gl_keywords(chunk['text']):
+        return _empty_gl_result(chunk, chunk_num)
+    
+    prompt_tail = _build_prompt_tail(chunk, chunk_num, total_chunks)
     
     try:
         print(f"  Processing chunk {chunk_num} with LLM (Pages {chunk['page_nums']})...")
         
-        # Use OpenAI API (GPT-5 Responses API format)
-        client = openai.OpenAI(api_key=openai.api_key)
-        response = client.responses.create(
-            model="gpt-5",
-            input=prompt,
-            reasoning={
-                "effort": "low"
-            },
-            text={
-                "verbosity": "low"
-            }
-        )
+        cache_key = _llm_cache_key(prompt_tail) if bucket is not None else None
+        cached_text = llm_cache_get(bucket, cache_key) if cache_key else None
         
-        result_text = response.output_text.strip()
+        if cached_text is not None:
+            print(f"  Using cached LLM response for chunk {chunk_num} ({cache_key[:12]})")
+            result_text = cached_text
+        else:
+            # Use OpenAI API (GPT-5 Responses API format)
+            client = openai.OpenAI(api_key=openai.api_key)
+            response = client.responses.create(**_gl_request_params(prompt_tail, prompt_cache_key))
+            result_text = response.output_text.strip()
         
-        # Check if response is empty
-        if not result_text:
-            print(f"  [ERROR] Empty response from LLM")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response'}}
+        result = _parse_llm_response(result_text, chunk, chunk_num)
         
-        # Clean up markdown code blocks if present
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]  # Remove ```json
-        if result_text.startswith('```'):
-            result_text = result_text[3:]   # Remove ```
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]  # Remove trailing ```
-        result_text = result_text.strip()
+        # Only cache responses that parsed, so a bad reply is retried next run
+        if cache_key and cached_text is None and 'error' not in result['_metadata']:
+            llm_cache_put(bucket, cache_key, result_text, GL_MODEL)
+        return result
         
-        # Try to parse JSON
-        try:
-            result_json = json.loads(result_text)
-            
-            # Convert new format to old format for compatibility
-            converted_json = {}
-            individual_page_fields = {}
-            
-            for field, data in result_json.items():
-                if isinstance(data, dict) and 'value' in data and 'page' in data:
-                    # New format: {"value": "FRAME", "page": 5}
-                    converted_json[field] = data['value']
-                    if data['value'] is not None and data['page'] is not None:
-                        individual_page_fields[field] = [data['page']]
-                        print(f"    Found {field} on Page {data['page']}")
-                else:
-                    # Old format: direct value
-                    converted_json[field] = data
-            
-            # Add metadata
-            converted_json['_metadata'] = {
-                'chunk_num': chunk_num,
-                'page_nums': chunk['page_nums'],
-                'sources': chunk['sources'],
-                'char_count': chunk['char_count'],
-                'individual_page_fields': individual_page_fields
-            }
-            
-            found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
-            print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
-            return converted_json
-            
-        except json.JSONDecodeError as e:
-            print(f"  [ERROR] Failed to parse JSON response")
-            print(f"  Raw LLM response: {result_text[:200]}...")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
-            
     except Exception as e:
         print(f"  [ERROR] LLM processing failed: {e}")
         return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': str(e)}}
 
+
+async def extract_with_llm_async(
+    client: openai.AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    chunk: Dict[str, Any],
+    chunk_num: int,
+    total_chunks: int,
+    prompt_cache_key: str = 'phase3_gl',
+    bucket: Optional[storage.bucket.Bucket] = None
+) -> Dict[str, Any]:
+    """
+    Async version of extract_with_llm for fanning out many chunks on one event loop.
+    The semaphore bounds in-flight OpenAI requests; GCS cache I/O runs in worker threads.
+    """
+    if not _chunk_has_gl_keywords(chunk['text']):
+        return _empty_gl_result(chunk, chunk_num)
+    
+    prompt_tail = _build_prompt_tail(chunk, chunk_num, total_chunks)
+    
+    try:
+        cache_key = _llm_cache_key(prompt_tail) if bucket is not None else None
+        cached_text = await asyncio.to_thread(llm_cache_get, bucket, cache_key) if cache_key else None
+        
+        if cached_text is not None:
+            print(f"  Using cached LLM response for chunk {chunk_num} ({cache_key[:12]})")
+            result_text = cached_text
+        else:
+            async with semaphore:
+                print(f"  Processing chunk {chunk_num} with LLM (Pages {chunk['page_nums']})...")
+                response = await client.responses.create(**_gl_request_params(prompt_tail, prompt_cache_key))
+            result_text = response.output_text.strip()
+        
+        result = _parse_llm_response(result_text, chunk, chunk_num)
+        
+        # Only cache responses that parsed, so a bad reply is retried next run
+        if cache_key and cached_text is None and 'error' not in result['_metadata']:
+            await asyncio.to_thread(llm_cache_put, bucket, cache_key, result_text, GL_MODEL)
+        return result
+        
+    except Exception as e:
+        print(f"  [ERROR] LLM processing failed: {e}")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': str(e)}}
+
+
+async def _extract_chunks_async(
+    chunks: List[Dict[str, Any]],
+    prompt_cache_key: str,
+    bucket: Optional[storage.bucket.Bucket] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run every chunk through the LLM concurrently, results in chunk order.
+    Chunks whose pages repeat an earlier chunk's text (boilerplate endorsements, disclosures)
+    share that chunk's request and get a copy of its result.
+    """
+    # Content hash -> index of the first chunk with that content
+    first_by_hash: Dict[str, int] = {}
+    source_index: List[int] = []
+    for index, chunk in enumerate(chunks):
+        content_hash = _chunk_content_hash(chunk)
+        source_index.append(first_by_hash.setdefault(content_hash, index))
+    unique_indexes = sorted(first_by_hash.values())
+    if len(unique_indexes) < len(chunks):
+        print(f"  {len(chunks) - len(unique_indexes)} duplicate chunk(s) will reuse an earlier chunk's result")
+    
+    client = openai.AsyncOpenAI(api_key=openai.api_key)
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    try:
+        unique_results = await asyncio.gather(*[
+            extract_with_llm_async(client, semaphore, chunks[i], chunks[i]['chunk_num'], len(chunks), prompt_cache_key, bucket)
+            for i in unique_indexes
+        ])
+    finally:
+        await client.close()
+    
+    results_by_index = dict(zip(unique_indexes, unique_results))
+    return [
+        results_by_index[index] if source_index[index] == index
+        else _copy_result_for_chunk(results_by_index[source_index[index]], chunks[source_index[index]], chunk)
+        for index, chunk in enumerate(chunks)
+    ]
+
 def merge_extraction_results(all_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Merge results from all chunks, prioritizing non-null values"""
     
@@ -329,32 +629,24 @@ def merge_extraction_results(all_results: List[Dict[str, Any]]) -> Dict[str, Any
     for field_name in expected_field_names:
         merged_result[field_name] = None
     
-    # Collect all unique fields found by LLM
-    all_found_fields = set()
-    for chunk_result in all_results:
-        if '_metadata' in chunk_result and 'error' not in chunk_result['_metadata']:
-            for field in chunk_result.keys():
-                if field != '_metadata':
-                    all_found_fields.add(field)
-    
-    # Add any new fields found by LLM
-    for field in all_found_fields:
-        if field not in merged_result:
-            merged_result[field] = None
-    
     # Track which specific page each field was found on
     field_sources = {}
+    successful_chunks = 0
     
-    # Merge results from all chunks
+    # Merge results from all chunks in one pass; fields the LLM adds beyond the schema are
+    # appended (as null) the first time they are seen
     for chunk_result in all_results:
         if '_metadata' in chunk_result and 'error' in chunk_result['_metadata']:
             continue  # Skip failed chunks
+        successful_chunks += 1
             
         chunk_pages = chunk_result['_metadata']['page_nums']
         
         for field, value in chunk_result.items():
             if field == '_metadata':
                 continue
+            if field not in merged_result:
+                merged_result[field] = None
                 
             if value is not None and value != "" and value != "null":
                 # If field already has a value, keep the first non-null one
@@ -371,7 +663,7 @@ def merge_extraction_results(all_results: List[Dict[str, Any]]) -> Dict[str, Any
     # Add source information to merged result
     merged_result['_extraction_summary'] = {
         'total_chunks_processed': len(all_results),
-        'successful_chunks': len([r for r in all_results if '_metadata' in r and 'error' not in r['_metadata']]),
+        'successful_chunks': successful_chunks,
         'field_sources': field_sources
     }
     
@@ -383,9 +675,14 @@ def save_extraction_results_to_gcs(
     carrier_name: str,
     safe_carrier_name: str,
     file_type: str,
-    timestamp: str
+    timestamp: str,
+    pending: Optional[Dict[str, Future]] = None
 ) -> str:
-    """Save extraction results to GCS"""
+    """
+    Save extraction results to GCS.
+    If a pending dict is given the upload is handed to the upload pool and its future stored
+    under the result path; the caller must wait on it before relying on the file.
+    """
     type_short = file_type.replace('PDF', '').lower()
     final_file_path = f'phase3/results/{safe_carrier_name}_{type_short}_final_validated_fields_{timestamp}.json'
     
@@ -407,12 +704,45 @@ def save_extraction_results_to_gcs(
                 "source_page": page_info
             }
     
-    _upload_json_to_gcs(bucket, final_file_path, final_fields)
-    print(f"✅ Saved final validated fields to: gs://{BUCKET_NAME}/{final_file_path}")
+    if pending is not None:
+        pending[final_file_path] = _upload_pool.submit(_upload_json_with_retry, bucket, final_file_path, final_fields)
+        print(f"Queued upload of final validated fields to: gs://{BUCKET_NAME}/{final_file_path}")
+    else:
+        _upload_json_with_retry(bucket, final_file_path, final_fields)
+        print(f"✅ Saved final validated fields to: gs://{BUCKET_NAME}/{final_file_path}")
     
     return final_file_path
 
 
+@functools.lru_cache(maxsize=1)
+def _get_sheet():
+    """
+    Authorized "Insurance Fields Data" sheet, opened once per process so later uploads
+    skip the OAuth exchange and spreadsheet lookup. Returns None if credentials are missing.
+    """
+    import gspread
+    from google.oauth2.service_account import Credentials
+    
+    if _CREDS_PATH is None:
+        return None
+    
+    scope = [
+        'https://www.googleapis.com/auth/spreadsheets',
+        'https://www.googleapis.com/auth/drive'
+    ]
+    creds = Credentials.from_service_account_file(str(_CREDS_PATH), scopes=scope)
+    client = gspread.authorize(creds)
+    return client.open("Insurance Fields Data").sheet1
+
+
+def _list_phase3_results(bucket: storage.bucket.Bucket) -> set:
+    """Names of every object under phase3/results/ (one paginated listing, names only)"""
+    return {
+        blob.name
+        for blob in bucket.list_blobs(prefix='phase3/results/', fields='items(name),nextPageToken')
+    }
+
+
 def _check_if_all_carriers_complete_gl(bucket: storage.bucket.Bucket, upload_id: str) -> bool:
     """
     Check if all carriers in this upload have completed Phase 3 GL.
@@ -435,6 +765,9 @@ def _check_if_all_carriers_complete_gl(bucket: storage.bucket.Bucket, upload_id:
             print(f"⚠️  No carriers found for upload {upload_id}")
             return False
         
+        # One listing of Phase 3 results instead of an exists() request per carrier
+        existing = _list_phase3_results(bucket)
+        
         # Count how many carriers have completed Phase 3 GL
         completed_count = 0
         for carrier in carriers:
@@ -449,7 +782,7 @@ def _check_if_all_carriers_complete_gl(bucket: storage.bucket.Bucket, upload_id:
                 
                 # Extract timestamp from PDF path
                 pdf_path = pdf_info['path']
-                timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', pdf_path)
+                timestamp_match = _PDF_TIMESTAMP_RE.search(pdf_path)
                 if not timestamp_match:
                     continue
                 
@@ -457,8 +790,7 @@ def _check_if_all_carriers_complete_gl(bucket: storage.bucket.Bucket, upload_id:
                 
                 # Check if Phase 3 GL result exists
                 final_file_path = f"phase3/results/{safe_name}_liability_final_validated_fields_{timestamp}.json"
-                blob = bucket.blob(final_file_path)
-                if blob.exists():
+                if final_file_path in existing:
                     completed_count += 1
         
         # Count expected GL files
@@ -485,7 +817,7 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
     if not openai.api_key:
         return {"success": False, "error": "OpenAI API key not configured. Cannot run Phase 3 GL."}
     
-    bucket = _get_bucket()
+    bucket = get_bucket(BUCKET_NAME)
     
     # Read metadata
     from phase1 import _read_metadata
@@ -497,6 +829,10 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
         return {"success": False, "error": f"uploadId {upload_id} not found"}
     
     all_results: List[Dict[str, Any]] = []
+    # Result path -> upload future, waited on before the completion check
+    pending: Dict[str, Future] = {}
+    # Carriers whose final file is already here (earlier partial run) are not re-extracted
+    existing_phase3_results = _list_phase3_results(bucket)
     
     for carrier in record.get('carriers', []):
         carrier_name = carrier.get('carrierName')
@@ -514,20 +850,37 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
         try:
             # Extract timestamp from PDF path
             original_pdf_path = pdf_info.get('path')
-            timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', original_pdf_path)
+            timestamp_match = _PDF_TIMESTAMP_RE.search(original_pdf_path)
             if not timestamp_match:
                 report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             else:
                 report_timestamp = timestamp_match.group(1)
             
-            # Find latest intelligent combined file for liability
-            combined_files = list(bucket.list_blobs(prefix=f'phase2d/results/{safe_carrier_name}_liability_intelligent_combined_'))
-            if not combined_files:
+            final_file_path = f'phase3/results/{safe_carrier_name}_liability_final_validated_fields_{report_timestamp}.json'
+            if final_file_path in existing_phase3_results:
+                print(f"Skipping {carrier_name} liability - already extracted to {final_file_path}")
+                all_results.append({
+                    'carrierName': carrier_name,
+                    'fileType': 'liabilityPDF',
+                    'finalFields': f'gs://{BUCKET_NAME}/{final_file_path}',
+                    'skipped': 'already extracted'
+                })
+                continue
+            
+            # Find latest intelligent combined file for liability (single pass, name + timeCreated only)
+            latest = max(
+                bucket.list_blobs(
+                    prefix=f'phase2d/results/{safe_carrier_name}_liability_intelligent_combined_',
+                    fields='items(name,timeCreated),nextPageToken'
+                ),
+                key=lambda blob: blob.time_created,
+                default=None
+            )
+            if latest is None:
                 print(f"Warning: No combined file found for {carrier_name} liability")
                 continue
             
-            # Get latest file
-            combined_file = sorted(combined_files, key=lambda x: x.time_created)[-1].name
+            combined_file = latest.name
             
             # Read combined file
             all_pages = read_combined_file_from_gcs(bucket, combined_file)
@@ -538,30 +891,16 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
             # Create chunks (4 pages each)
             chunks = create_chunks(all_pages, chunk_size=4)
             
-            # Process each chunk with LLM - PARALLELIZED for faster processing
-            print(f"\nProcessing {len(chunks)} GL chunks in parallel...")
-            
-            def process_single_chunk(chunk):
-                """Process one chunk - called in parallel"""
-                print(f"  Processing GL Chunk {chunk['chunk_num']}/{len(chunks)}...")
-                return extract_with_llm(chunk, chunk['chunk_num'], len(chunks))
-            
-            # Process all chunks in parallel (n_jobs=-1 uses all available cores)
-            chunk_results = Parallel(
-                n_jobs=-1,
-                backend='threading',
-                verbose=5
-            )(
-                delayed(process_single_chunk)(chunk)
-                for chunk in chunks
-            )
+            # Process each chunk with LLM - all chunks in flight at once on one event loop
+            print(f"\nProcessing {len(chunks)} GL chunks concurrently...")
+            chunk_results = asyncio.run(_extract_chunks_async(chunks, safe_carrier_name, bucket))
             
             # Merge all results
             print(f"\nMerging results from {len(chunk_results)} chunks...")
             merged_result = merge_extraction_results(chunk_results)
             
             # Save results to GCS
-            final_path = save_extraction_results_to_gcs(bucket, merged_result, carrier_name, safe_carrier_name, 'liabilityPDF', report_timestamp)
+            final_path = save_extraction_results_to_gcs(bucket, merged_result, carrier_name, safe_carrier_name, 'liabilityPDF', report_timestamp, pending)
             
             all_results.append({
                 'carrierName': carrier_name,
@@ -579,6 +918,17 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
                 'error': str(e)
             })
     
+    # Wait for queued uploads - the completion check below looks for these files
+    for final_path, future in pending.items():
+        try:
+            future.result()
+            print(f"✅ Saved final validated fields to: gs://{BUCKET_NAME}/{final_path}")
+        except Exception as e:
+            print(f"Error uploading {final_path}: {e}")
+            for entry in all_results:
+                if entry.get('finalFields') == f'gs://{BUCKET_NAME}/{final_path}':
+                    entry['error'] = f"Upload failed: {e}"
+    
     result = {
         "success": True,
         "uploadId": upload_id,
@@ -592,66 +942,16 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
     if _check_if_all_carriers_complete_gl(bucket, upload_id):
         print("🎉 ALL GL CARRIERS COMPLETE! Auto-filling sheet...")
         try:
-            import gspread
-            from google.oauth2.service_account import Credentials
-            from pathlib import Path
-            
-            # Get credentials
-            possible_paths = [
-                'credentials/insurance-sheets-474717-7fc3fd9736bc.json',
-                '../credentials/insurance-sheets-474717-7fc3fd9736bc.json',
-            ]
-            creds_path = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    creds_path = str(Path(path).resolve())
-                    break
+            sheet = _get_sheet()
             
-            if creds_path:
-                scope = [
-                    'https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-                creds = Credentials.from_service_account_file(creds_path, scopes=scope)
-                client = gspread.authorize(creds)
-                sheet = client.open("Insurance Fields Data").sheet1
-                
-                # Field to Cell mapping for GL
-                field_mapping = {
-                    "Each Occurrence/General Aggregate Limits": "B8",
-                    "Liability Deductible - Per claim or Per Occ basis": "B9",
-                    "Hired Auto And Non-Owned Auto Liability - Without Delivery Service": "B10",
-                    "Fuel Contamination coverage limits": "B11",
-                    "Vandalism coverage": "B12",
-                    "Garage Keepers Liability": "B13",
-                    "Employment Practices Liability": "B14",
-                    "Abuse & Molestation Coverage limits": "B15",
-                    "Assault & Battery Coverage limits": "B16",
-                    "Firearms/Active Assailant Coverage limits": "B17",
-                    "Additional Insured": "B18",
-                    "Additional Insured (Mortgagee)": "B19",
-                    "Additional insured - Jobber": "B20",
-                    "Exposure": "B21",
-                    "Rating basis: If Sales - Subject to Audit": "B22",
-                    "Terrorism": "B23",
-                    "Personal and Advertising Injury Limit": "B24",
-                    "Products/Completed Operations Aggregate Limit": "B25",
-                    "Minimum Earned": "B26",
-                    "General Liability Premium": "B27",
-                    "Total Premium (With/Without Terrorism)": "B28",
-                    "Policy Premium": "B29",
-                    "Contaminated fuel": "B30",
-                    "Liquor Liability": "B31",
-                    "Additional Insured - Managers Or Lessors Of Premises": "B32",
-                }
-                
+            if sheet is not None:
                 # Load GL extracted data from GCS
                 carriers = record.get('carriers', [])
                 for carrier in carriers:
                     if carrier.get('liabilityPDF'):
                         carrier_name = carrier.get('carrierName', 'Unknown')
                         pdf_path = carrier['liabilityPDF']['path']
-                        timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', pdf_path)
+                        timestamp_match = _PDF_TIMESTAMP_RE.search(pdf_path)
                         if timestamp_match:
                             timestamp = timestamp_match.group(1)
                             safe_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
@@ -663,7 +963,7 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
                             if gl_data:
                                 # Build batch update from extracted data
                                 updates = []
-                                for field_name, cell_ref in field_mapping.items():
+                                for field_name, cell_ref in _GL_FIELD_MAPPING.items():
                                     if field_name in gl_data:
                                         field_info = gl_data[field_name]
                                         llm_value = field_info.get("llm_value", "") if isinstance(field_info, dict) else field_info
@@ -673,9 +973,10 @@ def process_upload_llm_extraction_gl(upload_id: str) -> Dict[str, Any]:
                                                 'values': [[str(llm_value)]]
                                             })
                                 
-                                # Single batch update - only values, no formatting
+                                # Single batch update - only values, no formatting. RAW keeps values like
+                                # "$1,000,000 / $2,000,000" from being parsed as numbers or dates.
                                 if updates:
-                                    sheet.batch_update(updates)
+                                    sheet.batch_update(updates, value_input_option='RAW')
                                     print(f"✅ Batch updated {len(updates)} GL fields to sheet")
                                     result['sheets_push'] = {"success": True, "fields_filled": len(updates)}
                                 else:
@@ -2,23 +2,105 @@
 Phase 3 Liquor: LLM Information Extraction for Liquor/Bar Insurance
 Extracts 9 specific liquor coverage fields from insurance documents using GPT.
 Works with Google Cloud Storage.
-Uses Joblib for parallel chunk processing.
+Uses a thread pool for parallel chunk processing.
 """
+import gzip
+import hashlib
 import json
 import openai
 import os
 import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from google.api_core.exceptions import NotFound, PreconditionFailed
 from google.cloud import storage
 from dotenv import load_dotenv
-from joblib import Parallel, delayed
+from gcs_client import get_bucket
+from openai_batch import BatchFailedError, batch_output_text, run_batch
+from llm_cache import LLM_CACHE_FOLDER, llm_cache_get, llm_cache_key, llm_cache_put
 from schemas.liquor_schema import LIQUOR_FIELDS_SCHEMA, get_liquor_field_names, get_liquor_required_fields
 
+# orjson is optional - faster JSON encode/decode, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 load_dotenv()
 
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 
+# Chunk threads per carrier, and max OpenAI requests in flight across the whole process
+CHUNK_WORKERS = int(os.getenv('PHASE3_LIQUOR_CHUNK_WORKERS', '8'))
+LLM_CONCURRENCY = int(os.getenv('PHASE3_LIQUOR_LLM_CONCURRENCY', '6'))
+_llm_semaphore = threading.BoundedSemaphore(LLM_CONCURRENCY)
+# Carriers processed side by side per upload
+CARRIER_WORKERS = int(os.getenv('PHASE3_LIQUOR_CARRIER_WORKERS', '4'))
+
+LIQUOR_MODEL = 'gpt-5'
+# Bump when the prompt or response handling changes so older cached responses are not reused
+PROMPT_VERSION = 'liquor-v3'
+
+# Keys of the prompt's example JSON; the API enforces this shape via structured outputs
+_LIQUOR_RESPONSE_FIELDS = [
+    "Each Occurrence/General Aggregate Limits",
+    "Sales - Subject to Audit",
+    "Assault & Battery/Firearms/Active Assailant",
+    "Requirements",
+    "If any subjectivities in quote please add",
+    "Minimum Earned",
+    "Liquor Premium",
+    "Total Premium (With/Without Terrorism)",
+    "Policy Premium",
+]
+_LIQUOR_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "name": "liquor_fields",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            field: {
+                "type": "object",
+                "properties": {
+                    "value": {"type": ["string", "null"]},
+                    "page": {"type": ["integer", "null"]}
+                },
+                "required": ["value", "page"],
+                "additionalProperties": False
+            }
+            for field in _LIQUOR_RESPONSE_FIELDS
+        },
+        "required": _LIQUOR_RESPONSE_FIELDS,
+        "additionalProperties": False
+    }
+}
+
+# Liquor fields in schema order - the merged result always starts with these
+_LIQUOR_EXPECTED_FIELDS = tuple(get_liquor_field_names())
+
+# Hashes of chunk texts whose LLM reply had every field null (headers, legal pages, ...), one line per file that saw it
+NO_FIELDS_PATH = f'{LLM_CACHE_FOLDER}/no_fields.txt'
+# All-null replies from this many separate files before a chunk text skips the LLM
+NO_FIELDS_MIN_REPLIES = 2
+
+# Legacy text-format page sections in Phase 2D combined files
+_PAGE_RE = re.compile(
+    r'PAGE (\d+) \((PyMuPDF|OCR) \(.*?\)\):.*?TEXT CONTENT:.*?------------------------------\n(.*?)\n={80}',
+    re.DOTALL
+)
+# Upload timestamp embedded in the original PDF name
+_PDF_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})\.pdf$')
+# Chunk-text pruning: whitespace runs, and cues that keep a repeated line (amounts, percentages)
+_INLINE_SPACE_RE = re.compile(r'[ \t]+')
+_VALUE_CUE_RE = re.compile(r'[$%\d]')
+# Repeated lines at least this long are treated as page headers/footers
+_REPEATED_LINE_MIN_CHARS = 30
+
 # Initialize OpenAI
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
@@ -27,29 +109,147 @@ if not openai.api_key:
     print("Phase 3 Liquor LLM extraction will fail without OpenAI API key")
 
 
-def _get_bucket() -> storage.bucket.Bucket:
-    client = storage.Client()
-    return client.bucket(BUCKET_NAME)
+_openai_client: Optional[openai.OpenAI] = None
+_client_lock = threading.Lock()
+# No-field sightings per chunk hash, loaded from GCS on first use and refreshed on each flush
+_no_fields_counts: Optional[Counter] = None
+
+
+def _get_openai_client() -> openai.OpenAI:
+    """Process-wide OpenAI client so chunk threads share one connection pool"""
+    global _openai_client
+    if _openai_client is None:
+        with _client_lock:
+            if _openai_client is None:
+                _openai_client = openai.OpenAI(api_key=openai.api_key)
+    return _openai_client
+
+
+def _reset_client_after_fork() -> None:
+    """Celery prefork children must not reuse the parent's sockets"""
+    global _openai_client, _client_lock, _no_fields_counts
+    _openai_client = None
+    _client_lock = threading.Lock()
+    _no_fields_counts = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+
+def _json_loads(data):
+    """Parse JSON from str or bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any, human_readable: bool = False) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, indented if human_readable (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if human_readable else 0)
+        return orjson.dumps(data, option=option)
+    if human_readable:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 
 def _download_text_from_gcs(bucket: storage.bucket.Bucket, blob_path: str) -> str:
-    """Download text file from GCS"""
-    blob = bucket.blob(blob_path)
-    if not blob.exists():
+    """Download text file from GCS in a single request; returns "" if it doesn't exist"""
+    try:
+        return bucket.blob(blob_path).download_as_bytes().decode('utf-8')
+    except NotFound:
         return ""
-    return blob.download_as_string().decode('utf-8')
 
 
-def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: Dict[str, Any]) -> None:
-    """Upload JSON file to GCS"""
+def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: Dict[str, Any], human_readable: bool = False) -> None:
+    """
+    Upload JSON file to GCS, gzip-compressed; download_as_bytes/download_as_string
+    hand readers the decompressed JSON. Compact unless human_readable (debug dumps).
+    """
     blob = bucket.blob(blob_path)
+    blob.content_encoding = 'gzip'
     blob.upload_from_string(
-        json.dumps(data, indent=2, ensure_ascii=False),
-        content_type='application/json'
+        gzip.compress(_json_dumps(data, human_readable=human_readable), compresslevel=6),
+        content_type='application/json; charset=utf-8'
     )
     print(f"✅ Uploaded to: gs://{BUCKET_NAME}/{blob_path}")
 
 
+def _llm_cache_key(prompt: str) -> str:
+    """Cache key over prompt version, model and the full prompt"""
+    return llm_cache_key(PROMPT_VERSION, LIQUOR_MODEL, prompt)
+
+
+def _chunk_text_hash(chunk: Dict[str, Any]) -> str:
+    """
+    SHA-256 over prompt version, model and the chunk's page texts, without the
+    "=== PAGE N ===" markers, so the same pages hash the same wherever they sit in the file
+    """
+    digest = hashlib.sha256()
+    for part in [PROMPT_VERSION, LIQUOR_MODEL] + [page['text'] for page in chunk['pages']]:
+        data = part.encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _is_no_fields_chunk(bucket: storage.bucket.Bucket, text_hash: str) -> bool:
+    """Check the chunk hash against the no-fields sightings, loading them from GCS on first use"""
+    global _no_fields_counts
+    if _no_fields_counts is None:
+        with _client_lock:
+            if _no_fields_counts is None:
+                try:
+                    _no_fields_counts = Counter(_download_text_from_gcs(bucket, NO_FIELDS_PATH).split())
+                except Exception as e:
+                    print(f"  Warning: could not read no-fields set: {e}")
+                    _no_fields_counts = Counter()
+    return _no_fields_counts[text_hash] >= NO_FIELDS_MIN_REPLIES
+
+
+def _flush_no_fields(bucket: storage.bucket.Bucket, chunk_results: List[Dict[str, Any]]) -> None:
+    """
+    Append one sighting per all-null chunk hash in this upload's results to the GCS set.
+    Generation-matched so concurrent uploads don't drop entries.
+    """
+    global _no_fields_counts
+    new_hashes = {
+        result['_metadata']['no_fields_hash']
+        for result in chunk_results
+        if result and 'no_fields_hash' in result.get('_metadata', {})
+    }
+    if not new_hashes:
+        return
+    blob = bucket.blob(NO_FIELDS_PATH)
+    for attempt in range(3):
+        try:
+            try:
+                blob.reload()
+                generation = blob.generation
+                existing = blob.download_as_bytes(if_generation_match=generation).decode('utf-8')
+            except NotFound:
+                generation = 0
+                existing = ''
+            lines = ''.join(f'{h}\n' for h in sorted(new_hashes))
+            blob.upload_from_string(
+                existing + lines,
+                content_type='text/plain',
+                if_generation_match=generation
+            )
+            print(f"  Recorded {len(new_hashes)} no-field chunk hash(es)")
+            counts = Counter((existing + lines).split())
+            with _client_lock:
+                _no_fields_counts = counts
+            return
+        except PreconditionFailed:
+            continue  # another upload appended first - re-read and merge
+        except Exception as e:
+            print(f"  Warning: could not update no-fields set: {e}")
+            return
+    print("  Warning: could not update no-fields set: too many concurrent writers")
+
+
 def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -> List[Dict[str, Any]]:
     """Read the intelligent combined file from Phase 2D"""
     try:
@@ -62,18 +262,26 @@ def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -
         
         # Extract all pages
         all_pages = []
-        page_sections = re.findall(
-            r'PAGE (\d+) \((PyMuPDF|OCR) \(.*?\)\):.*?TEXT CONTENT:.*?------------------------------\n(.*?)\n={80}',
-            content,
-            re.DOTALL
-        )
+        if file_path.endswith('.ndjson'):
+            # Phase 2D NDJSON: one {"page": ..., "source": ..., "text": ...} record per line
+            for line in content.split('\n'):
+                if not line:
+                    continue
+                page = _json_loads(line)
+                all_pages.append({
+                    'page_num': page['page'],
+                    'source': page['source'],
+                    'text': page['text']
+                })
+        else:
+            page_sections = _PAGE_RE.findall(content)
         
-        for page_num, source, page_text in page_sections:
-            all_pages.append({
-                'page_num': int(page_num),
-                'source': source,
-                'text': page_text.strip()
-            })
+            for page_num, source, page_text in page_sections:
+                all_pages.append({
+                    'page_num': int(page_num),
+                    'source': source,
+                    'text': page_text.strip()
+                })
         
         # Sort by page number
         all_pages.sort(key=lambda x: x['page_num'])
@@ -95,16 +303,18 @@ def create_chunks(all_pages: List[Dict[str, Any]], chunk_size: int = 4) -> List[
     for i in range(0, len(all_pages), chunk_size):
         chunk_pages = all_pages[i:i+chunk_size]
         
-        # Combine text from all pages in this chunk
-        chunk_text = ""
+        # Combine text from all pages in this chunk (joined once, not grown with +=)
+        parts = []
         page_nums = []
         sources = []
         
         for page in chunk_pages:
-            chunk_text += f"=== PAGE {page['page_num']} ({page['source']}) ===\n"
-            chunk_text += page['text'] + "\n\n"
+            parts.append(f"=== PAGE {page['page_num']} ({page['source']}) ===\n")
+            parts.append(page['text'])
+            parts.append("\n\n")
             page_nums.append(page['page_num'])
             sources.append(page['source'])
+        chunk_text = ''.join(parts)
         
         chunks.append({
             'chunk_num': len(chunks) + 1,
@@ -121,8 +331,33 @@ def create_chunks(all_pages: List[Dict[str, Any]], chunk_size: int = 4) -> List[
     
     return chunks
 
-def extract_with_llm(chunk, chunk_num, total_chunks):
-    """Extract information using LLM with your exact prompt"""
+def _prune_chunk_text(text: str) -> str:
+    """
+    Shrink chunk text before it goes into the prompt: collapse runs of spaces/tabs and blank
+    lines, and drop repeats of long lines with no digits, $ or % (headers/footers printed on
+    every page). Requirement and subjectivity text is left alone - it often has no value cue.
+    """
+    kept = []
+    seen = set()
+    blank = False
+    for line in text.split('\n'):
+        line = _INLINE_SPACE_RE.sub(' ', line).strip()
+        if not line:
+            if kept and not blank:
+                kept.append('')
+            blank = True
+            continue
+        if len(line) >= _REPEATED_LINE_MIN_CHARS and not line.startswith('=== PAGE ') and not _VALUE_CUE_RE.search(line):
+            if line in seen:
+                continue
+            seen.add(line)
+        kept.append(line)
+        blank = False
+    return '\n'.join(kept).strip()
+
+def _build_liquor_prompt(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> str:
+    """Full extraction prompt for one chunk"""
+    chunk_text = _prune_chunk_text(chunk['text'])
     
     prompt = f"""
     Analyze the following liquor/bar insurance document text and extract ONLY the 6 specific liquor coverage fields listed below.
@@ -202,78 +437,131 @@ def extract_with_llm(chunk, chunk_num, total_chunks):
     Do not provide explanations, context, or any text outside the JSON object.
     
     Document text:
-    {chunk['text']}
+    {chunk_text}
+    """
+    return prompt
+
+
+def _liquor_request_params(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    """Responses API arguments for one extraction call, shared by the live and Batch API paths"""
+    return {
+        "model": LIQUOR_MODEL,
+        "input": messages,
+        "reasoning": {
+            "effort": "low"
+        },
+        "text": {
+            "verbosity": "low",
+            "format": _LIQUOR_RESPONSE_FORMAT
+        }
+    }
+
+
+def _empty_liquor_result(chunk: Dict[str, Any], chunk_num: int) -> Dict[str, Any]:
+    """All-null chunk result, as returned for chunks known to hold none of the fields"""
+    empty_json = {field: None for field in _LIQUOR_RESPONSE_FIELDS}
+    empty_json['_metadata'] = {
+        'chunk_num': chunk_num,
+        'page_nums': chunk['page_nums'],
+        'sources': chunk['sources'],
+        'char_count': chunk['char_count'],
+        'individual_page_fields': {}
+    }
+    return empty_json
+
+
+def _convert_llm_result(result_json: Dict[str, Any], chunk: Dict[str, Any], chunk_num: int) -> Dict[str, Any]:
+    """Flatten the LLM's {"value", "page"} fields and attach the chunk metadata"""
+    # Convert new format to old format for compatibility
+    converted_json = {}
+    individual_page_fields = {}
+    
+    for field, data in result_json.items():
+        if isinstance(data, dict) and 'value' in data and 'page' in data:
+            # New format: {"value": "FRAME", "page": 5}
+            converted_json[field] = data['value']
+            if data['value'] is not None and data['page'] is not None:
+                individual_page_fields[field] = [data['page']]
+                print(f"    Found {field} on Page {data['page']}")
+        else:
+            # Old format: direct value
+            converted_json[field] = data
+    
+    # Add metadata
+    converted_json['_metadata'] = {
+        'chunk_num': chunk_num,
+        'page_nums': chunk['page_nums'],
+        'sources': chunk['sources'],
+        'char_count': chunk['char_count'],
+        'individual_page_fields': individual_page_fields
+    }
+    
+    found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
+    print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
+    return converted_json
+
+
+def _has_no_fields(converted_json: Dict[str, Any]) -> bool:
+    """True when the LLM found none of the fields in this chunk"""
+    return all(v is None for k, v in converted_json.items() if k != '_metadata')
+
+
+def extract_with_llm(chunk, chunk_num, total_chunks, bucket=None):
+    """
+    Extract information using LLM with your exact prompt.
+    When a bucket is given, responses are cached in GCS under phase3/llm_cache/.
     """
     
+    prompt = _build_liquor_prompt(chunk, chunk_num, total_chunks)
+    
     try:
         print(f"  Processing chunk {chunk_num} with LLM (Pages {chunk['page_nums']})...")
         
-        # Use OpenAI API (GPT-5 Responses API format)
-        client = openai.OpenAI(api_key=openai.api_key)
-        response = client.responses.create(
-            model="gpt-5",
-            input=prompt,
-            reasoning={
-                "effort": "low"
-            },
-            text={
-                "verbosity": "low"
-            }
-        )
+        # Chunks already seen to hold none of the fields skip the LLM entirely
+        text_hash = _chunk_text_hash(chunk) if bucket is not None else None
+        if text_hash and _is_no_fields_chunk(bucket, text_hash):
+            print(f"  Chunk {chunk_num} matches a known no-field chunk ({text_hash[:12]}), skipping LLM")
+            return _empty_liquor_result(chunk, chunk_num)
         
-        result_text = response.output_text.strip()
+        cache_key = _llm_cache_key(prompt) if bucket is not None else None
+        cached_text = llm_cache_get(bucket, cache_key) if cache_key else None
         
-        # Check if response is empty
-        if not result_text:
-            print(f"  [ERROR] Empty response from LLM")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response'}}
+        result_json = None
+        if cached_text is not None:
+            print(f"  Using cached LLM response for chunk {chunk_num} ({cache_key[:12]})")
+            result_json = _json_loads(cached_text)
+        else:
+            # Use OpenAI API (GPT-5 Responses API format). The JSON schema is enforced by the
+            # API, so replies need no fence stripping; one retry covers the rare bad reply.
+            client = _get_openai_client()
+            messages = [{"role": "user", "content": prompt}]
+            for attempt in range(2):
+                with _llm_semaphore:  # stay under the OpenAI request-rate limit
+                    response = client.responses.create(**_liquor_request_params(messages))
+                result_text = response.output_text.strip()
+                try:
+                    result_json = _json_loads(result_text)
+                    break
+                except json.JSONDecodeError as e:
+                    print(f"  [ERROR] Failed to parse JSON response (attempt {attempt + 1})")
+                    print(f"  Raw LLM response: {result_text[:200]}...")
+                    if attempt == 1:
+                        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
+                    messages = messages + [
+                        {"role": "assistant", "content": result_text},
+                        {"role": "user", "content": f"That reply was not valid JSON ({e}). Return only the JSON object."}
+                    ]
+            
+            # Only cache responses that parsed, so a bad reply is retried next run
+            if cache_key:
+                llm_cache_put(bucket, cache_key, result_text, LIQUOR_MODEL)
         
-        # Clean up markdown code blocks if present
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]  # Remove ```json
-        if result_text.startswith('```'):
-            result_text = result_text[3:]   # Remove ```
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]  # Remove trailing ```
-        result_text = result_text.strip()
+        converted_json = _convert_llm_result(result_json, chunk, chunk_num)
+        # Only fresh replies count as a sighting; a cached reply was already counted when it was made
+        if text_hash and cached_text is None and _has_no_fields(converted_json):
+            converted_json['_metadata']['no_fields_hash'] = text_hash
+        return converted_json
         
-        # Try to parse JSON
-        try:
-            result_json = json.loads(result_text)
-            
-            # Convert new format to old format for compatibility
-            converted_json = {}
-            individual_page_fields = {}
-            
-            for field, data in result_json.items():
-                if isinstance(data, dict) and 'value' in data and 'page' in data:
-                    # New format: {"value": "FRAME", "page": 5}
-                    converted_json[field] = data['value']
-                    if data['value'] is not None and data['page'] is not None:
-                        individual_page_fields[field] = [data['page']]
-                        print(f"    Found {field} on Page {data['page']}")
-                else:
-                    # Old format: direct value
-                    converted_json[field] = data
-            
-            # Add metadata
-            converted_json['_metadata'] = {
-                'chunk_num': chunk_num,
-                'page_nums': chunk['page_nums'],
-                'sources': chunk['sources'],
-                'char_count': chunk['char_count'],
-                'individual_page_fields': individual_page_fields
-            }
-            
-            found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
-            print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
-            return converted_json
-            
-        except json.JSONDecodeError as e:
-            print(f"  [ERROR] Failed to parse JSON response")
-            print(f"  Raw LLM response: {result_text[:200]}...")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
-            
     except Exception as e:
         print(f"  [ERROR] LLM processing failed: {e}")
         return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': str(e)}}
@@ -281,42 +569,28 @@ def extract_with_llm(chunk, chunk_num, total_chunks):
 def merge_extraction_results(all_results):
     """Merge results from all chunks, prioritizing non-null values"""
     
-    # Use schema to initialize Liquor fields in correct order
-    # This ensures Google Sheets always has consistent field ordering
-    expected_field_names = get_liquor_field_names()  # From Liquor schema - guaranteed order
-    
-    merged_result = {}
-    
     # Initialize all expected fields as null (schema order preserved)
-    for field_name in expected_field_names:
-        merged_result[field_name] = None
-    
-    # Collect all unique fields found by LLM
-    all_found_fields = set()
-    for chunk_result in all_results:
-        if '_metadata' in chunk_result and 'error' not in chunk_result['_metadata']:
-            for field in chunk_result.keys():
-                if field != '_metadata':
-                    all_found_fields.add(field)
-    
-    # Add any new fields found by LLM
-    for field in all_found_fields:
-        if field not in merged_result:
-            merged_result[field] = None
+    # This ensures Google Sheets always has consistent field ordering
+    merged_result = dict.fromkeys(_LIQUOR_EXPECTED_FIELDS)
     
     # Track which specific page each field was found on
     field_sources = {}
+    successful_chunks = 0
     
-    # Merge results from all chunks
+    # Merge results from all chunks in one pass; fields the LLM adds beyond the schema are
+    # appended (as null) the first time they are seen
     for chunk_result in all_results:
         if '_metadata' in chunk_result and 'error' in chunk_result['_metadata']:
             continue  # Skip failed chunks
+        successful_chunks += 1
             
         chunk_pages = chunk_result['_metadata']['page_nums']
         
         for field, value in chunk_result.items():
             if field == '_metadata':
                 continue
+            if field not in merged_result:
+                merged_result[field] = None
                 
             if value is not None and value != "" and value != "null":
                 # If field already has a value, keep the first non-null one
@@ -333,7 +607,7 @@ def merge_extraction_results(all_results):
     # Add source information to merged result
     merged_result['_extraction_summary'] = {
         'total_chunks_processed': len(all_results),
-        'successful_chunks': len([r for r in all_results if '_metadata' in r and 'error' not in r['_metadata']]),
+        'successful_chunks': successful_chunks,
         'field_sources': field_sources
     }
     
@@ -375,17 +649,24 @@ def save_extraction_results_to_gcs(
     return final_file_path
 
 
-def _check_if_all_carriers_complete_liquor(bucket: storage.bucket.Bucket, upload_id: str) -> bool:
+def _check_if_all_carriers_complete_liquor(
+    bucket: storage.bucket.Bucket,
+    upload_id: str,
+    record: Optional[Dict[str, Any]] = None
+) -> bool:
     """
     Check if all carriers in this upload have completed Phase 3 Liquor.
     Returns True if this is the last carrier to finish.
+    Pass the upload's metadata record when the caller already has it to skip re-reading metadata.
     """
     try:
-        # Read metadata to get total carriers
-        from phase1 import _read_metadata
-        full_metadata = _read_metadata(bucket)
-        uploads = full_metadata.get('uploads', [])
-        upload_record = next((u for u in uploads if u.get('uploadId') == upload_id), None)
+        upload_record = record
+        if upload_record is None:
+            # Read metadata to get total carriers
+            from phase1 import _read_metadata
+            full_metadata = _read_metadata(bucket)
+            uploads = full_metadata.get('uploads', [])
+            upload_record = next((u for u in uploads if u.get('uploadId') == upload_id), None)
         
         if not upload_record:
             print(f"⚠️  Upload {upload_id} not found in metadata")
@@ -397,6 +678,12 @@ def _check_if_all_carriers_complete_liquor(bucket: storage.bucket.Bucket, upload
             print(f"⚠️  No carriers found for upload {upload_id}")
             return False
         
+        # One listing of Phase 3 results instead of an exists() request per carrier
+        existing = {
+            blob.name
+            for blob in bucket.list_blobs(prefix='phase3/results/', fields='items(name),nextPageToken')
+        }
+        
         # Count how many carriers have completed Phase 3 Liquor
         completed_count = 0
         for carrier in carriers:
@@ -411,7 +698,7 @@ def _check_if_all_carriers_complete_liquor(bucket: storage.bucket.Bucket, upload
                 
                 # Extract timestamp from PDF path
                 pdf_path = pdf_info['path']
-                timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', pdf_path)
+                timestamp_match = _PDF_TIMESTAMP_RE.search(pdf_path)
                 if not timestamp_match:
                     continue
                 
@@ -419,8 +706,7 @@ def _check_if_all_carriers_complete_liquor(bucket: storage.bucket.Bucket, upload
                 
                 # Check if Phase 3 Liquor result exists
                 final_file_path = f"phase3/results/{safe_name}_liquor_final_validated_fields_{timestamp}.json"
-                blob = bucket.blob(final_file_path)
-                if blob.exists():
+                if final_file_path in existing:
                     completed_count += 1
         
         # Count expected liquor files
@@ -440,15 +726,238 @@ def _check_if_all_carriers_complete_liquor(bucket: storage.bucket.Bucket, upload
         return False
 
 
-def process_upload_llm_extraction_liquor(upload_id: str) -> Dict[str, Any]:
+def _load_liquor_carrier_chunks(bucket: storage.bucket.Bucket, carrier: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Read one carrier's latest combined file and split it into chunks.
+    Returns {'report_timestamp', 'chunks'}, or None if there is nothing to extract.
+    """
+    carrier_name = carrier.get('carrierName')
+    safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+    pdf_info = carrier.get('liquorPDF')
+    
+    # Extract timestamp from PDF path
+    original_pdf_path = pdf_info.get('path')
+    timestamp_match = _PDF_TIMESTAMP_RE.search(original_pdf_path)
+    if not timestamp_match:
+        report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    else:
+        report_timestamp = timestamp_match.group(1)
+    
+    # Find latest intelligent combined file (single pass, name + timeCreated only). By creation
+    # time, not name: a re-run leaves a legacy .txt and a new .ndjson with the same timestamp.
+    latest = max(
+        bucket.list_blobs(
+            prefix=f'phase2d/results/{safe_carrier_name}_liquor_intelligent_combined_',
+            fields='items(name,timeCreated),nextPageToken'
+        ),
+        key=lambda blob: blob.time_created,
+        default=None
+    )
+    if latest is None:
+        print(f"Warning: No combined file found for {carrier_name} liquor")
+        return None
+    combined_file = latest.name
+    
+    # Read combined file
+    all_pages = read_combined_file_from_gcs(bucket, combined_file)
+    if not all_pages:
+        print(f"Warning: No pages extracted from {combined_file}")
+        return None
+    
+    # Create chunks (4 pages each)
+    return {
+        'report_timestamp': report_timestamp,
+        'chunks': create_chunks(all_pages, chunk_size=4)
+    }
+
+
+def _finish_liquor_carrier(
+    bucket: storage.bucket.Bucket,
+    carrier: Dict[str, Any],
+    report_timestamp: str,
+    chunk_results: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Merge a carrier's chunk results, save them and build its result entry"""
+    carrier_name = carrier.get('carrierName')
+    safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+    
+    # Merge all results
+    print(f"\nMerging results from {len(chunk_results)} chunks...")
+    merged_result = merge_extraction_results(chunk_results)
+    _flush_no_fields(bucket, chunk_results)
+    
+    # Save results to GCS
+    final_path = save_extraction_results_to_gcs(bucket, merged_result, carrier_name, safe_carrier_name, 'liquorPDF', report_timestamp)
+    
+    return {
+        'carrierName': carrier_name,
+        'fileType': 'liquorPDF',
+        'finalFields': f'gs://{BUCKET_NAME}/{final_path}',
+        'totalFields': len([k for k in merged_result.keys() if not k.startswith('_')]),
+        'fieldsFound': len([k for k, v in merged_result.items() if v is not None and not k.startswith('_')])
+    }
+
+
+def _process_liquor_carrier(bucket: storage.bucket.Bucket, carrier: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run Phase 3 Liquor for one carrier: read its latest combined file, extract every chunk
+    with the LLM, merge and save. Returns the carrier's result entry, or None if skipped.
+    """
+    carrier_name = carrier.get('carrierName')
+    
+    try:
+        loaded = _load_liquor_carrier_chunks(bucket, carrier)
+        if loaded is None:
+            return None
+        chunks = loaded['chunks']
+        
+        # Process each chunk with LLM - PARALLELIZED for faster processing
+        print(f"\nProcessing {len(chunks)} Liquor chunks in parallel...")
+        
+        def process_single_chunk(chunk):
+            """Process one chunk - called in parallel"""
+            print(f"  Processing Liquor Chunk {chunk['chunk_num']}/{len(chunks)}...")
+            return extract_with_llm(chunk, chunk['chunk_num'], len(chunks), bucket=bucket)
+        
+        # Process all chunks in parallel - I/O bound, so not limited to the core count.
+        # map() keeps results in chunk order.
+        with ThreadPoolExecutor(max_workers=max(1, min(CHUNK_WORKERS, len(chunks)))) as executor:
+            chunk_results = list(executor.map(process_single_chunk, chunks))
+        
+        return _finish_liquor_carrier(bucket, carrier, loaded['report_timestamp'], chunk_results)
+        
+    except Exception as e:
+        print(f"Error processing {carrier_name} liquor: {e}")
+        return {
+            'carrierName': carrier_name,
+            'fileType': 'liquorPDF',
+            'error': str(e)
+        }
+
+
+def _prepare_batch_chunk(bucket: Optional[storage.bucket.Bucket], chunk: Dict[str, Any], total_chunks: int) -> Dict[str, Any]:
+    """
+    Batch API pre-check for one chunk. Known no-field chunks and cached prompts are answered
+    here as {'result': ...}; any other chunk comes back as a pending request
+    {'chunk', 'text_hash', 'cache_key', 'body'}. Without a bucket both lookups are skipped.
+    """
+    chunk_num = chunk['chunk_num']
+    text_hash = None
+    if bucket is not None:
+        text_hash = _chunk_text_hash(chunk)
+        if _is_no_fields_chunk(bucket, text_hash):
+            return {'result': _empty_liquor_result(chunk, chunk_num)}
+    prompt = _build_liquor_prompt(chunk, chunk_num, total_chunks)
+    cache_key = _llm_cache_key(prompt) if bucket is not None else None
+    cached_text = llm_cache_get(bucket, cache_key) if cache_key else None
+    if cached_text is not None:
+        return {'result': _convert_llm_result(_json_loads(cached_text), chunk, chunk_num)}
+    return {
+        'chunk': chunk,
+        'text_hash': text_hash,
+        'cache_key': cache_key,
+        'body': _liquor_request_params([{"role": "user", "content": prompt}])
+    }
+
+
+def _batch_reply_result(bucket: Optional[storage.bucket.Bucket], item: Dict[str, Any], response_body: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Chunk result for a pending request's batch reply (None when the job returned none).
+    The reply is cached and tagged as a no-field sighting the same way as a live reply.
+    """
+    chunk = item['chunk']
+    error_result = {'_metadata': {'chunk_num': chunk['chunk_num'], 'page_nums': chunk['page_nums'], 'error': 'No batch response'}}
+    if response_body is None:
+        return error_result
+    result_text = batch_output_text(response_body).strip()
+    try:
+        result_json = _json_loads(result_text)
+    except json.JSONDecodeError as e:
+        print(f"  [ERROR] Failed to parse JSON response for chunk {chunk['chunk_num']}")
+        error_result['_metadata']['error'] = f'JSON parse failed: {str(e)}'
+        return error_result
+    if item['cache_key']:
+        llm_cache_put(bucket, item['cache_key'], result_text, LIQUOR_MODEL)
+    converted_json = _convert_llm_result(result_json, chunk, chunk['chunk_num'])
+    if item['text_hash'] and _has_no_fields(converted_json):
+        converted_json['_metadata']['no_fields_hash'] = item['text_hash']
+    return converted_json
+
+
+def _process_liquor_carriers_batch(bucket: storage.bucket.Bucket, carriers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Batch API variant of the per-carrier run: every uncached chunk of every carrier goes into
+    one OpenAI batch job (half price, up to a 24h turnaround), then each carrier is merged and saved.
+    """
+    loaded_carriers = []
+    chunk_results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
+    all_results: List[Dict[str, Any]] = []
+    
+    for carrier_idx, carrier in enumerate(carriers):
+        carrier_name = carrier.get('carrierName')
+        safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+        try:
+            loaded = _load_liquor_carrier_chunks(bucket, carrier)
+        except Exception as e:
+            print(f"Error processing {carrier_name} liquor: {e}")
+            all_results.append({'carrierName': carrier_name, 'fileType': 'liquorPDF', 'error': str(e)})
+            continue
+        if loaded is None:
+            continue
+        
+        # The carrier index keeps IDs unique when two carrier names sanitize to the same safe name
+        custom_ids = [f"{carrier_idx}_{safe_carrier_name}_{chunk['chunk_num']}" for chunk in loaded['chunks']]
+        loaded_carriers.append((carrier, loaded, custom_ids))
+        for custom_id, chunk in zip(custom_ids, loaded['chunks']):
+            prepared = _prepare_batch_chunk(bucket, chunk, len(loaded['chunks']))
+            if 'result' in prepared:
+                chunk_results[custom_id] = prepared['result']
+            else:
+                pending[custom_id] = prepared
+    
+    batch_error = None
+    if pending:
+        try:
+            bodies = run_batch(_get_openai_client(), {custom_id: item['body'] for custom_id, item in pending.items()}, 'phase3_liquor')
+        except BatchFailedError as e:
+            print(f"⚠️  Liquor {e}")
+            batch_error = str(e)
+            bodies = {}
+        for custom_id, item in pending.items():
+            chunk_results[custom_id] = _batch_reply_result(bucket, item, bodies.get(custom_id))
+    
+    for carrier, loaded, custom_ids in loaded_carriers:
+        carrier_name = carrier.get('carrierName')
+        # Saving a carrier without its batch replies would overwrite an earlier good result with nulls
+        if batch_error and any(custom_id in pending for custom_id in custom_ids):
+            all_results.append({'carrierName': carrier_name, 'fileType': 'liquorPDF', 'error': batch_error})
+            continue
+        results = [chunk_results[custom_id] for custom_id in custom_ids]
+        if all('error' in result['_metadata'] for result in results):
+            print(f"⚠️  No Liquor chunk extracted for {carrier_name}, keeping any earlier results")
+            all_results.append({'carrierName': carrier_name, 'fileType': 'liquorPDF', 'error': 'No chunk was extracted successfully'})
+            continue
+        try:
+            all_results.append(_finish_liquor_carrier(bucket, carrier, loaded['report_timestamp'], results))
+        except Exception as e:
+            print(f"Error processing {carrier_name} liquor: {e}")
+            all_results.append({'carrierName': carrier_name, 'fileType': 'liquorPDF', 'error': str(e)})
+    
+    return all_results
+
+
+def process_upload_llm_extraction_liquor(upload_id: str, use_batch: bool = False) -> Dict[str, Any]:
     """
     Given an upload_id, read Phase 2D results from GCS,
     extract liquor insurance fields using LLM, and save results.
+    use_batch=True sends all chunks through one OpenAI Batch API job instead of live calls -
+    about half the cost but up to 24h to finish, so only for re-runs and catch-up jobs.
     """
     if not openai.api_key:
         return {"success": False, "error": "OpenAI API key not configured. Cannot run Phase 3 Liquor."}
     
-    bucket = _get_bucket()
+    bucket = get_bucket(BUCKET_NAME)
     
     # Read metadata
     from phase1 import _read_metadata
@@ -459,84 +968,18 @@ def process_upload_llm_extraction_liquor(upload_id: str) -> Dict[str, Any]:
     if record is None:
         return {"success": False, "error": f"uploadId {upload_id} not found"}
     
+    # Carriers are independent (own inputs, own result file), so run them side by side.
+    # Threads rather than processes: the work is network-bound and Celery prefork workers
+    # are daemonic, so they cannot start a process pool.
+    liquor_carriers = [c for c in record.get('carriers', []) if (c.get('liquorPDF') or {}).get('path')]
     all_results: List[Dict[str, Any]] = []
-    
-    for carrier in record.get('carriers', []):
-        carrier_name = carrier.get('carrierName')
-        safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
-        
-        # Process liquor PDF
-        pdf_info = carrier.get('liquorPDF')
-        if pdf_info:
-            gs_path = pdf_info.get('path')
-            if gs_path:
-                try:
-                    # Extract timestamp from PDF path
-                    original_pdf_path = pdf_info.get('path')
-                    timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', original_pdf_path)
-                    if not timestamp_match:
-                        report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    else:
-                        report_timestamp = timestamp_match.group(1)
-                    
-                    # Find latest intelligent combined file
-                    combined_files = list(bucket.list_blobs(prefix=f'phase2d/results/{safe_carrier_name}_liquor_intelligent_combined_'))
-                    if not combined_files:
-                        print(f"Warning: No combined file found for {carrier_name} liquor")
-                        continue
-                    
-                    # Get latest file
-                    combined_file = sorted(combined_files, key=lambda x: x.time_created)[-1].name
-                    
-                    # Read combined file
-                    all_pages = read_combined_file_from_gcs(bucket, combined_file)
-                    if not all_pages:
-                        print(f"Warning: No pages extracted from {combined_file}")
-                        continue
-                    
-                    # Create chunks (4 pages each)
-                    chunks = create_chunks(all_pages, chunk_size=4)
-                    
-                    # Process each chunk with LLM - PARALLELIZED for faster processing
-                    print(f"\nProcessing {len(chunks)} Liquor chunks in parallel...")
-                    
-                    def process_single_chunk(chunk):
-                        """Process one chunk - called in parallel"""
-                        print(f"  Processing Liquor Chunk {chunk['chunk_num']}/{len(chunks)}...")
-                        return extract_with_llm(chunk, chunk['chunk_num'], len(chunks))
-                    
-                    # Process all chunks in parallel (n_jobs=-1 uses all available cores)
-                    chunk_results = Parallel(
-                        n_jobs=-1,
-                        backend='threading',
-                        verbose=5
-                    )(
-                        delayed(process_single_chunk)(chunk)
-                        for chunk in chunks
-                    )
-                    
-                    # Merge all results
-                    print(f"\nMerging results from {len(chunk_results)} chunks...")
-                    merged_result = merge_extraction_results(chunk_results)
-                    
-                    # Save results to GCS
-                    final_path = save_extraction_results_to_gcs(bucket, merged_result, carrier_name, safe_carrier_name, 'liquorPDF', report_timestamp)
-                    
-                    all_results.append({
-                        'carrierName': carrier_name,
-                        'fileType': 'liquorPDF',
-                        'finalFields': f'gs://{BUCKET_NAME}/{final_path}',
-                        'totalFields': len([k for k in merged_result.keys() if not k.startswith('_')]),
-                        'fieldsFound': len([k for k, v in merged_result.items() if v is not None and not k.startswith('_')])
-                    })
-                    
-                except Exception as e:
-                    print(f"Error processing {carrier_name} liquor: {e}")
-                    all_results.append({
-                        'carrierName': carrier_name,
-                        'fileType': 'liquorPDF',
-                        'error': str(e)
-                    })
+    if liquor_carriers and use_batch:
+        all_results = _process_liquor_carriers_batch(bucket, liquor_carriers)
+    elif liquor_carriers:
+        with ThreadPoolExecutor(max_workers=min(CARRIER_WORKERS, len(liquor_carriers))) as executor:
+            for carrier_result in executor.map(lambda carrier: _process_liquor_carrier(bucket, carrier), liquor_carriers):
+                if carrier_result is not None:
+                    all_results.append(carrier_result)
     
     result = {
         "success": True,
@@ -548,7 +991,7 @@ def process_upload_llm_extraction_liquor(upload_id: str) -> Dict[str, Any]:
     print("\n✅ Phase 3 Liquor LLM extraction complete!")
     print("🔍 Checking if all carriers are complete...")
     
-    if _check_if_all_carriers_complete_liquor(bucket, upload_id):
+    if _check_if_all_carriers_complete_liquor(bucket, upload_id, record=record):
         print("🎉 ALL LIQUOR CARRIERS COMPLETE!")
         print("💡 Auto-trigger disabled. Manual sheet mapping will be implemented.")
         # Auto-trigger disabled - user will implement manual mapping
@@ -2,8 +2,9 @@
 Phase 3: LLM Information Extraction
 Extracts 34 specific property coverage fields from insurance documents using GPT.
 Works with Google Cloud Storage.
-Uses Joblib for parallel chunk processing.
+Uses asyncio (AsyncOpenAI) for property chunks and Joblib threads for the other file types.
 """
+import asyncio
 import json
 import openai
 import os
@@ -13,15 +14,33 @@ import socket
 import random
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 from dotenv import load_dotenv
 from joblib import Parallel, delayed
+from gcs_client import get_bucket
+from openai_batch import BatchFailedError, batch_output_text, run_batch
+from llm_cache import llm_cache_get, llm_cache_key, llm_cache_put
 from schemas.property_schema import PROPERTY_FIELDS_SCHEMA, get_field_names, get_required_fields
 
 load_dotenv()
 
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 
+# Max OpenAI requests in flight per property file (keeps bursts under the tier RPM limit)
+LLM_CONCURRENCY = int(os.getenv('PHASE3_LLM_CONCURRENCY', '20'))
+
+PROPERTY_MODEL = 'gpt-5-nano'
+# Bump when the prompt or response handling changes so older cached responses are not reused
+PROMPT_VERSION = 'property-v2'
+
+# Legacy text-format Phase 2D combined files: sections end at an 80 '=' rule, and each page
+# section starts with a "PAGE N (PyMuPDF (Clean)):", "PAGE N (OCR (All Pages)):" or "PAGE N (OCR Only):" header
+_PAGE_SEPARATOR = '\n' + '=' * 80
+_PAGE_HEADER_RE = re.compile(r'\s*PAGE (\d+) \((?:(PyMuPDF|OCR) \([^\n]*?\)|(OCR Only))\):')
+_TEXT_MARKER = 'TEXT CONTENT:'
+_TEXT_RULE = '-' * 30 + '\n'
+
 # Initialize OpenAI
 openai.api_key = os.getenv('OPENAI_API_KEY')
 CLOUDFLARE_GATEWAY_URL = os.getenv('CLOUDFLARE_GATEWAY_URL')  # Proxy to bypass Railway IP blocking
@@ -44,11 +63,6 @@ else:
             print("[INFO] Direct OpenAI connection (set CLOUDFLARE_GATEWAY_URL to use proxy)")
 
 
-def _get_bucket() -> storage.bucket.Bucket:
-    client = storage.Client()
-    return client.bucket(BUCKET_NAME)
-
-
 def _create_openai_client(timeout: float = 300.0, max_retries: int = 0) -> openai.OpenAI:
     """
     Create OpenAI client with optional Cloudflare AI Gateway proxy.
@@ -63,6 +77,16 @@ def _create_openai_client(timeout: float = 300.0, max_retries: int = 0) -> opena
     Returns:
         Configured OpenAI client
     """
+    return openai.OpenAI(**_openai_client_params(timeout, max_retries))
+
+
+def _create_async_openai_client(timeout: float = 300.0, max_retries: int = 0) -> openai.AsyncOpenAI:
+    """Async counterpart of _create_openai_client (same gateway and timeout settings)"""
+    return openai.AsyncOpenAI(**_openai_client_params(timeout, max_retries))
+
+
+def _openai_client_params(timeout: float, max_retries: int) -> Dict[str, Any]:
+    """Constructor arguments shared by the sync and async OpenAI clients"""
     client_params = {
         "api_key": openai.api_key,
         "timeout": timeout,
@@ -73,15 +97,15 @@ def _create_openai_client(timeout: float = 300.0, max_retries: int = 0) -> opena
     if CLOUDFLARE_GATEWAY_URL:
         client_params["base_url"] = CLOUDFLARE_GATEWAY_URL
     
-    return openai.OpenAI(**client_params)
+    return client_params
 
 
 def _download_text_from_gcs(bucket: storage.bucket.Bucket, blob_path: str) -> str:
-    """Download text file from GCS"""
-    blob = bucket.blob(blob_path)
-    if not blob.exists():
+    """Download text file from GCS in a single request; returns "" if it doesn't exist"""
+    try:
+        return bucket.blob(blob_path).download_as_bytes().decode('utf-8')
+    except NotFound:
         return ""
-    return blob.download_as_string().decode('utf-8')
 
 
 def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: Dict[str, Any]) -> None:
@@ -94,6 +118,11 @@ def _upload_json_to_gcs(bucket: storage.bucket.Bucket, blob_path: str, data: Dic
     print(f"✅ Uploaded to: gs://{BUCKET_NAME}/{blob_path}")
 
 
+def _llm_cache_key(prompt: str) -> str:
+    """Cache key over prompt version, model and the full prompt"""
+    return llm_cache_key(PROMPT_VERSION, PROPERTY_MODEL, prompt)
+
+
 def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -> List[Dict[str, Any]]:
     """Read the intelligent combined file from Phase 2D"""
     try:
@@ -106,25 +135,35 @@ def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -
         
         # Extract all pages
         all_pages = []
-        # Updated regex to handle both normal format and OCR-only format
-        # Normal: PAGE X (PyMuPDF (Clean)): or PAGE X (OCR (All Pages)):
-        # OCR-only: PAGE X (OCR Only):
-        page_sections = re.findall(
-            r'PAGE (\d+) \((?:(PyMuPDF|OCR) \(.*?\)|(OCR Only))\):.*?TEXT CONTENT:.*?------------------------------\n(.*?)\n={80}',
-            content,
-            re.DOTALL
-        )
-        
-        for match in page_sections:
-            page_num = match[0]
-            # source can be in match[1] (normal) or match[2] (OCR Only)
-            source = match[1] if match[1] else 'OCR'  # OCR Only becomes OCR
-            page_text = match[3]  # Text is now in the 4th group
-            all_pages.append({
-                'page_num': int(page_num),
-                'source': source,
-                'text': page_text.strip()
-            })
+        if file_path.endswith('.ndjson'):
+            # Phase 2D NDJSON: one {"page": ..., "source": ..., "text": ...} record per line
+            for line in content.split('\n'):
+                if not line:
+                    continue
+                page = json.loads(line)
+                all_pages.append({
+                    'page_num': page['page'],
+                    'source': page['source'],
+                    'text': page['text']
+                })
+        else:
+            # Split on the fixed section rule instead of one DOTALL regex over the whole file
+            for section in content.split(_PAGE_SEPARATOR):
+                header = _PAGE_HEADER_RE.match(section)
+                if not header:
+                    continue
+                _, marker, body = section.partition(_TEXT_MARKER)
+                if not marker:
+                    continue
+                _, rule, page_text = body.partition(_TEXT_RULE)
+                if not rule:
+                    continue
+                all_pages.append({
+                    'page_num': int(header.group(1)),
+                    # "PAGE N (OCR Only):" has no source group; it becomes OCR
+                    'source': header.group(2) or 'OCR',
+                    'text': page_text.strip()
+                })
         
         # Sort by page number
         all_pages.sort(key=lambda x: x['page_num'])
@@ -174,6 +213,84 @@ def create_chunks(all_pages: List[Dict[str, Any]], chunk_size: int = 4) -> List[
     return chunks
 
 
+def _llm_request_params(model: str, prompt: str) -> Dict[str, Any]:
+    """Responses API arguments for one extraction call"""
+    return {
+        "model": model,
+        "input": prompt,
+        "reasoning": {
+            "effort": "low"
+        },
+        "text": {
+            "verbosity": "low"
+        }
+    }
+
+
+def _retry_delay(error: Exception, attempt: int, max_retries: int, base_delay: float) -> float:
+    """
+    Log a failed LLM attempt and return how many seconds to wait before the next one.
+    Re-raises when the error is not retryable or this was the last attempt.
+    """
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError, ConnectionError, TimeoutError, socket.gaierror, socket.timeout)):
+        error_type = type(error).__name__
+        error_msg_short = str(error)[:100]
+        
+        if attempt < max_retries - 1:
+            # Exponential backoff with jitter: 3s, 6s, 12s, 24s, 48s, 96s, 192s, 384s, 768s, 1536s
+            delay = base_delay * (2 ** attempt)
+            # Add small random jitter to avoid thundering herd
+            jitter = random.uniform(0.5, 1.5)
+            delay = delay * jitter
+            
+            print(f"  [RETRY {attempt + 1}/{max_retries}] {error_type} - retrying in {delay:.1f}s... ({error_msg_short})")
+            
+            # Test DNS resolution before retry (Railway sometimes has DNS issues)
+            if attempt % 3 == 0:  # Every 3rd retry, test DNS
+                try:
+                    socket.gethostbyname('api.openai.com')
+                    print(f"  [DIAGNOSTIC] DNS resolution for api.openai.com: OK")
+                except socket.gaierror:
+                    print(f"  [DIAGNOSTIC] DNS resolution for api.openai.com: FAILED - Railway DNS issue")
+            
+            return delay
+        
+        error_msg = f"All {max_retries} retry attempts failed. Last error ({error_type}): {str(error)[:200]}"
+        print(f"  [ERROR] {error_msg}")
+        print(f"  [DIAGNOSTIC] Railway OpenAI API connection failed after {max_retries} attempts")
+        print(f"  [DIAGNOSTIC] Possible causes:")
+        print(f"  [DIAGNOSTIC] 1. OPENAI_API_KEY invalid/expired (check Railway env vars)")
+        print(f"  [DIAGNOSTIC] 2. Railway network timeout (try increasing timeout)")
+        print(f"  [DIAGNOSTIC] 3. OpenAI API rate limit (check OpenAI dashboard)")
+        print(f"  [DIAGNOSTIC] 4. DNS resolution issue (Railway DNS may be slow)")
+        raise ConnectionError(error_msg) from error
+    
+    if isinstance(error, openai.RateLimitError):
+        if attempt < max_retries - 1:
+            # Much longer delay for rate limits: 15s, 30s, 60s, 120s, etc.
+            delay = base_delay * (2 ** attempt) * 5
+            print(f"  [RETRY {attempt + 1}/{max_retries}] Rate limit hit, retrying in {delay:.1f}s...")
+            return delay
+        print(f"  [ERROR] Rate limit error after {max_retries} attempts: {error}")
+        print(f"  [DIAGNOSTIC] OpenAI API rate limit exceeded. Wait before retrying.")
+        raise error
+    
+    if isinstance(error, openai.AuthenticationError):
+        # Don't retry auth errors - API key is wrong
+        print(f"  [ERROR] Authentication failed - OPENAI_API_KEY is invalid: {str(error)[:200]}")
+        print(f"  [DIAGNOSTIC] Check Railway environment variables - API key may be expired or incorrect")
+        raise error
+    
+    # For other errors, log and re-raise
+    error_type = type(error).__name__
+    print(f"  [ERROR] Unexpected error ({error_type}): {str(error)[:200]}")
+    if attempt < max_retries - 1:
+        delay = base_delay * (2 ** attempt)
+        print(f"  [RETRY {attempt + 1}/{max_retries}] Retrying in {delay:.1f}s...")
+        return delay
+    raise error
+
+
 def _call_llm_with_retry(client: openai.OpenAI, model: str, prompt: str, max_retries: int = 10, base_delay: float = 3.0) -> Optional[str]:
     """
     Call OpenAI API with aggressive retry logic optimized for Railway.
@@ -184,9 +301,6 @@ def _call_llm_with_retry(client: openai.OpenAI, model: str, prompt: str, max_ret
     - Better timeout handling
     - DNS resolution test before retry
     """
-    api_key = openai.api_key
-    last_error = None
-    
     for attempt in range(max_retries):
         try:
             # Create fresh client on each retry to avoid connection pooling issues on Railway
@@ -197,259 +311,300 @@ def _call_llm_with_retry(client: openai.OpenAI, model: str, prompt: str, max_ret
                 )
             
             # Use OpenAI API (GPT-5 Responses API format)
-            response = client.responses.create(
-                model=model,
-                input=prompt,
-                reasoning={
-                    "effort": "low"
-                },
-                text={
-                    "verbosity": "low"
-                }
-            )
+            response = client.responses.create(**_llm_request_params(model, prompt))
             
             if attempt > 0:
                 print(f"  [SUCCESS] Retry {attempt} succeeded after {attempt} attempts!")
             # Extract text from GPT-5 response format
             return response.output_text.strip()
             
-        except (openai.APIConnectionError, openai.APITimeoutError, ConnectionError, TimeoutError, socket.gaierror, socket.timeout) as e:
-            last_error = e
-            error_type = type(e).__name__
-            error_msg_short = str(e)[:100]
-            
-            if attempt < max_retries - 1:
-                # Exponential backoff with jitter: 3s, 6s, 12s, 24s, 48s, 96s, 192s, 384s, 768s, 1536s
-                delay = base_delay * (2 ** attempt)
-                # Add small random jitter to avoid thundering herd
-                jitter = random.uniform(0.5, 1.5)
-                delay = delay * jitter
-                
-                print(f"  [RETRY {attempt + 1}/{max_retries}] {error_type} - retrying in {delay:.1f}s... ({error_msg_short})")
-                
-                # Test DNS resolution before retry (Railway sometimes has DNS issues)
-                if attempt % 3 == 0:  # Every 3rd retry, test DNS
-                    try:
-                        socket.gethostbyname('api.openai.com')
-                        print(f"  [DIAGNOSTIC] DNS resolution for api.openai.com: OK")
-                    except socket.gaierror:
-                        print(f"  [DIAGNOSTIC] DNS resolution for api.openai.com: FAILED - Railway DNS issue")
+        except Exception as e:
+            time.sleep(_retry_delay(e, attempt, max_retries, base_delay))
+    
+    return None
+
+
+async def _call_llm_with_retry_async(client: openai.AsyncOpenAI, model: str, prompt: str, max_retries: int = 10, base_delay: float = 3.0) -> Optional[str]:
+    """
+    Async version of _call_llm_with_retry with the same retry policy.
+    Retries go through a fresh client, closed once the call is done.
+    """
+    retry_client = None
+    try:
+        for attempt in range(max_retries):
+            try:
+                # Create fresh client on each retry to avoid connection pooling issues on Railway
+                if attempt > 0:
+                    if retry_client is not None:
+                        await retry_client.close()
+                    retry_client = _create_async_openai_client(timeout=300.0, max_retries=0)
+                    client = retry_client
                 
-                time.sleep(delay)
-            else:
-                error_msg = f"All {max_retries} retry attempts failed. Last error ({error_type}): {str(e)[:200]}"
-                print(f"  [ERROR] {error_msg}")
-                print(f"  [DIAGNOSTIC] Railway OpenAI API connection failed after {max_retries} attempts")
-                print(f"  [DIAGNOSTIC] Possible causes:")
-                print(f"  [DIAGNOSTIC] 1. OPENAI_API_KEY invalid/expired (check Railway env vars)")
-                print(f"  [DIAGNOSTIC] 2. Railway network timeout (try increasing timeout)")
-                print(f"  [DIAGNOSTIC] 3. OpenAI API rate limit (check OpenAI dashboard)")
-                print(f"  [DIAGNOSTIC] 4. DNS resolution issue (Railway DNS may be slow)")
-                raise ConnectionError(error_msg) from e
+                response = await client.responses.create(**_llm_request_params(model, prompt))
                 
-        except openai.RateLimitError as e:
-            last_error = e
-            if attempt < max_retries - 1:
-                # Much longer delay for rate limits: 15s, 30s, 60s, 120s, etc.
-                delay = base_delay * (2 ** attempt) * 5
-                print(f"  [RETRY {attempt + 1}/{max_retries}] Rate limit hit, retrying in {delay:.1f}s...")
-                time.sleep(delay)
-            else:
-                print(f"  [ERROR] Rate limit error after {max_retries} attempts: {e}")
-                print(f"  [DIAGNOSTIC] OpenAI API rate limit exceeded. Wait before retrying.")
-                raise
+                if attempt > 0:
+                    print(f"  [SUCCESS] Retry {attempt} succeeded after {attempt} attempts!")
+                return response.output_text.strip()
                 
-        except openai.AuthenticationError as e:
-            # Don't retry auth errors - API key is wrong
-            print(f"  [ERROR] Authentication failed - OPENAI_API_KEY is invalid: {str(e)[:200]}")
-            print(f"  [DIAGNOSTIC] Check Railway environment variables - API key may be expired or incorrect")
-            raise
-            
-        except Exception as e:
-            # For other errors, log and re-raise
-            error_type = type(e).__name__
-            print(f"  [ERROR] Unexpected error ({error_type}): {str(e)[:200]}")
-            if attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt)
-                print(f"  [RETRY {attempt + 1}/{max_retries}] Retrying in {delay:.1f}s...")
-                time.sleep(delay)
-            else:
-                raise
+            except Exception as e:
+                await asyncio.sleep(_retry_delay(e, attempt, max_retries, base_delay))
+    finally:
+        if retry_client is not None:
+            await retry_client.close()
     
     return None
 
 
-def extract_with_llm(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> Dict[str, Any]:
-    """Extract information using LLM"""
-    
-    prompt = f"""
-    Analyze the following insurance document text and extract ONLY the 34 specific property coverage fields listed below.
-    
-    CRITICAL: Extract ONLY these 34 fields. Do NOT create new field names or extract any other information.
-    
-    THE 34 SPECIFIC FIELDS TO EXTRACT (with examples):
-    1. Construction Type - Look for: "FRAME", "Frame", "Joisted Masonry", "Masonry Non-Combustible"
-    2. Valuation and Coinsurance - Look for: "RC, 90%", "Replacement Cost, 80%", "Actual Cash Value"
-       This is the GENERAL/DEFAULT valuation policy shown as its own field
-       Extract as standalone value: "RC, 90%" (WITHOUT dollar amounts or coverage names)
-       Often appears in its own table row or after "Valuation and Coinsurance:" label
-       CRITICAL: Valuation and Coinsurance are often in SEPARATE columns - find BOTH and COMBINE:
-       - Part 1: "Valuation: RC" or "Replacement Cost" 
-       - Part 2: "Coins %: 90%" or "Coinsurance: 80%"
-       - COMBINE as: "RC, 90%" or "Replacement Cost, 90%"
-       This field is SEPARATE from individual coverage valuations (Building, Pumps, etc.)
-    3. Cosmetic Damage - Look for: "Excluded", "Included", "Cosmetic Damage is Excluded"
-    4. Building - Look for: "$500,000", "$648,000 (RC, 90%)", "Coverage not required"
-       CRITICAL: If in a table with Valuation and Coins % columns, include them: "$648,000 (RC, 90%)"
-    5. Pumps - Look for: "$10,000.00", "$160,000 (RC, 90%)"
-       CRITICAL: If in a table with Valuation and Coins % columns, include them: "$160,000 (RC, 90%)"
-    6. Canopy - Look for: "$40,000", "$160,000 (RC, 90%)"
-       CRITICAL: If in a table with Valuation and Coins % columns, include them: "$160,000 (RC, 90%)"
-    7. ROOF EXCLUSION - Look for: "Included", "Excluded", "Cosmetic Damage is Excluded"
-    8. Roof Surfacing - Look for: "ACV only applies to roofs that are more than 15 years old", "CP 10 36", "CP 10 36 applies"
-       CRITICAL: Often appears in "Subject to:" sections as "CP 10 36 – Limitations on Coverage for Roof Surfacing applies"
-       ALSO check endorsement/form lists for "CP 10 36 10 12" or similar codes
-       Extract as: "CP 10 36 applies" or "Limitations on Coverage for Roof Surfacing applies" or the full text found
-       Form codes like "CP 10 36" are VALID VALUES - DO NOT leave empty if you find them
-    9. Roof Surfacing -Limitation - Look for: "ACV on Roof", "Cosmetic Damage is Excluded", "CP 10 36"
-       CRITICAL: If "CP 10 36" is mentioned anywhere in Subject to/endorsements, extract it here too
-       Extract as: "CP 10 36 applies" or "Limitations on Coverage for Roof Surfacing applies"
-       This field and "Roof Surfacing" often have the SAME value when referencing form codes
-    10. Business Personal Property - Look for: "$50,000.00", "$50,000 (RC, 90%)", "$200,000"
-        If in a table with Valuation and Coins % columns, include them: "$50,000 (RC, 90%)"
-    11. Business Income - Look for: "$100,000", "$120,000 (RC, 1/6)", "$100,000 (RC, 1/3)", "$100,000"
-        NOTE: Business Income often has coinsurance 1/6 or 1/3 (different from 90%)
-        If in a table with Valuation and Coins % columns, include them: "$100,000 (RC, 1/3)"
-        Extract dollar amount even if valuation/coinsurance not shown
-    12. Business Income with Extra Expense - Look for: "$100,000", "$100,000 (RC, 1/6)", "$100,000 (RC, 1/3)"
-        If in a table with Valuation and Coins % columns, include them
-    13. Equipment Breakdown - Look for: "Included", "$225,000"
-    14. Outdoor Signs - Look for: "$10,000", "$5,000", "Included", "Deductible $250"
-    15. Signs Within 1,000 Feet to Premises - Look for: any signs within 1,000 feet coverage
-    16. Employee Dishonesty - Look for: "$5,000", "Included", "Not Offered"
-    17. Money & Securities - Look for: "$10,000", "$5,000", "On Premises $2,500 / Off Premises $2,500"
-    18. Money and Securities (Inside; Outside) - Look for: separate inside/outside limits
-    19. Spoilage - Look for: "$5,000", "$10,000", "Deductible $250"
-    20. Theft - Look for: "Sublimit: $5,000", "Ded: $2,500", "Sublimit $10,000"
-    21. Theft Sublimit - Look for: "$5,000", "$15,000", "$10,000", "Theft Sublimit: $10,000"
-        May appear in endorsement sections or main tables
-    22. Theft Deductible - Look for: "$2,500", "$1,000", "$250", "Theft Deductible: $1,000"
-        May appear in endorsement sections or main tables
-    23. Windstorm or Hail - Look for: "$2,500", "2%", "1%", "Min Per Building", "Excluded", "$2,500 Min"
-        Often in coverage tables under "Wind/Hail Ded" column
-        Can be dollar amount, percentage, or "Excluded"
-    24. Named Storm Deductible - Look for: any named storm deductible
-    25. Wind and Hail and Named Storm exclusion - Look for: any wind/hail/named storm exclusion
-    26. All Other Perils Deductible - Look for: "$2,500", "$1,000", "$5,000", "$5000"
-        Often in coverage tables under "AOP Ded" column - extract the dollar amount shown
-        Extract ANY dollar amount found near "AOP" or "All Other Perils"
-    27. Fire Station Alarm - Look for: "$2,500.00", "Local", "Central"
-    28. Burglar Alarm - Look for: "Local", "Central", "Active Central Station"
-    29. Terrorism - Look for: "APPLIES", "Excluded", "Included", "Can be added"
-        Also look for: "TRIA", "Subject to TRIA", "Terrorism Risk Insurance Act"
-    30. Protective Safeguards Requirements - Look for: any protective safeguards requirements
-    31. Minimum Earned Premium (MEP) - Look for: "25%", "MEP: 25%", "35%"
-    32. Property Premium - Look for: "TOTAL CHARGES W/O TRIA $7,176.09", "W/O TRIA $7,176.09, WITH TRIA $7,441.13"
-        CRITICAL: Look for "TOTAL CHARGES" or "Total Premium (With/Without Terrorism)" - NOT "Property Premium"
-        "Property Premium" is base only; we need TOTAL which includes endorsements
-        DO NOT extract from "Summary of Cost" section (that combines all policies - property, GL, liquor)
-        Extract from property coverage section as: "W/O TRIA $7,176.09, WITH TRIA $7,441.13" or single value
-    33. Total Premium (With/Without Terrorism) - Look for: "W/O TRIA $7,176.09, WITH TRIA $7,441.13"
-        Same as Property Premium - look for TOTAL CHARGES, not base property premium
-        DO NOT extract from "Summary of Cost" section
-    34. Policy Premium - Look for: "$2,500.00", "Policy Premium", "Base Premium"
-    
-    EXTRACTION RULES:
-    - Extract EXACTLY as written in the document
-    - Look for SIMILAR PATTERNS even if exact examples don't match
-    - For Dollar Amounts: Look for any dollar amounts ($X,XXX, $X,XXX.XX)
-    - For Percentages: Look for any percentages (X%, X.X%)
-    - For Deductibles: Look for "Deductible", "Ded", "Min", "Per" with amounts
-      * Check coverage tables for columns like "Wind/Hail Ded", "AOP Ded", etc.
-      * Can be: dollar amounts ($5,000), percentages (2%), or status (Excluded)
-    - For Sublimits: Look for "Sublimit", "Limit", "Max" with amounts
-    - For Coverage Status: Look for "Included", "Excluded", "Not Offered", "Coverage not required"
-    - For "Valuation and Coinsurance" (Field #2 - standalone general field):
-      * This is the GENERAL valuation policy shown as its own separate field
-      * Extract as standalone: "RC, 90%" WITHOUT coverage names or dollar amounts
-      * MUST extract TWO pieces and combine them:
-        - Part 1 (Valuation): RC, Replacement Cost, ACV, Actual Cash Value
-        - Part 2 (Coinsurance %): Look for "Coins %", "Coinsurance", or percentage (80%, 90%, 100%)
-        - COMBINE as: "RC, 90%" or "Replacement Cost, 80%" - DO NOT extract just "RC" alone
-      * Often in separate columns in table - find both parts and combine them
-      * This is DIFFERENT from coverage-specific valuations (Building, Business Income, etc.)
-    - For COVERAGE AMOUNTS (Building, Pumps, Canopy, BPP, Business Income):
-      * If in a TABLE with Valuation and Coins % columns, include them: "$648,000 (RC, 90%)"
-      * Example: "Building #01 $648,000 RC 90%" should extract as "$648,000 (RC, 90%)"
-      * Business Income often has 1/6 or 1/3 coinsurance instead of 90%
-      * If valuation columns not present, extract just the dollar amount
-    - For FORM CODES (Roof Surfacing, Terrorism, Windstorm):
-      * Form codes like "CP 10 36", "TRIA" are VALID VALUES
-      * Often appear in "Subject to:" sections at the end of quotes
-      * Extract as "CP 10 36 applies" or "TRIA" - these are complete values
-    - For ENDORSEMENT SECTIONS (Theft Sublimit/Deductible, Outdoor Signs, etc.):
-      * Check "Additional Endorsements" or "Additional Coverages" sections
-      * Format: "Field Name: $value" (e.g., "Theft Sublimit: $10,000")
-    - For PREMIUM EXTRACTION (Property Premium, Total Premium):
-      * Extract ONLY "TOTAL CHARGES" or "Total Premium" from property coverage section
-      * If document shows BOTH "Property Premium" ($6,303) and "Total Premium" ($7,176), extract the TOTAL
-      * "Property Premium" = base coverage only; "Total Premium" = base + endorsements (we want TOTAL)
-      * CRITICAL: DO NOT extract from "Summary of Cost" section at the end
-      * "Summary of Cost" combines property + GL + liquor + fees = wrong value
-      * Look for "TOTAL CHARGES W/O TRIA" or "Total Premium (With/Without Terrorism)" in property section
-    - If field is not found, set to null
-    - Do NOT hallucinate or make up values
-    - Do NOT combine or modify existing values (EXCEPT for Valuation/Coinsurance and Coverage Amounts as noted above)
-    - Do NOT extract administrative, financial, or policy information
-    
-    IMPORTANT: This is chunk {chunk_num} of {total_chunks}. This chunk contains pages {chunk['page_nums']}.
-    
-    CRITICAL PAGE NUMBER EXTRACTION:
-    - The document text below has clear page markers: "=== PAGE X (OCR) ===" or "=== PAGE X (PyMuPDF) ==="
-    - For each field you extract, find which "=== PAGE X ===" section it appears in
-    - Extract the EXACT page number X from that section marker
-    - Look BACKWARDS from the field to find the most recent "=== PAGE X ===" marker
-    - DO NOT guess or estimate page numbers - use the exact number from the marker
-    - Multiple fields can be on the same page
-    
-    Example: If you see:
-    === PAGE 7 (OCR) ===
-    Commercial Property
-    Building #01: $648,000
-    Construction: MNC
-    
-    Then "Construction Type" should have page: 7 (because it's under "=== PAGE 7 ===" marker)
-    
-    CRITICAL: Return ONLY valid JSON with this exact format:
-    {{
-        "Construction Type": {{"value": "MNC", "page": 7}},
-        "Building": {{"value": "$648,000 (RC, 90%)", "page": 7}},
-        "Business Income": {{"value": "$120,000 (RC, 1/6)", "page": 7}},
-        "Roof Surfacing": {{"value": "CP 10 36 applies", "page": 9}},
-        "Roof Surfacing -Limitation": {{"value": "Limitations on Coverage for Roof Surfacing applies", "page": 9}},
-        "Windstorm or Hail": {{"value": "Excluded", "page": 7}},
-        "All Other Perils Deductible": {{"value": "$5,000", "page": 7}},
-        "Theft Sublimit": {{"value": "$10,000", "page": 8}},
-        "Theft Deductible": {{"value": "$1,000", "page": 8}},
-        "Terrorism": {{"value": "TRIA", "page": 9}},
-        "Property Premium": {{"value": "W/O TRIA $7,176.09, WITH TRIA $7,441.13", "page": 9}}
-    }}
-    
-    If a field is not found, use: {{"value": null, "page": null}}
-    
-    IMPORTANT: 
-    - Check entire document: main tables, endorsement sections, and "Subject to:" sections
-    - For Premium: Extract "TOTAL CHARGES" from property section, NOT "Summary of Cost" at end
-    - If both "Property Premium" and "Total Premium" exist, extract the TOTAL (includes endorsements)
-    - "Summary of Cost" section combines all policies (property + GL + liquor) - DO NOT use it
-    
-    Do not provide explanations, context, or any text outside the JSON object.
-    
-    Document text:
-    {chunk['text']}
+# Static 34-field instructions - kept byte-for-byte identical across chunks and files so the
+# prompt prefix is cached by OpenAI. Everything chunk-specific goes in _PROPERTY_TAIL_TEMPLATE.
+_PROPERTY_PROMPT_PREFIX = """Analyze the following insurance document text and extract ONLY the 34 specific property coverage fields listed below.
+
+CRITICAL: Extract ONLY these 34 fields. Do NOT create new field names or extract any other information.
+
+THE 34 SPECIFIC FIELDS TO EXTRACT (with examples):
+1. Construction Type - Look for: "FRAME", "Frame", "Joisted Masonry", "Masonry Non-Combustible"
+2. Valuation and Coinsurance - Look for: "RC, 90%", "Replacement Cost, 80%", "Actual Cash Value"
+   This is the GENERAL/DEFAULT valuation policy shown as its own field
+   Extract as standalone value: "RC, 90%" (WITHOUT dollar amounts or coverage names)
+   Often appears in its own table row or after "Valuation and Coinsurance:" label
+   CRITICAL: Valuation and Coinsurance are often in SEPARATE columns - find BOTH and COMBINE:
+   - Part 1: "Valuation: RC" or "Replacement Cost" 
+   - Part 2: "Coins %: 90%" or "Coinsurance: 80%"
+   - COMBINE as: "RC, 90%" or "Replacement Cost, 90%"
+   This field is SEPARATE from individual coverage valuations (Building, Pumps, etc.)
+3. Cosmetic Damage - Look for: "Excluded", "Included", "Cosmetic Damage is Excluded"
+4. Building - Look for: "$500,000", "$648,000 (RC, 90%)", "Coverage not required"
+   CRITICAL: If in a table with Valuation and Coins % columns, include them: "$648,000 (RC, 90%)"
+5. Pumps - Look for: "$10,000.00", "$160,000 (RC, 90%)"
+   CRITICAL: If in a table with Valuation and Coins % columns, include them: "$160,000 (RC, 90%)"
+6. Canopy - Look for: "$40,000", "$160,000 (RC, 90%)"
+   CRITICAL: If in a table with Valuation and Coins % columns, include them: "$160,000 (RC, 90%)"
+7. ROOF EXCLUSION - Look for: "Included", "Excluded", "Cosmetic Damage is Excluded"
+8. Roof Surfacing - Look for: "ACV only applies to roofs that are more than 15 years old", "CP 10 36", "CP 10 36 applies"
+   CRITICAL: Often appears in "Subject to:" sections as "CP 10 36 – Limitations on Coverage for Roof Surfacing applies"
+   ALSO check endorsement/form lists for "CP 10 36 10 12" or similar codes
+   Extract as: "CP 10 36 applies" or "Limitations on Coverage for Roof Surfacing applies" or the full text found
+   Form codes like "CP 10 36" are VALID VALUES - DO NOT leave empty if you find them
+9. Roof Surfacing -Limitation - Look for: "ACV on Roof", "Cosmetic Damage is Excluded", "CP 10 36"
+   CRITICAL: If "CP 10 36" is mentioned anywhere in Subject to/endorsements, extract it here too
+   Extract as: "CP 10 36 applies" or "Limitations on Coverage for Roof Surfacing applies"
+   This field and "Roof Surfacing" often have the SAME value when referencing form codes
+10. Business Personal Property - Look for: "$50,000.00", "$50,000 (RC, 90%)", "$200,000"
+    If in a table with Valuation and Coins % columns, include them: "$50,000 (RC, 90%)"
+11. Business Income - Look for: "$100,000", "$120,000 (RC, 1/6)", "$100,000 (RC, 1/3)", "$100,000"
+    NOTE: Business Income often has coinsurance 1/6 or 1/3 (different from 90%)
+    If in a table with Valuation and Coins % columns, include them: "$100,000 (RC, 1/3)"
+    Extract dollar amount even if valuation/coinsurance not shown
+12. Business Income with Extra Expense - Look for: "$100,000", "$100,000 (RC, 1/6)", "$100,000 (RC, 1/3)"
+    If in a table with Valuation and Coins % columns, include them
+13. Equipment Breakdown - Look for: "Included", "$225,000"
+14. Outdoor Signs - Look for: "$10,000", "$5,000", "Included", "Deductible $250"
+15. Signs Within 1,000 Feet to Premises - Look for: any signs within 1,000 feet coverage
+16. Employee Dishonesty - Look for: "$5,000", "Included", "Not Offered"
+17. Money & Securities - Look for: "$10,000", "$5,000", "On Premises $2,500 / Off Premises $2,500"
+18. Money and Securities (Inside; Outside) - Look for: separate inside/outside limits
+19. Spoilage - Look for: "$5,000", "$10,000", "Deductible $250"
+20. Theft - Look for: "Sublimit: $5,000", "Ded: $2,500", "Sublimit $10,000"
+21. Theft Sublimit - Look for: "$5,000", "$15,000", "$10,000", "Theft Sublimit: $10,000"
+    May appear in endorsement sections or main tables
+22. Theft Deductible - Look for: "$2,500", "$1,000", "$250", "Theft Deductible: $1,000"
+    May appear in endorsement sections or main tables
+23. Windstorm or Hail - Look for: "$2,500", "2%", "1%", "Min Per Building", "Excluded", "$2,500 Min"
+    Often in coverage tables under "Wind/Hail Ded" column
+    Can be dollar amount, percentage, or "Excluded"
+24. Named Storm Deductible - Look for: any named storm deductible
+25. Wind and Hail and Named Storm exclusion - Look for: any wind/hail/named storm exclusion
+26. All Other Perils Deductible - Look for: "$2,500", "$1,000", "$5,000", "$5000"
+    Often in coverage tables under "AOP Ded" column - extract the dollar amount shown
+    Extract ANY dollar amount found near "AOP" or "All Other Perils"
+27. Fire Station Alarm - Look for: "$2,500.00", "Local", "Central"
+28. Burglar Alarm - Look for: "Local", "Central", "Active Central Station"
+29. Terrorism - Look for: "APPLIES", "Excluded", "Included", "Can be added"
+    Also look for: "TRIA", "Subject to TRIA", "Terrorism Risk Insurance Act"
+30. Protective Safeguards Requirements - Look for: any protective safeguards requirements
+31. Minimum Earned Premium (MEP) - Look for: "25%", "MEP: 25%", "35%"
+32. Property Premium - Look for: "TOTAL CHARGES W/O TRIA $7,176.09", "W/O TRIA $7,176.09, WITH TRIA $7,441.13"
+    CRITICAL: Look for "TOTAL CHARGES" or "Total Premium (With/Without Terrorism)" - NOT "Property Premium"
+    "Property Premium" is base only; we need TOTAL which includes endorsements
+    DO NOT extract from "Summary of Cost" section (that combines all policies - property, GL, liquor)
+    Extract from property coverage section as: "W/O TRIA $7,176.09, WITH TRIA $7,441.13" or single value
+33. Total Premium (With/Without Terrorism) - Look for: "W/O TRIA $7,176.09, WITH TRIA $7,441.13"
+    Same as Property Premium - look for TOTAL CHARGES, not base property premium
+    DO NOT extract from "Summary of Cost" section
+34. Policy Premium - Look for: "$2,500.00", "Policy Premium", "Base Premium"
+
+EXTRACTION RULES:
+- Extract EXACTLY as written in the document
+- Look for SIMILAR PATTERNS even if exact examples don't match
+- For Dollar Amounts: Look for any dollar amounts ($X,XXX, $X,XXX.XX)
+- For Percentages: Look for any percentages (X%, X.X%)
+- For Deductibles: Look for "Deductible", "Ded", "Min", "Per" with amounts
+  * Check coverage tables for columns like "Wind/Hail Ded", "AOP Ded", etc.
+  * Can be: dollar amounts ($5,000), percentages (2%), or status (Excluded)
+- For Sublimits: Look for "Sublimit", "Limit", "Max" with amounts
+- For Coverage Status: Look for "Included", "Excluded", "Not Offered", "Coverage not required"
+- For "Valuation and Coinsurance" (Field #2 - standalone general field):
+  * This is the GENERAL valuation policy shown as its own separate field
+  * Extract as standalone: "RC, 90%" WITHOUT coverage names or dollar amounts
+  * MUST extract TWO pieces and combine them:
+    - Part 1 (Valuation): RC, Replacement Cost, ACV, Actual Cash Value
+    - Part 2 (Coinsurance %): Look for "Coins %", "Coinsurance", or percentage (80%, 90%, 100%)
+    - COMBINE as: "RC, 90%" or "Replacement Cost, 80%" - DO NOT extract just "RC" alone
+  * Often in separate columns in table - find both parts and combine them
+  * This is DIFFERENT from coverage-specific valuations (Building, Business Income, etc.)
+- For COVERAGE AMOUNTS (Building, Pumps, Canopy, BPP, Business Income):
+  * If in a TABLE with Valuation and Coins % columns, include them: "$648,000 (RC, 90%)"
+  * Example: "Building #01 $648,000 RC 90%" should extract as "$648,000 (RC, 90%)"
+  * Business Income often has 1/6 or 1/3 coinsurance instead of 90%
+  * If valuation columns not present, extract just the dollar amount
+- For FORM CODES (Roof Surfacing, Terrorism, Windstorm):
+  * Form codes like "CP 10 36", "TRIA" are VALID VALUES
+  * Often appear in "Subject to:" sections at the end of quotes
+  * Extract as "CP 10 36 applies" or "TRIA" - these are complete values
+- For ENDORSEMENT SECTIONS (Theft Sublimit/Deductible, Outdoor Signs, etc.):
+  * Check "Additional Endorsements" or "Additional Coverages" sections
+  * Format: "Field Name: $value" (e.g., "Theft Sublimit: $10,000")
+- For PREMIUM EXTRACTION (Property Premium, Total Premium):
+  * Extract ONLY "TOTAL CHARGES" or "Total Premium" from property coverage section
+  * If document shows BOTH "Property Premium" ($6,303) and "Total Premium" ($7,176), extract the TOTAL
+  * "Property Premium" = base coverage only; "Total Premium" = base + endorsements (we want TOTAL)
+  * CRITICAL: DO NOT extract from "Summary of Cost" section at the end
+  * "Summary of Cost" combines property + GL + liquor + fees = wrong value
+  * Look for "TOTAL CHARGES W/O TRIA" or "Total Premium (With/Without Terrorism)" in property section
+- If field is not found, set to null
+- Do NOT hallucinate or make up values
+- Do NOT combine or modify existing values (EXCEPT for Valuation/Coinsurance and Coverage Amounts as noted above)
+- Do NOT extract administrative, financial, or policy information
+
+CRITICAL PAGE NUMBER EXTRACTION:
+- The document text below has clear page markers: "=== PAGE X (OCR) ===" or "=== PAGE X (PyMuPDF) ==="
+- For each field you extract, find which "=== PAGE X ===" section it appears in
+- Extract the EXACT page number X from that section marker
+- Look BACKWARDS from the field to find the most recent "=== PAGE X ===" marker
+- DO NOT guess or estimate page numbers - use the exact number from the marker
+- Multiple fields can be on the same page
+
+Example: If you see:
+=== PAGE 7 (OCR) ===
+Commercial Property
+Building #01: $648,000
+Construction: MNC
+
+Then "Construction Type" should have page: 7 (because it's under "=== PAGE 7 ===" marker)
+
+CRITICAL: Return ONLY valid JSON with this exact format:
+{
+    "Construction Type": {"value": "MNC", "page": 7},
+    "Building": {"value": "$648,000 (RC, 90%)", "page": 7},
+    "Business Income": {"value": "$120,000 (RC, 1/6)", "page": 7},
+    "Roof Surfacing": {"value": "CP 10 36 applies", "page": 9},
+    "Roof Surfacing -Limitation": {"value": "Limitations on Coverage for Roof Surfacing applies", "page": 9},
+    "Windstorm or Hail": {"value": "Excluded", "page": 7},
+    "All Other Perils Deductible": {"value": "$5,000", "page": 7},
+    "Theft Sublimit": {"value": "$10,000", "page": 8},
+    "Theft Deductible": {"value": "$1,000", "page": 8},
+    "Terrorism": {"value": "TRIA", "page": 9},
+    "Property Premium": {"value": "W/O TRIA $7,176.09, WITH TRIA $7,441.13", "page": 9}
+}
+
+If a field is not found, use: {"value": null, "page": null}
+
+IMPORTANT: 
+- Check entire document: main tables, endorsement sections, and "Subject to:" sections
+- For Premium: Extract "TOTAL CHARGES" from property section, NOT "Summary of Cost" at end
+- If both "Property Premium" and "Total Premium" exist, extract the TOTAL (includes endorsements)
+- "Summary of Cost" section combines all policies (property + GL + liquor) - DO NOT use it
+
+Do not provide explanations, context, or any text outside the JSON object.
+"""
+
+_PROPERTY_TAIL_TEMPLATE = """
+IMPORTANT: This is chunk {chunk_num} of {total_chunks}. This chunk contains pages {page_nums}.
+
+Document text:
+{text}
+"""
+
+
+def _build_property_prompt(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> str:
+    """Full 34-field extraction prompt for one chunk: static prefix, then the chunk-specific tail"""
+    return _PROPERTY_PROMPT_PREFIX + _PROPERTY_TAIL_TEMPLATE.format(
+        chunk_num=chunk_num,
+        total_chunks=total_chunks,
+        page_nums=chunk['page_nums'],
+        text=chunk['text']
+    )
+
+
+def _parse_llm_response(result_text: Optional[str], chunk: Dict[str, Any], chunk_num: int) -> Dict[str, Any]:
+    """Turn the raw LLM reply for a chunk into field values plus _metadata (error metadata on failure)"""
+    if not result_text:
+        print(f"  [ERROR] Empty response from LLM after retries")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response after retries'}}
+    
+    # Clean up markdown code blocks if present
+    if result_text.startswith('```json'):
+        result_text = result_text[7:]
+    if result_text.startswith('```'):
+        result_text = result_text[3:]
+    if result_text.endswith('```'):
+        result_text = result_text[:-3]
+    result_text = result_text.strip()
+    
+    # Try to parse JSON
+    try:
+        result_json = json.loads(result_text)
+    except json.JSONDecodeError as e:
+        print(f"  [ERROR] Failed to parse JSON response")
+        print(f"  Raw LLM response: {result_text[:200]}...")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
+    
+    # Convert to compatible format
+    converted_json = {}
+    individual_page_fields = {}
+    
+    for field, data in result_json.items():
+        if isinstance(data, dict) and 'value' in data and 'page' in data:
+            converted_json[field] = data['value']
+            if data['value'] is not None and data['page'] is not None:
+                individual_page_fields[field] = [data['page']]
+                print(f"    Found {field} on Page {data['page']}")
+        else:
+            converted_json[field] = data
+    
+    # Add metadata
+    converted_json['_metadata'] = {
+        'chunk_num': chunk_num,
+        'page_nums': chunk['page_nums'],
+        'sources': chunk['sources'],
+        'char_count': chunk['char_count'],
+        'individual_page_fields': individual_page_fields
+    }
+    
+    found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
+    print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
+    return converted_json
+
+
+def extract_with_llm(
+    chunk: Dict[str, Any],
+    chunk_num: int,
+    total_chunks: int,
+    bucket: Optional[storage.bucket.Bucket] = None
+) -> Dict[str, Any]:
+    """
+    Extract information using LLM.
+    When a bucket is given, responses are cached in GCS under phase3/llm_cache/.
     """
+    prompt = _build_property_prompt(chunk, chunk_num, total_chunks)
     
     try:
+        cache_key = _llm_cache_key(prompt) if bucket is not None else None
+        cached_text = llm_cache_get(bucket, cache_key) if cache_key else None
+        if cached_text is not None:
+            print(f"  Using cached LLM response for chunk {chunk_num} ({cache_key[:12]})")
+            return _parse_llm_response(cached_text, chunk, chunk_num)
+        
         print(f"  Processing chunk {chunk_num} with LLM (Pages {chunk['page_nums']})...")
         
         # Use OpenAI API with retry logic optimized for Railway
@@ -457,61 +612,74 @@ def extract_with_llm(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -
             timeout=300.0,
             max_retries=0  # We handle retries ourselves
         )
-        result_text = _call_llm_with_retry(client, "gpt-5-nano", prompt, max_retries=10, base_delay=3.0)
+        result_text = _call_llm_with_retry(client, PROPERTY_MODEL, prompt, max_retries=10, base_delay=3.0)
+        result = _parse_llm_response(result_text, chunk, chunk_num)
         
-        if not result_text:
-            print(f"  [ERROR] Empty response from LLM after retries")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response after retries'}}
+        # Only cache responses that parsed, so a bad reply is retried next run
+        if cache_key and 'error' not in result['_metadata']:
+            llm_cache_put(bucket, cache_key, result_text, PROPERTY_MODEL)
+        return result
+            
+    except Exception as e:
+        print(f"  [ERROR] LLM processing failed: {e}")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': str(e)}}
+
+
+async def extract_with_llm_async(
+    client: openai.AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
+    chunk: Dict[str, Any],
+    chunk_num: int,
+    total_chunks: int,
+    bucket: Optional[storage.bucket.Bucket] = None
+) -> Dict[str, Any]:
+    """
+    Async version of extract_with_llm for fanning out a file's chunks on one event loop.
+    The semaphore bounds in-flight OpenAI requests; GCS cache I/O runs in worker threads.
+    """
+    prompt = _build_property_prompt(chunk, chunk_num, total_chunks)
+    
+    try:
+        cache_key = _llm_cache_key(prompt) if bucket is not None else None
+        cached_text = await asyncio.to_thread(llm_cache_get, bucket, cache_key) if cache_key else None
+        if cached_text is not None:
+            print(f"  Using cached LLM response for chunk {chunk_num} ({cache_key[:12]})")
+            return _parse_llm_response(cached_text, chunk, chunk_num)
         
-        # Clean up markdown code blocks if present
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.startswith('```'):
-            result_text = result_text[3:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
+        async with semaphore:
+            print(f"  Processing chunk {chunk_num} with LLM (Pages {chunk['page_nums']})...")
+            result_text = await _call_llm_with_retry_async(client, PROPERTY_MODEL, prompt, max_retries=10, base_delay=3.0)
+        result = _parse_llm_response(result_text, chunk, chunk_num)
+        
+        # Only cache responses that parsed, so a bad reply is retried next run
+        if cache_key and 'error' not in result['_metadata']:
+            await asyncio.to_thread(llm_cache_put, bucket, cache_key, result_text, PROPERTY_MODEL)
+        return result
         
-        # Try to parse JSON
-        try:
-            result_json = json.loads(result_text)
-            
-            # Convert to compatible format
-            converted_json = {}
-            individual_page_fields = {}
-            
-            for field, data in result_json.items():
-                if isinstance(data, dict) and 'value' in data and 'page' in data:
-                    converted_json[field] = data['value']
-                    if data['value'] is not None and data['page'] is not None:
-                        individual_page_fields[field] = [data['page']]
-                        print(f"    Found {field} on Page {data['page']}")
-                else:
-                    converted_json[field] = data
-            
-            # Add metadata
-            converted_json['_metadata'] = {
-                'chunk_num': chunk_num,
-                'page_nums': chunk['page_nums'],
-                'sources': chunk['sources'],
-                'char_count': chunk['char_count'],
-                'individual_page_fields': individual_page_fields
-            }
-            
-            found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
-            print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
-            return converted_json
-            
-        except json.JSONDecodeError as e:
-            print(f"  [ERROR] Failed to parse JSON response")
-            print(f"  Raw LLM response: {result_text[:200]}...")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
-            
     except Exception as e:
         print(f"  [ERROR] LLM processing failed: {e}")
         return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': str(e)}}
 
 
+async def _extract_chunks_async(
+    chunks: List[Dict[str, Any]],
+    bucket: Optional[storage.bucket.Bucket] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run every property chunk through the LLM concurrently, results in chunk order.
+    One client per event loop - its connection pool is bound to the loop that created it.
+    """
+    client = _create_async_openai_client(timeout=300.0, max_retries=0)
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    try:
+        return await asyncio.gather(*[
+            extract_with_llm_async(client, semaphore, chunk, chunk['chunk_num'], len(chunks), bucket)
+            for chunk in chunks
+        ])
+    finally:
+        await client.close()
+
+
 def merge_extraction_results(all_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Merge results from all chunks, prioritizing non-null values"""
     
@@ -729,6 +897,14 @@ def save_extraction_results_to_gcs(
     return final_file_path
 
 
+def _list_phase3_results(bucket: storage.bucket.Bucket) -> set:
+    """Names of every object under phase3/results/ (one paginated listing, names only)"""
+    return {
+        blob.name
+        for blob in bucket.list_blobs(prefix='phase3/results/', fields='items(name),nextPageToken')
+    }
+
+
 def _check_if_all_carriers_complete(bucket: storage.bucket.Bucket, upload_id: str) -> bool:
     """
     Check if all carriers in this upload have completed Phase 3.
@@ -753,6 +929,8 @@ def _check_if_all_carriers_complete(bucket: storage.bucket.Bucket, upload_id: st
             return False
         
         # Count how many carriers have completed Phase 3
+        # One listing of Phase 3 results instead of an exists() request per file
+        existing = _list_phase3_results(bucket)
         completed_count = 0
         for carrier in carriers:
             carrier_name = carrier.get('carrierName', 'Unknown')
@@ -775,8 +953,7 @@ def _check_if_all_carriers_complete(bucket: storage.bucket.Bucket, upload_id: st
                 
                 # Check if Phase 3 result exists
                 final_file_path = f"phase3/results/{safe_name}_{type_short}_final_validated_fields_{timestamp}.json"
-                blob = bucket.blob(final_file_path)
-                if blob.exists():
+                if final_file_path in existing:
                     completed_count += 1
         
         # Calculate total expected files (property + liability + liquor + workers comp for each carrier)
@@ -802,15 +979,255 @@ def _check_if_all_carriers_complete(bucket: storage.bucket.Bucket, upload_id: st
         return False
 
 
-def process_upload_llm_extraction(upload_id: str) -> Dict[str, Any]:
+def _load_file_chunks(
+    bucket: storage.bucket.Bucket,
+    carrier_name: str,
+    safe_carrier_name: str,
+    file_type: str,
+    pdf_info: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Read the latest combined file for one carrier PDF and split it into chunks.
+    Returns {'report_timestamp', 'chunks'}, or None if there is nothing to extract.
+    """
+    # Extract timestamp from PDF path
+    original_pdf_path = pdf_info.get('path')
+    timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', original_pdf_path)
+    if not timestamp_match:
+        report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    else:
+        report_timestamp = timestamp_match.group(1)
+    
+    type_short = file_type.replace('PDF', '').lower()
+    
+    # Find latest intelligent combined file
+    combined_files = list(bucket.list_blobs(prefix=f'phase2d/results/{safe_carrier_name}_{type_short}_intelligent_combined_'))
+    if not combined_files:
+        print(f"Warning: No combined file found for {carrier_name} {file_type}")
+        return None
+    
+    # Get latest file
+    combined_file = sorted(combined_files, key=lambda x: x.time_created)[-1].name
+    
+    # Read combined file
+    all_pages = read_combined_file_from_gcs(bucket, combined_file)
+    if not all_pages:
+        print(f"Warning: No pages extracted from {combined_file}")
+        return None
+    
+    # Create chunks (4 pages each)
+    return {
+        'report_timestamp': report_timestamp,
+        'chunks': create_chunks(all_pages, chunk_size=4)
+    }
+
+
+def _finish_file(
+    bucket: storage.bucket.Bucket,
+    carrier_name: str,
+    safe_carrier_name: str,
+    file_type: str,
+    report_timestamp: str,
+    chunk_results: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Merge one PDF's chunk results with its file type's merge function, save them and build the result entry"""
+    # Merge all results - route to correct merge function based on file type
+    print(f"  Merging results from {len(chunk_results)} chunks...")
+    if file_type == 'liabilityPDF':
+        # Import GL-specific merge for liability extraction
+        from phase3_gl import merge_extraction_results as merge_extraction_results_gl
+        merged_result = merge_extraction_results_gl(chunk_results)
+    elif file_type == 'liquorPDF':
+        # Import Liquor-specific merge for liquor extraction
+        from phase3_liqour import _flush_no_fields, merge_extraction_results as merge_extraction_results_liquor
+        merged_result = merge_extraction_results_liquor(chunk_results)
+        _flush_no_fields(bucket, chunk_results)
+    elif file_type == 'workersCompPDF':
+        # Import Workers Comp-specific merge
+        from phase3_workers_comp import merge_extraction_results as merge_extraction_results_wc
+        merged_result = merge_extraction_results_wc(chunk_results)
+    else:
+        # Use property merge for property PDFs
+        merged_result = merge_extraction_results(chunk_results)
+    
+    # Save results to GCS
+    final_path = save_extraction_results_to_gcs(bucket, merged_result, carrier_name, safe_carrier_name, file_type, report_timestamp)
+    
+    return {
+        'carrierName': carrier_name,
+        'fileType': file_type,
+        'finalFields': f'gs://{BUCKET_NAME}/{final_path}',
+        'totalFields': len([k for k in merged_result.keys() if not k.startswith('_')]),
+        'fieldsFound': len([k for k, v in merged_result.items() if v is not None and not k.startswith('_')])
+    }
+
+
+def _prepare_batch_chunk(
+    file_type: str,
+    chunk: Dict[str, Any],
+    total_chunks: int,
+    cache_bucket: Optional[storage.bucket.Bucket]
+) -> Dict[str, Any]:
+    """
+    Batch API pre-check for one chunk using its file type's prompt. Chunks the extractor answers
+    without the LLM (GL chunks with no GL keywords, known no-field liquor chunks, responses
+    cached in cache_bucket) come back as {'result': ...}; any other chunk as a pending request
+    {'chunk', 'body', 'cache_key'}.
+    """
+    chunk_num = chunk['chunk_num']
+    cache_key = None
+    if file_type == 'liquorPDF':
+        from phase3_liqour import _prepare_batch_chunk as prepare_liquor_chunk
+        return prepare_liquor_chunk(cache_bucket, chunk, total_chunks)
+    if file_type == 'liabilityPDF':
+        from phase3_gl import _build_prompt_tail, _chunk_has_gl_keywords, _empty_gl_result, _gl_request_params, _llm_cache_key as gl_cache_key
+        if not _chunk_has_gl_keywords(chunk['text']):
+            return {'result': _empty_gl_result(chunk, chunk_num)}
+        prompt_tail = _build_prompt_tail(chunk, chunk_num, total_chunks)
+        if cache_bucket is not None:
+            cache_key = gl_cache_key(prompt_tail)
+        body = _gl_request_params(prompt_tail, 'phase3_gl')
+    elif file_type == 'workersCompPDF':
+        from phase3_workers_comp import _build_wc_prompt, _wc_request_params
+        body = _wc_request_params(_build_wc_prompt(chunk, chunk_num, total_chunks))
+    else:
+        prompt = _build_property_prompt(chunk, chunk_num, total_chunks)
+        if cache_bucket is not None:
+            cache_key = _llm_cache_key(prompt)
+        body = _llm_request_params(PROPERTY_MODEL, prompt)
+    
+    cached_text = llm_cache_get(cache_bucket, cache_key) if cache_key else None
+    if cached_text is not None:
+        return {'result': _parse_batch_reply(file_type, cached_text, chunk)}
+    return {'chunk': chunk, 'body': body, 'cache_key': cache_key}
+
+
+def _parse_batch_reply(file_type: str, result_text: Optional[str], chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Chunk result from a batch reply, parsed the way the file type's live extractor parses it"""
+    chunk_num = chunk['chunk_num']
+    if file_type == 'liabilityPDF':
+        from phase3_gl import _parse_llm_response as parse_gl
+        return parse_gl(result_text, chunk, chunk_num)
+    if file_type == 'workersCompPDF':
+        from phase3_workers_comp import _parse_llm_response as parse_wc
+        return parse_wc(result_text, chunk, chunk_num)
+    return _parse_llm_response(result_text, chunk, chunk_num)
+
+
+def _batch_reply_result(
+    file_type: str,
+    item: Dict[str, Any],
+    response_body: Optional[Dict[str, Any]],
+    cache_bucket: Optional[storage.bucket.Bucket]
+) -> Dict[str, Any]:
+    """Chunk result for a pending request's batch reply (None when the job returned none), cached like a live reply"""
+    if file_type == 'liquorPDF':
+        from phase3_liqour import _batch_reply_result as liquor_reply_result
+        return liquor_reply_result(cache_bucket, item, response_body)
+    chunk = item['chunk']
+    if response_body is None:
+        return {'_metadata': {'chunk_num': chunk['chunk_num'], 'page_nums': chunk['page_nums'], 'error': 'No batch response'}}
+    result_text = batch_output_text(response_body).strip()
+    result = _parse_batch_reply(file_type, result_text, chunk)
+    # Only cache responses that parsed, so a bad reply is retried next run
+    if item['cache_key'] and 'error' not in result['_metadata']:
+        llm_cache_put(cache_bucket, item['cache_key'], result_text, item['body']['model'])
+    return result
+
+
+def _process_upload_batch(
+    bucket: storage.bucket.Bucket,
+    record: Dict[str, Any],
+    cache_bucket: Optional[storage.bucket.Bucket] = None
+) -> List[Dict[str, Any]]:
+    """
+    Batch API variant of STEP 2: every chunk of every carrier PDF goes into one OpenAI
+    batch job (half price, up to a 24h turnaround), then each PDF is merged and saved.
+    Chunks with a cached response in cache_bucket (and known no-field liquor chunks)
+    are answered without the batch.
+    """
+    loaded_files = []
+    chunk_results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
+    all_results: List[Dict[str, Any]] = []
+    
+    for carrier_idx, carrier in enumerate(record.get('carriers', [])):
+        carrier_name = carrier.get('carrierName')
+        safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+        for file_type in ['propertyPDF', 'liabilityPDF', 'liquorPDF', 'workersCompPDF']:
+            pdf_info = carrier.get(file_type)
+            if not pdf_info or not pdf_info.get('path'):
+                continue
+            try:
+                loaded = _load_file_chunks(bucket, carrier_name, safe_carrier_name, file_type, pdf_info)
+                if loaded is None:
+                    continue
+                chunks = loaded['chunks']
+                # The carrier index keeps IDs unique when two carrier names sanitize to the same safe name
+                custom_ids = [f"{carrier_idx}|{safe_carrier_name}|{file_type}|{chunk['chunk_num']}" for chunk in chunks]
+                for custom_id, chunk in zip(custom_ids, chunks):
+                    prepared = _prepare_batch_chunk(file_type, chunk, len(chunks), cache_bucket)
+                    if 'result' in prepared:
+                        chunk_results[custom_id] = prepared['result']
+                    else:
+                        pending[custom_id] = prepared
+            except Exception as e:
+                print(f"❌ Error processing {carrier_name} {file_type}: {e}")
+                all_results.append({'carrierName': carrier_name, 'fileType': file_type, 'error': str(e)})
+                continue
+            loaded_files.append((carrier_name, safe_carrier_name, file_type, loaded, custom_ids))
+    
+    batch_error = None
+    if pending:
+        try:
+            bodies = run_batch(
+                _create_openai_client(timeout=300.0, max_retries=3),
+                {custom_id: item['body'] for custom_id, item in pending.items()},
+                'phase3'
+            )
+        except BatchFailedError as e:
+            print(f"⚠️  {e}")
+            batch_error = str(e)
+            bodies = {}
+        for carrier_name, safe_carrier_name, file_type, loaded, custom_ids in loaded_files:
+            for custom_id in custom_ids:
+                if custom_id in pending:
+                    chunk_results[custom_id] = _batch_reply_result(file_type, pending[custom_id], bodies.get(custom_id), cache_bucket)
+    
+    for carrier_name, safe_carrier_name, file_type, loaded, custom_ids in loaded_files:
+        # Saving a file without its batch replies would overwrite an earlier good result with nulls
+        if batch_error and any(custom_id in pending for custom_id in custom_ids):
+            all_results.append({'carrierName': carrier_name, 'fileType': file_type, 'error': batch_error})
+            continue
+        results = [chunk_results[custom_id] for custom_id in custom_ids]
+        if all('error' in result['_metadata'] for result in results):
+            print(f"⚠️  No chunk extracted for {carrier_name} {file_type}, keeping any earlier results")
+            all_results.append({'carrierName': carrier_name, 'fileType': file_type, 'error': 'No chunk was extracted successfully'})
+            continue
+        try:
+            all_results.append(_finish_file(bucket, carrier_name, safe_carrier_name, file_type, loaded['report_timestamp'], results))
+        except Exception as e:
+            print(f"❌ Error processing {carrier_name} {file_type}: {e}")
+            all_results.append({'carrierName': carrier_name, 'fileType': file_type, 'error': str(e)})
+    
+    return all_results
+
+
+def process_upload_llm_extraction(upload_id: str, use_batch: bool = False, use_cache: bool = True) -> Dict[str, Any]:
     """
     Given an upload_id, read Phase 2D results from GCS,
     extract insurance fields using LLM, and save results.
+    use_batch=True sends every chunk of every carrier PDF through one OpenAI Batch API job -
+    about half the cost but up to 24h to finish, so only for re-runs and catch-up jobs.
+    use_cache=False ignores cached LLM responses and calls the LLM for every chunk.
     """
     if not openai.api_key:
         return {"success": False, "error": "OpenAI API key not configured. Cannot run Phase 3."}
     
-    bucket = _get_bucket()
+    bucket = get_bucket(BUCKET_NAME)
+    # LLM responses are cached in the same bucket unless disabled; the GL and liquor
+    # extractors get this bucket too, so they share its HTTP session and their caches
+    cache_bucket = bucket if use_cache else None
     
     # Read metadata
     from phase1 import _read_metadata
@@ -866,33 +1283,10 @@ def process_upload_llm_extraction(upload_id: str) -> Dict[str, Any]:
         
         try:
             print(f"\n📄 Processing {carrier_name} - {file_type}...")
-            # Extract timestamp from PDF path
-            original_pdf_path = pdf_info.get('path')
-            timestamp_match = re.search(r'_(\d{8}_\d{6})\.pdf$', original_pdf_path)
-            if not timestamp_match:
-                report_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            else:
-                report_timestamp = timestamp_match.group(1)
-            
-            type_short = file_type.replace('PDF', '').lower()
-            
-            # Find latest intelligent combined file
-            combined_files = list(bucket.list_blobs(prefix=f'phase2d/results/{safe_carrier_name}_{type_short}_intelligent_combined_'))
-            if not combined_files:
-                print(f"Warning: No combined file found for {carrier_name} {file_type}")
-                return None
-            
-            # Get latest file
-            combined_file = sorted(combined_files, key=lambda x: x.time_created)[-1].name
-            
-            # Read combined file
-            all_pages = read_combined_file_from_gcs(bucket, combined_file)
-            if not all_pages:
-                print(f"Warning: No pages extracted from {combined_file}")
+            loaded = _load_file_chunks(bucket, carrier_name, safe_carrier_name, file_type, pdf_info)
+            if loaded is None:
                 return None
-            
-            # Create chunks (4 pages each)
-            chunks = create_chunks(all_pages, chunk_size=4)
+            chunks = loaded['chunks']
             
             # Process each chunk with LLM - PARALLELIZED for faster processing
             # Route to correct extractor based on file type
@@ -903,58 +1297,35 @@ def process_upload_llm_extraction(upload_id: str) -> Dict[str, Any]:
                 if file_type == 'liabilityPDF':
                     # Import GL-specific extractor for liability
                     from phase3_gl import extract_with_llm as extract_with_llm_gl
-                    return extract_with_llm_gl(chunk, chunk['chunk_num'], len(chunks))
+                    return extract_with_llm_gl(chunk, chunk['chunk_num'], len(chunks), bucket=cache_bucket)
                 elif file_type == 'liquorPDF':
                     # Import Liquor-specific extractor for liquor
                     from phase3_liqour import extract_with_llm as extract_with_llm_liquor
-                    return extract_with_llm_liquor(chunk, chunk['chunk_num'], len(chunks))
+                    return extract_with_llm_liquor(chunk, chunk['chunk_num'], len(chunks), bucket=cache_bucket)
                 elif file_type == 'workersCompPDF':
                     # Import Workers Comp-specific extractor
                     from phase3_workers_comp import extract_with_llm as extract_with_llm_wc
                     return extract_with_llm_wc(chunk, chunk['chunk_num'], len(chunks))
                 else:
                     # Use property extraction for property PDFs
-                    return extract_with_llm(chunk, chunk['chunk_num'], len(chunks))
+                    return extract_with_llm(chunk, chunk['chunk_num'], len(chunks), bucket=cache_bucket)
             
-            # Process all chunks in parallel (n_jobs=-1 uses all available cores)
-            # backend='threading' is perfect for I/O-bound LLM API calls
-            chunk_results = Parallel(
-                n_jobs=-1,
-                backend='threading',
-                verbose=5
-            )(
-                delayed(process_single_chunk)(chunk)
-                for chunk in chunks
-            )
-            
-            # Merge all results - route to correct merge function based on file type
-            print(f"  Merging results from {len(chunk_results)} chunks...")
-            if file_type == 'liabilityPDF':
-                # Import GL-specific merge for liability extraction
-                from phase3_gl import merge_extraction_results as merge_extraction_results_gl
-                merged_result = merge_extraction_results_gl(chunk_results)
-            elif file_type == 'liquorPDF':
-                # Import Liquor-specific merge for liquor extraction
-                from phase3_liqour import merge_extraction_results as merge_extraction_results_liquor
-                merged_result = merge_extraction_results_liquor(chunk_results)
-            elif file_type == 'workersCompPDF':
-                # Import Workers Comp-specific merge
-                from phase3_workers_comp import merge_extraction_results as merge_extraction_results_wc
-                merged_result = merge_extraction_results_wc(chunk_results)
+            if file_type == 'propertyPDF':
+                # Property chunks fan out on an event loop (this PDF's own loop, as PDFs run in threads)
+                chunk_results = asyncio.run(_extract_chunks_async(chunks, cache_bucket))
             else:
-                # Use property merge for property PDFs
-                merged_result = merge_extraction_results(chunk_results)
-            
-            # Save results to GCS
-            final_path = save_extraction_results_to_gcs(bucket, merged_result, carrier_name, safe_carrier_name, file_type, report_timestamp)
+                # Process all chunks in parallel (n_jobs=-1 uses all available cores)
+                # backend='threading' is perfect for I/O-bound LLM API calls
+                chunk_results = Parallel(
+                    n_jobs=-1,
+                    backend='threading',
+                    verbose=5
+                )(
+                    delayed(process_single_chunk)(chunk)
+                    for chunk in chunks
+                )
             
-            return {
-                'carrierName': carrier_name,
-                'fileType': file_type,
-                'finalFields': f'gs://{BUCKET_NAME}/{final_path}',
-                'totalFields': len([k for k in merged_result.keys() if not k.startswith('_')]),
-                'fieldsFound': len([k for k, v in merged_result.items() if v is not None and not k.startswith('_')])
-            }
+            return _finish_file(bucket, carrier_name, safe_carrier_name, file_type, loaded['report_timestamp'], chunk_results)
         
         except Exception as e:
             print(f"❌ Error processing {carrier_name} {file_type}: {e}")
@@ -964,39 +1335,42 @@ def process_upload_llm_extraction(upload_id: str) -> Dict[str, Any]:
                 'error': str(e)
             }
     
-    # Process each carrier
-    for carrier in record.get('carriers', []):
-        carrier_name = carrier.get('carrierName')
-        safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
-        
-        print(f"\n{'='*60}")
-        print(f"🏢 Processing {carrier_name}")
-        print(f"{'='*60}")
-        
-        # Collect all PDF files for this carrier
-        pdf_tasks = []
-        for file_type in ['propertyPDF', 'liabilityPDF', 'liquorPDF', 'workersCompPDF']:
-            pdf_info = carrier.get(file_type)
-            if pdf_info and pdf_info.get('path'):
-                pdf_tasks.append((carrier_name, safe_carrier_name, file_type, pdf_info))
-        
-        if not pdf_tasks:
-            print(f"⚠️  No PDFs found for {carrier_name}")
-            continue
-        
-        # Process all PDFs for this carrier IN PARALLEL (aggressive multi-user + multi-PDF)
-        print(f"🚀 Processing {len(pdf_tasks)} PDFs in parallel...")
-        carrier_results = Parallel(
-            n_jobs=-1,  # Use all available cores for maximum parallelism
-            backend='threading',
-            verbose=5
-        )(
-            delayed(process_single_pdf_file)(carrier_name, safe_carrier_name, file_type, pdf_info)
-            for carrier_name, safe_carrier_name, file_type, pdf_info in pdf_tasks
-        )
-        
-        # Add results (filter out None values from skipped files)
-        all_results.extend([r for r in carrier_results if r is not None])
+    if use_batch:
+        all_results.extend(_process_upload_batch(bucket, record, cache_bucket))
+    else:
+        # Process each carrier (one PDF thread pool per carrier)
+        for carrier in record.get('carriers', []):
+            carrier_name = carrier.get('carrierName')
+            safe_carrier_name = carrier_name.lower().replace(" ", "_").replace("&", "and")
+            
+            print(f"\n{'='*60}")
+            print(f"🏢 Processing {carrier_name}")
+            print(f"{'='*60}")
+            
+            # Collect all PDF files for this carrier
+            pdf_tasks = []
+            for file_type in ['propertyPDF', 'liabilityPDF', 'liquorPDF', 'workersCompPDF']:
+                pdf_info = carrier.get(file_type)
+                if pdf_info and pdf_info.get('path'):
+                    pdf_tasks.append((carrier_name, safe_carrier_name, file_type, pdf_info))
+            
+            if not pdf_tasks:
+                print(f"⚠️  No PDFs found for {carrier_name}")
+                continue
+            
+            # Process all PDFs for this carrier IN PARALLEL (aggressive multi-user + multi-PDF)
+            print(f"🚀 Processing {len(pdf_tasks)} PDFs in parallel...")
+            carrier_results = Parallel(
+                n_jobs=-1,  # Use all available cores for maximum parallelism
+                backend='threading',
+                verbose=5
+            )(
+                delayed(process_single_pdf_file)(carrier_name, safe_carrier_name, file_type, pdf_info)
+                for carrier_name, safe_carrier_name, file_type, pdf_info in pdf_tasks
+            )
+            
+            # Add results (filter out None values from skipped files)
+            all_results.extend([r for r in carrier_results if r is not None])
     
     result = {
         "success": True,
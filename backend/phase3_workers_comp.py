@@ -70,18 +70,30 @@ def read_combined_file_from_gcs(bucket: storage.bucket.Bucket, file_path: str) -
         
         # Extract all pages
         all_pages = []
-        page_sections = re.findall(
-            r'PAGE (\d+) \((PyMuPDF|OCR) \(.*?\)\):.*?TEXT CONTENT:.*?------------------------------\n(.*?)\n={80}',
-            content,
-            re.DOTALL
-        )
+        if file_path.endswith('.ndjson'):
+            # Phase 2D NDJSON: one {"page": ..., "source": ..., "text": ...} record per line
+            for line in content.split('\n'):
+                if not line:
+                    continue
+                page = json.loads(line)
+                all_pages.append({
+                    'page_num': page['page'],
+                    'source': page['source'],
+                    'text': page['text']
+                })
+        else:
+            page_sections = re.findall(
+                r'PAGE (\d+) \((PyMuPDF|OCR) \(.*?\)\):.*?TEXT CONTENT:.*?------------------------------\n(.*?)\n={80}',
+                content,
+                re.DOTALL
+            )
         
-        for page_num, source, page_text in page_sections:
-            all_pages.append({
-                'page_num': int(page_num),
-                'source': source,
-                'text': page_text.strip()
-            })
+            for page_num, source, page_text in page_sections:
+                all_pages.append({
+                    'page_num': int(page_num),
+                    'source': source,
+                    'text': page_text.strip()
+                })
         
         # Sort by page number
         all_pages.sort(key=lambda x: x['page_num'])
@@ -130,9 +142,8 @@ def create_chunks(all_pages: List[Dict[str, Any]], chunk_size: int = 4) -> List[
     
     return chunks
 
-def extract_with_llm(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> Dict[str, Any]:
-    """Extract information using LLM with Workers Comp prompt"""
-    
+def _build_wc_prompt(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> str:
+    """Full Workers Comp extraction prompt for one chunk"""
     prompt = f"""
     Analyze the following workers compensation insurance document text and extract ONLY the 8 specific workers compensation coverage fields listed below.
     
@@ -202,75 +213,88 @@ def extract_with_llm(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -
     Document text:
     {chunk['text']}
     """
+    return prompt
+
+
+def _wc_request_params(prompt: str) -> Dict[str, Any]:
+    """Responses API arguments for one extraction call"""
+    return {
+        "model": "gpt-5",
+        "input": prompt,
+        "reasoning": {
+            "effort": "low"
+        },
+        "text": {
+            "verbosity": "low"
+        }
+    }
+
+
+def _parse_llm_response(result_text: str, chunk: Dict[str, Any], chunk_num: int) -> Dict[str, Any]:
+    """Turn the raw LLM reply for a chunk into field values plus _metadata (error metadata on failure)"""
+    # Check if response is empty
+    if not result_text:
+        print(f"  [ERROR] Empty response from LLM")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response'}}
+    
+    # Clean up markdown code blocks if present
+    if result_text.startswith('```json'):
+        result_text = result_text[7:]  # Remove ```json
+    if result_text.startswith('```'):
+        result_text = result_text[3:]   # Remove ```
+    if result_text.endswith('```'):
+        result_text = result_text[:-3]  # Remove trailing ```
+    result_text = result_text.strip()
+    
+    # Try to parse JSON
+    try:
+        result_json = json.loads(result_text)
+    except json.JSONDecodeError as e:
+        print(f"  [ERROR] Failed to parse JSON response")
+        print(f"  Raw LLM response: {result_text[:200]}...")
+        return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
+    
+    # Convert new format to old format for compatibility
+    converted_json = {}
+    individual_page_fields = {}
+    
+    for field, data in result_json.items():
+        if isinstance(data, dict) and 'value' in data and 'page' in data:
+            # New format: {"value": "FRAME", "page": 5}
+            converted_json[field] = data['value']
+            if data['value'] is not None and data['page'] is not None:
+                individual_page_fields[field] = [data['page']]
+                print(f"    Found {field} on Page {data['page']}")
+        else:
+            # Old format: direct value
+            converted_json[field] = data
+    
+    # Add metadata
+    converted_json['_metadata'] = {
+        'chunk_num': chunk_num,
+        'page_nums': chunk['page_nums'],
+        'sources': chunk['sources'],
+        'char_count': chunk['char_count'],
+        'individual_page_fields': individual_page_fields
+    }
+    
+    found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
+    print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
+    return converted_json
+
+
+def extract_with_llm(chunk: Dict[str, Any], chunk_num: int, total_chunks: int) -> Dict[str, Any]:
+    """Extract information using LLM with Workers Comp prompt"""
+    prompt = _build_wc_prompt(chunk, chunk_num, total_chunks)
     
     try:
         print(f"  Processing chunk {chunk_num} with LLM (Pages {chunk['page_nums']})...")
         
         # Use OpenAI API (GPT-5 Responses API format)
         client = openai.OpenAI(api_key=openai.api_key)
-        response = client.responses.create(
-            model="gpt-5",
-            input=prompt,
-            reasoning={
-                "effort": "low"
-            },
-            text={
-                "verbosity": "low"
-            }
-        )
-        
-        result_text = response.output_text.strip()
-        
-        # Check if response is empty
-        if not result_text:
-            print(f"  [ERROR] Empty response from LLM")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': 'Empty LLM response'}}
-        
-        # Clean up markdown code blocks if present
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]  # Remove ```json
-        if result_text.startswith('```'):
-            result_text = result_text[3:]   # Remove ```
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]  # Remove trailing ```
-        result_text = result_text.strip()
+        response = client.responses.create(**_wc_request_params(prompt))
         
-        # Try to parse JSON
-        try:
-            result_json = json.loads(result_text)
-            
-            # Convert new format to old format for compatibility
-            converted_json = {}
-            individual_page_fields = {}
-            
-            for field, data in result_json.items():
-                if isinstance(data, dict) and 'value' in data and 'page' in data:
-                    # New format: {"value": "FRAME", "page": 5}
-                    converted_json[field] = data['value']
-                    if data['value'] is not None and data['page'] is not None:
-                        individual_page_fields[field] = [data['page']]
-                        print(f"    Found {field} on Page {data['page']}")
-                else:
-                    # Old format: direct value
-                    converted_json[field] = data
-            
-            # Add metadata
-            converted_json['_metadata'] = {
-                'chunk_num': chunk_num,
-                'page_nums': chunk['page_nums'],
-                'sources': chunk['sources'],
-                'char_count': chunk['char_count'],
-                'individual_page_fields': individual_page_fields
-            }
-            
-            found_fields = len([k for k, v in converted_json.items() if v is not None and k != '_metadata'])
-            print(f"  [SUCCESS] Extracted {found_fields} fields from pages {chunk['page_nums']}")
-            return converted_json
-            
-        except json.JSONDecodeError as e:
-            print(f"  [ERROR] Failed to parse JSON response")
-            print(f"  Raw LLM response: {result_text[:200]}...")
-            return {'_metadata': {'chunk_num': chunk_num, 'page_nums': chunk['page_nums'], 'error': f'JSON parse failed: {str(e)}'}}
+        return _parse_llm_response(response.output_text.strip(), chunk, chunk_num)
             
     except Exception as e:
         print(f"  [ERROR] LLM processing failed: {e}")
@@ -20,6 +20,7 @@ client = storage.Client()
 BUCKET_NAME = os.getenv('BUCKET_NAME', 'mckinneysuite')
 PDF_FOLDER = 'pdf'
 METADATA_FILE = f'{PDF_FOLDER}/uploads_metadata.json'
+UPLOAD_RECORDS_FOLDER = f'{PDF_FOLDER}/uploads'
 
 bucket = client.bucket(BUCKET_NAME)
 
@@ -79,6 +80,19 @@ def save_metadata(metadata: Dict[str, Any]) -> None:
     )
 
 
+def save_upload_record(upload_record: Dict[str, Any]) -> None:
+    """
+    Save a single upload record to pdf/uploads/{uploadId}.json
+    Lets the pipeline phases fetch one upload without downloading the full metadata file.
+    uploads_metadata.json is still written for history and for older uploads.
+    """
+    blob = bucket.blob(f"{UPLOAD_RECORDS_FOLDER}/{upload_record['uploadId']}.json")
+    blob.upload_from_string(
+        json.dumps(upload_record, indent=2),
+        content_type='application/json'
+    )
+
+
 def process_carrier_uploads(
     carriers_data: List[Dict[str, Any]],
     username: str,
@@ -208,6 +222,7 @@ def process_carrier_uploads(
         
         metadata["uploads"].append(upload_record)
         save_metadata(metadata)
+        save_upload_record(upload_record)
         
         # Return success response
         return {
@@ -259,15 +274,19 @@ def add_username_to_upload(upload_id: str, user_id: str, username: str):
         uploads = metadata.get("uploads", [])
         
         # Find the upload by ID and add username and user_id
+        confirmed_upload = None
         for upload in uploads:
             if upload.get("uploadId") == upload_id:
                 upload["userId"] = user_id
                 upload["username"] = username
                 upload["confirmedAt"] = datetime.now().isoformat()
+                confirmed_upload = upload
                 break
         
         metadata["uploads"] = uploads
         save_metadata(metadata)
+        if confirmed_upload:
+            save_upload_record(confirmed_upload)
         
         return {
             "success": True,